@@ -3,17 +3,24 @@ from __future__ import annotations
 import enum
 import logging
 import time
+from contextlib import contextmanager
+from typing import Any, ContextManager, Dict, Generator, Iterator, List, Optional, Sequence, Tuple
 
 from dbt.adapters.base import BaseAdapter
+from dbt.adapters.contracts.connection import Connection
+from dbt.adapters.sql import SQLConnectionManager
 from dbt_common.exceptions.base import DbtDatabaseError
 from dbt_semantic_interfaces.enum_extension import assert_values_exhausted
 from metricflow_semantics.errors.error_classes import SqlBindParametersNotSupportedError
 from metricflow_semantics.mf_logging.lazy_formattable import LazyFormat
 from metricflow_semantics.random_id import random_id
 from metricflow_semantics.sql.sql_bind_parameters import SqlBindParameters
+from metricflow_semantics.sql.sql_column_type import SqlColumnType
 
+from dbt_metricflow.cli.dbt_connectors.connection_pool import AdapterConnectionPool, ConnectionPoolConfig
+from metricflow.data_table.column_types import InputCellValue
 from metricflow.data_table.mf_table import MetricFlowDataTable
-from metricflow.protocols.sql_client import SqlEngine
+from metricflow.protocols.sql_client import DEFAULT_QUERY_BATCH_SIZE, SqlEngine
 from metricflow.sql.render.big_query import BigQuerySqlQueryPlanRenderer
 from metricflow.sql.render.databricks import DatabricksSqlQueryPlanRenderer
 from metricflow.sql.render.duckdb_renderer import DuckDbSqlQueryPlanRenderer
@@ -83,6 +90,26 @@ class SupportedAdapterTypes(enum.Enum):
         else:
             assert_values_exhausted(self)
 
+    @property
+    def bind_parameter_key_format(self) -> Optional[str]:
+        """Return the format for placeholders of named parameters in the DB-API driver used by the adapter.
+
+        This is None for adapters where passing bind parameters is not supported.
+        """
+        if self is SupportedAdapterTypes.DUCKDB:
+            return "${key}"
+        elif self is SupportedAdapterTypes.POSTGRES or self is SupportedAdapterTypes.SNOWFLAKE:
+            return "%({key})s"
+        elif (
+            self is SupportedAdapterTypes.BIGQUERY
+            or self is SupportedAdapterTypes.DATABRICKS
+            or self is SupportedAdapterTypes.REDSHIFT
+            or self is SupportedAdapterTypes.TRINO
+        ):
+            return None
+        else:
+            assert_values_exhausted(self)
+
 
 class AdapterBackedSqlClient:
     """SqlClient implementation which delegates database operations to a dbt BaseAdapter instance.
@@ -93,13 +120,23 @@ class AdapterBackedSqlClient:
     of the more generic BaseAdapter class.
     """
 
-    def __init__(self, adapter: BaseAdapter):
+    def __init__(
+        self, adapter: BaseAdapter, connection_pool_config: Optional[ConnectionPoolConfig] = ConnectionPoolConfig()
+    ):
         """Initializer sourced from a BaseAdapter instance.
 
         The dbt BaseAdapter should already be fully initialized, including all credential verification, and
         ready for use for establishing connections and issuing queries.
+
+        Connections are kept in a pool and reused across requests according to `connection_pool_config`. If it's
+        None, a new connection is opened for each request and closed afterward.
         """
         self._adapter = adapter
+        self._connection_pool = (
+            AdapterConnectionPool(adapter=adapter, config=connection_pool_config)
+            if connection_pool_config is not None
+            else None
+        )
         try:
             adapter_type = SupportedAdapterTypes(self._adapter.type())
         except ValueError as e:
@@ -110,10 +147,22 @@ class AdapterBackedSqlClient:
 
         self._sql_engine_type = adapter_type.sql_engine_type
         self._sql_query_plan_renderer = adapter_type.sql_query_plan_renderer
+        self._bind_parameter_key_format = adapter_type.bind_parameter_key_format
         logger.debug(
             LazyFormat(lambda: f"Initialized AdapterBackedSqlClient with dbt adapter type `{adapter_type.value}`")
         )
 
+    @property
+    def connection_pool(self) -> Optional[AdapterConnectionPool]:
+        """The pool of connections used for requests, or None if connections are not pooled."""
+        return self._connection_pool
+
+    def _connection_named(self, connection_name: str) -> ContextManager[None]:
+        """Return a context manager that sets the connection to use for adapter calls in the current thread."""
+        if self._connection_pool is None:
+            return self._adapter.connection_named(connection_name)
+        return self._connection_pool.lease(connection_name)
+
     @property
     def sql_engine_type(self) -> SqlEngine:
         """An enumerated value representing the underlying SqlEngine supported by the dbt adapter for this instance."""
@@ -138,23 +187,31 @@ class AdapterBackedSqlClient:
         """
         start = time.time()
         request_id = SqlRequestId(f"mf_rid__{random_id()}")
-        if sql_bind_parameters.param_dict:
-            raise SqlBindParametersNotSupportedError(
-                f"Invalid query statement - we do not support queries with bind parameters through dbt adapters! "
-                f"Bind params: {sql_bind_parameters.param_dict}"
-            )
+        stmt, bindings = self._prepare_bind_parameters(stmt, sql_bind_parameters)
         logger.info(LazyFormat("Running query() statement", statement=stmt, param_dict=sql_bind_parameters.param_dict))
-        with self._adapter.connection_named(f"MetricFlow_request_{request_id}"):
-            # returns a Tuple[AdapterResponse, agate.Table] but the decorator converts it to Any
-            result = self._adapter.execute(sql=stmt, auto_begin=True, fetch=True)
-            logger.info(LazyFormat(lambda: f"query() returned from dbt Adapter with response {result[0]}"))
-
-        agate_data = result[1]
-        rows = [row.values() for row in agate_data.rows]
-        data_table = MetricFlowDataTable.create_from_rows(
-            column_names=agate_data.column_names,
-            rows=rows,
-        )
+        connection_manager = self._adapter.connections
+        with self._connection_named(f"MetricFlow_request_{request_id}"):
+            if isinstance(connection_manager, SQLConnectionManager):
+                # Read the rows from the DB-API cursor as `adapter.execute()` converts the rows to an agate table, which
+                # infers the type of each cell and is slow for large results.
+                _, cursor = AdapterBackedSqlClient._add_select_query(connection_manager, stmt, bindings)
+                column_names = AdapterBackedSqlClient._cursor_column_names(cursor)
+                rows: List[Tuple[InputCellValue, ...]] = []
+                while True:
+                    fetched_rows = cursor.fetchmany(DEFAULT_QUERY_BATCH_SIZE)
+                    if len(fetched_rows) == 0:
+                        break
+                    rows.extend(fetched_rows)
+                data_table = AdapterBackedSqlClient._data_table_from_cursor_rows(column_names, rows)
+            else:
+                # returns a Tuple[AdapterResponse, agate.Table] but the decorator converts it to Any
+                result = self._adapter.execute(sql=stmt, auto_begin=True, fetch=True)
+                logger.info(LazyFormat(lambda: f"query() returned from dbt Adapter with response {result[0]}"))
+                agate_data = result[1]
+                data_table = MetricFlowDataTable.create_from_rows(
+                    column_names=agate_data.column_names,
+                    rows=[row.values() for row in agate_data.rows],
+                )
         stop = time.time()
 
         logger.info(
@@ -164,6 +221,157 @@ class AdapterBackedSqlClient:
         )
         return data_table
 
+    def query_batches(
+        self,
+        stmt: str,
+        sql_bind_parameters: SqlBindParameters = SqlBindParameters(),
+        batch_size: int = DEFAULT_QUERY_BATCH_SIZE,
+    ) -> Generator[MetricFlowDataTable, None, None]:
+        """Query statement; the result is returned in batches of rows as they are fetched from the cursor.
+
+        For Postgres, a server-side cursor is used so that the rows are fetched from the server in batches. Other drivers
+        may fetch the full result when the query is run, e.g. `redshift_connector`, in which case only the conversion
+        of the rows to tables is done in batches. Adapters that don't use a DB-API cursor (e.g. BigQuery) fetch the full
+        result and then split it into batches.
+
+        The connection is held until the returned generator is exhausted or closed. Call `close()` on the generator
+        (e.g. using `contextlib.closing`) if it's not consumed fully so that the connection is released right away.
+
+        Args:
+            stmt: The SQL query statement to run. This should produce output via a SELECT
+            sql_bind_parameters: The parameter replacement mapping for filling in concrete values for SQL query
+            parameters.
+            batch_size: The maximum number of rows in each batch.
+        """
+        if batch_size < 1:
+            raise ValueError(f"batch_size should be >= 1. Got: {batch_size}")
+
+        connection_manager = self._adapter.connections
+        if not isinstance(connection_manager, SQLConnectionManager):
+            data_table = self.query(stmt, sql_bind_parameters)
+            for batch_start in range(0, max(data_table.row_count, 1), batch_size):
+                yield data_table.slice_rows(batch_start, batch_start + batch_size)
+            return
+
+        stmt, bindings = self._prepare_bind_parameters(stmt, sql_bind_parameters)
+
+        start = time.time()
+        request_id = SqlRequestId(f"mf_rid__{random_id()}")
+        logger.info(
+            LazyFormat(
+                "Running query_batches() statement",
+                statement=stmt,
+                param_dict=sql_bind_parameters.param_dict,
+                batch_size=batch_size,
+            )
+        )
+        row_count = 0
+        batch_count = 0
+        with self._connection_named(f"MetricFlow_request_{request_id}"):
+            with AdapterBackedSqlClient._streaming_cursor(connection_manager, stmt, bindings, request_id) as cursor:
+                column_names: Optional[Tuple[str, ...]] = None
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    # The description of a server-side cursor is only set after the first fetch.
+                    if column_names is None:
+                        column_names = AdapterBackedSqlClient._cursor_column_names(cursor)
+                    # Return an empty batch for an empty result so that the column names are available.
+                    if len(rows) == 0 and batch_count > 0:
+                        break
+                    row_count += len(rows)
+                    batch_count += 1
+                    yield AdapterBackedSqlClient._data_table_from_cursor_rows(column_names, rows)
+                    if len(rows) == 0:
+                        break
+
+        stop = time.time()
+        logger.info(
+            LazyFormat("Finished running query_batches()", runtime=f"{stop - start:.2f}s", returned_row_count=row_count)
+        )
+
+    def _prepare_bind_parameters(
+        self, stmt: str, sql_bind_parameters: SqlBindParameters
+    ) -> Tuple[str, Optional[Dict[str, SqlColumnType]]]:
+        """Return the statement and the bindings to pass to the DB-API cursor for the given bind parameters.
+
+        The bindings are None if there are no bind parameters, so that the statement is run as it is. Otherwise, for
+        drivers that use `%(key)s` placeholders, other `%` characters in the statement need to be escaped.
+        """
+        param_dict = sql_bind_parameters.param_dict
+        if len(param_dict) == 0:
+            return stmt, None
+        if self._bind_parameter_key_format is None or not isinstance(self._adapter.connections, SQLConnectionManager):
+            raise SqlBindParametersNotSupportedError(
+                f"Invalid statement - bind parameters are not supported through the {self._adapter.type()} dbt "
+                f"adapter! Bind params: {param_dict}"
+            )
+        if self._bind_parameter_key_format.startswith("%"):
+            stmt = stmt.replace("%", "%%")
+            for key in param_dict:
+                stmt = stmt.replace("%" + self.render_bind_parameter_key(key), self.render_bind_parameter_key(key))
+        return stmt, dict(param_dict)
+
+    @staticmethod
+    def _add_select_query(  # type: ignore[misc]
+        connection_manager: SQLConnectionManager, stmt: str, bindings: Optional[Dict[str, SqlColumnType]]
+    ) -> Tuple[Connection, Any]:
+        """Same as `SQLConnectionManager.add_select_query()`, but with bindings for the parameters in the statement."""
+        return connection_manager.add_query(
+            connection_manager._add_query_comment(stmt), auto_begin=False, bindings=bindings
+        )
+
+    @staticmethod
+    @contextmanager
+    def _streaming_cursor(  # type: ignore[misc]
+        connection_manager: SQLConnectionManager,
+        stmt: str,
+        bindings: Optional[Dict[str, SqlColumnType]],
+        request_id: SqlRequestId,
+    ) -> Iterator[Any]:
+        """Run the query and return a DB-API cursor to fetch the rows from.
+
+        For `psycopg2` connections, a named cursor is used as those are run on the server, while the default cursor
+        fetches all rows during `execute()`. The cursor is declared `WITH HOLD` so that it can be used when the
+        connection is in autocommit mode.
+        """
+        connection = connection_manager.get_thread_connection()
+        handle = connection.handle
+        if not type(handle).__module__.startswith("psycopg2"):
+            _, cursor = AdapterBackedSqlClient._add_select_query(connection_manager, stmt, bindings)
+            yield cursor
+            return
+
+        sql = connection_manager._add_query_comment(stmt)
+        with connection_manager.exception_handler(sql):
+            cursor = handle.cursor(name=request_id.id_str, withhold=True)
+        try:
+            with connection_manager.exception_handler(sql):
+                cursor.execute(sql, bindings)
+            yield cursor
+        finally:
+            cursor.close()
+
+    @staticmethod
+    def _cursor_column_names(cursor: Any) -> Tuple[str, ...]:  # type: ignore[misc]
+        """Return the names of the result columns from the description of a DB-API cursor."""
+        return tuple(column_description[0] for column_description in cursor.description)
+
+    @staticmethod
+    def _data_table_from_cursor_rows(
+        column_names: Sequence[str], rows: Sequence[Sequence[InputCellValue]]
+    ) -> MetricFlowDataTable:
+        """Create a table from the rows fetched from a DB-API cursor.
+
+        The rows are transposed to columns so that the types are checked and converted once per column. Values with
+        types that aren't supported (e.g. `UUID`) are converted to strings, similar to how agate handles them.
+        """
+        columns: Sequence[Sequence[InputCellValue]] = (
+            tuple(zip(*rows)) if len(rows) > 0 else tuple(() for _ in column_names)
+        )
+        return MetricFlowDataTable.create_from_columns(
+            column_names=column_names, columns=columns, stringify_unsupported_values=True
+        )
+
     def execute(
         self,
         stmt: str,
@@ -176,21 +384,23 @@ class AdapterBackedSqlClient:
             sql_bind_parameters: The parameter replacement mapping for filling in
                 concrete values for SQL query parameters.
         """
-        if sql_bind_parameters.param_dict:
-            raise SqlBindParametersNotSupportedError(
-                f"Invalid execute statement - we do not support execute commands with bind parameters through dbt "
-                f"adapters! Bind params: {SqlBindParameters.param_dict}"
-            )
+        stmt, bindings = self._prepare_bind_parameters(stmt, sql_bind_parameters)
         start = time.time()
         request_id = SqlRequestId(f"mf_rid__{random_id()}")
         logger.info(
             LazyFormat("Running execute() statement", statement=stmt, param_dict=sql_bind_parameters.param_dict)
         )
-        with self._adapter.connection_named(f"MetricFlow_request_{request_id}"):
-            result = self._adapter.execute(stmt, auto_begin=True, fetch=False)
+        connection_manager = self._adapter.connections
+        with self._connection_named(f"MetricFlow_request_{request_id}"):
+            if bindings is not None and isinstance(connection_manager, SQLConnectionManager):
+                connection_manager.add_query(
+                    connection_manager._add_query_comment(stmt), auto_begin=True, bindings=bindings
+                )
+            else:
+                result = self._adapter.execute(stmt, auto_begin=True, fetch=False)
+                logger.debug(LazyFormat(lambda: f"execute() returned from dbt Adapter with response  {result[0]}"))
             # Calls to execute often involve some amount of DDL so we commit here
             self._adapter.commit_if_has_connection()
-            logger.debug(LazyFormat(lambda: f"execute() returned from dbt Adapter with response  {result[0]}"))
         stop = time.time()
         logger.info(LazyFormat("Finished execute()", runtime=f"{stop - start:.2f}s"))
 
@@ -219,7 +429,7 @@ class AdapterBackedSqlClient:
         # Trino has a bug where explain command actually creates table. Wrapping with validate to avoid this.
         # See https://github.com/trinodb/trino/issues/130
         if self.sql_engine_type is SqlEngine.TRINO:
-            with self._adapter.connection_named(connection_name):
+            with self._connection_named(connection_name):
                 # Either the response will be bool value or a string with error message from Trino.
                 result = self._adapter.execute(f"EXPLAIN (type validate) {stmt}", auto_begin=True, fetch=True)
                 has_error = False if str(result[0]) == "SUCCESS" else True
@@ -227,11 +437,17 @@ class AdapterBackedSqlClient:
                     raise DbtDatabaseError("Encountered error in Trino dry run.")
 
         elif self.sql_engine_type is SqlEngine.BIGQUERY:
-            with self._adapter.connection_named(connection_name):
+            with self._connection_named(connection_name):
                 self._adapter.validate_sql(stmt)
+        elif sql_bind_parameters.param_dict:
+            explain_stmt, bindings = self._prepare_bind_parameters(f"EXPLAIN {stmt}", sql_bind_parameters)
+            connection_manager = self._adapter.connections
+            assert isinstance(connection_manager, SQLConnectionManager)
+            with self._connection_named(connection_name):
+                AdapterBackedSqlClient._add_select_query(connection_manager, explain_stmt, bindings)
         else:
             is_databricks = self.sql_engine_type is SqlEngine.DATABRICKS
-            with self._adapter.connection_named(connection_name):
+            with self._connection_named(connection_name):
                 results = self._adapter.execute(f"EXPLAIN {stmt}", auto_begin=True, fetch=is_databricks)
 
             if is_databricks:
@@ -251,10 +467,15 @@ class AdapterBackedSqlClient:
         return
 
     def close(self) -> None:  # noqa: D102
+        if self._connection_pool is not None:
+            self._connection_pool.close()
         self._adapter.cancel_open_connections()
 
     def render_bind_parameter_key(self, bind_parameter_key: str) -> str:
         """Wrap execution parameter key with syntax accepted by engine."""
-        raise SqlBindParametersNotSupportedError(
-            "We do not support queries with bind parameters through dbt adapters, so we do not have rendering enabled!"
-        )
+        if self._bind_parameter_key_format is None:
+            raise SqlBindParametersNotSupportedError(
+                f"Bind parameters are not supported through the {self._adapter.type()} dbt adapter, so we do not have "
+                f"rendering enabled!"
+            )
+        return self._bind_parameter_key_format.format(key=bind_parameter_key)
@@ -0,0 +1,292 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Deque, Iterator, List, Optional, Tuple
+
+from dbt.adapters.base import BaseAdapter
+from dbt.adapters.contracts.connection import Connection, ConnectionState
+from dbt.adapters.sql import SQLConnectionManager
+from metricflow_semantics.mf_logging.lazy_formattable import LazyFormat
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ConnectionPoolConfig:
+    """Configuration for `AdapterConnectionPool`.
+
+    Attributes:
+        min_size: The number of idle connections that are kept open even when they have been idle for longer than
+        `idle_timeout`.
+        max_size: The maximum number of connections that can be leased at the same time. Threads that request a
+        connection when the limit is reached wait until a connection is returned.
+        idle_timeout: The number of seconds after which idle connections in excess of `min_size` are closed.
+        health_check_interval: Connections that have been idle for at least this many seconds are checked with a
+        trivial query before they are leased. Connections that are no longer open are always replaced.
+    """
+
+    min_size: int = 1
+    max_size: int = 8
+    idle_timeout: float = 300.0
+    health_check_interval: float = 60.0
+
+    def __post_init__(self) -> None:  # noqa: D105
+        if self.min_size < 0:
+            raise ValueError(f"min_size should be >= 0. Got: {self.min_size}")
+        if self.max_size < 1:
+            raise ValueError(f"max_size should be >= 1. Got: {self.max_size}")
+        if self.min_size > self.max_size:
+            raise ValueError(f"min_size should be <= max_size. Got: {self.min_size=} {self.max_size=}")
+        if self.idle_timeout <= 0:
+            raise ValueError(f"idle_timeout should be > 0. Got: {self.idle_timeout}")
+        if self.health_check_interval < 0:
+            raise ValueError(f"health_check_interval should be >= 0. Got: {self.health_check_interval}")
+
+
+@dataclass(frozen=True)
+class ConnectionPoolStats:
+    """A snapshot of the counters kept by a connection pool.
+
+    Attributes:
+        opened_count: Number of leases that needed a new connection.
+        reused_count: Number of leases that used an idle connection from the pool.
+        discarded_count: Number of connections that were closed as they were idle for too long, were no longer open,
+        or failed the health check.
+        idle_count: Number of idle connections currently in the pool.
+    """
+
+    opened_count: int
+    reused_count: int
+    discarded_count: int
+    idle_count: int
+
+
+class AdapterConnectionPool:
+    """Keeps connections of a dbt adapter open so that they can be reused for later requests.
+
+    dbt adapters associate one connection with each thread, and `BaseAdapter.connection_named()` closes that connection
+    when the block exits. For warehouses where opening a connection requires a new session, that adds the session
+    setup time to every query. Instead, this leases an open connection from the pool to the thread for the duration of
+    a request, and returns it to the pool afterward. Nested leases in the same thread use the same connection.
+    """
+
+    def __init__(
+        self,
+        adapter: BaseAdapter,
+        config: ConnectionPoolConfig = ConnectionPoolConfig(),
+        time_function: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initializer.
+
+        Args:
+            adapter: The adapter that provides the connections.
+            config: Limits for the pool.
+            time_function: Returns the current time in seconds. Used for computing how long connections are idle.
+        """
+        self._adapter = adapter
+        self._config = config
+        self._time_function = time_function
+        self._lock = threading.Lock()
+        self._lease_semaphore = threading.BoundedSemaphore(config.max_size)
+        self._thread_local = threading.local()
+        # Ordered from the least recently returned to the most recently returned. Each entry is a tuple of the
+        # connection and the time when it was returned.
+        self._idle_connections: Deque[Tuple[Connection, float]] = deque()
+        self._opened_count = 0
+        self._reused_count = 0
+        self._discarded_count = 0
+
+    @property
+    def config(self) -> ConnectionPoolConfig:  # noqa: D102
+        return self._config
+
+    @contextmanager
+    def lease(self, connection_name: str) -> Iterator[None]:
+        """Use a pooled connection for adapter calls in the current thread while in this context.
+
+        This can be used in place of `BaseAdapter.connection_named()`.
+        """
+        lease_depth: int = getattr(self._thread_local, "lease_depth", 0)
+        if lease_depth > 0:
+            self._thread_local.lease_depth = lease_depth + 1
+            try:
+                with self._adapter.connection_named(connection_name, should_release_connection=False):
+                    yield
+            finally:
+                self._thread_local.lease_depth = lease_depth
+            return
+
+        self._lease_semaphore.acquire()
+        self._thread_local.lease_depth = 1
+        try:
+            self._attach_connection(connection_name)
+            try:
+                with self._adapter.connection_named(connection_name, should_release_connection=False):
+                    yield
+            finally:
+                self._detach_connection()
+        finally:
+            self._thread_local.lease_depth = 0
+            self._lease_semaphore.release()
+
+    def close(self) -> None:
+        """Close the idle connections in the pool. Leased connections are closed when they are returned."""
+        with self._lock:
+            idle_connections = [connection for connection, _ in self._idle_connections]
+            self._idle_connections.clear()
+        for connection in idle_connections:
+            self._close_connection(connection)
+
+    @property
+    def stats(self) -> ConnectionPoolStats:  # noqa: D102
+        with self._lock:
+            return ConnectionPoolStats(
+                opened_count=self._opened_count,
+                reused_count=self._reused_count,
+                discarded_count=self._discarded_count,
+                idle_count=len(self._idle_connections),
+            )
+
+    def _attach_connection(self, connection_name: str) -> None:
+        """Set an idle connection from the pool as the connection for the current thread.
+
+        If there are no usable idle connections, no connection is set and the adapter creates a new one.
+        """
+        connection_manager = self._adapter.connections
+        # Connections that were set for this thread outside of the pool (e.g. through `connection_named()`) are
+        # closed as only one connection can be set for a thread.
+        self._discard_thread_connection(count_as_discarded=False)
+        while True:
+            idle_connection = self._take_idle_connection()
+            if idle_connection is None:
+                with self._lock:
+                    self._opened_count += 1
+                return
+
+            connection, idle_time = idle_connection
+            if connection.state != ConnectionState.OPEN:
+                self._discard_connection(connection)
+                continue
+
+            with connection_manager.lock:
+                connection_manager.set_thread_connection(connection)
+            if idle_time >= self._config.health_check_interval and not self._is_thread_connection_healthy(
+                connection_name
+            ):
+                self._discard_thread_connection(count_as_discarded=True)
+                continue
+
+            with self._lock:
+                self._reused_count += 1
+            return
+
+    def _detach_connection(self) -> None:
+        """Return the connection of the current thread to the pool."""
+        connection_manager = self._adapter.connections
+        connection = connection_manager.get_if_exists()
+        if connection is None:
+            return
+
+        try:
+            transaction_ended = self._end_thread_transaction(connection)
+        except Exception:
+            logger.exception(LazyFormat("Unable to roll back a pooled connection", connection_name=connection.name))
+            transaction_ended = False
+        if not transaction_ended:
+            self._discard_thread_connection(count_as_discarded=True)
+            return
+        connection_manager.clear_thread_connection()
+
+        if connection.state != ConnectionState.OPEN:
+            self._discard_connection(connection)
+            return
+
+        with self._lock:
+            self._idle_connections.append((connection, self._time_function()))
+            expired_connections = self._remove_expired_connections()
+        for expired_connection in expired_connections:
+            self._discard_connection(expired_connection)
+
+    def _end_thread_transaction(self, connection: Connection) -> bool:
+        """Roll back the open transaction of the connection so that the next lease starts in a clean state.
+
+        Returns false if the transaction could not be ended. Some adapters (e.g. DuckDB) wrap the DB-API connection in
+        a handle without a `rollback()` method, so for SQL adapters, a `ROLLBACK` statement is used instead.
+        """
+        if not connection.transaction_open:
+            return True
+        connection_manager = self._adapter.connections
+        if hasattr(connection.handle, "rollback"):
+            connection_manager.rollback_if_open()
+            return True
+        if isinstance(connection_manager, SQLConnectionManager):
+            connection_manager.add_query("ROLLBACK", auto_begin=False)
+            connection.transaction_open = False
+            return True
+        return False
+
+    def _take_idle_connection(self) -> Optional[Tuple[Connection, float]]:
+        """Remove the most recently returned connection from the pool and return it with how long it was idle."""
+        with self._lock:
+            expired_connections = self._remove_expired_connections()
+            idle_connection = self._idle_connections.pop() if len(self._idle_connections) > 0 else None
+        for expired_connection in expired_connections:
+            self._discard_connection(expired_connection)
+
+        if idle_connection is None:
+            return None
+        connection, returned_time = idle_connection
+        return connection, self._time_function() - returned_time
+
+    def _remove_expired_connections(self) -> List[Connection]:
+        """Remove the connections that have been idle for too long. The lock must be held when calling this."""
+        current_time = self._time_function()
+        expired_connections: List[Connection] = []
+        while (
+            len(self._idle_connections) > self._config.min_size
+            and current_time - self._idle_connections[0][1] >= self._config.idle_timeout
+        ):
+            expired_connections.append(self._idle_connections.popleft()[0])
+        return expired_connections
+
+    def _is_thread_connection_healthy(self, connection_name: str) -> bool:
+        try:
+            with self._adapter.connection_named(connection_name, should_release_connection=False):
+                self._adapter.execute("SELECT 1", auto_begin=False, fetch=False)
+            return True
+        except Exception:
+            logger.warning(
+                LazyFormat(
+                    "Discarding a pooled connection that failed the health check", connection_name=connection_name
+                ),
+                exc_info=True,
+            )
+            return False
+
+    def _discard_thread_connection(self, count_as_discarded: bool) -> None:
+        """Close the connection that is set for the current thread, if there is one."""
+        connection_manager = self._adapter.connections
+        connection = connection_manager.get_if_exists()
+        if connection is None:
+            return
+        connection_manager.clear_thread_connection()
+        if count_as_discarded:
+            self._discard_connection(connection)
+        else:
+            self._close_connection(connection)
+
+    def _discard_connection(self, connection: Connection) -> None:
+        with self._lock:
+            self._discarded_count += 1
+        self._close_connection(connection)
+
+    def _close_connection(self, connection: Connection) -> None:
+        try:
+            self._adapter.connections.close(connection)
+        except Exception:
+            logger.exception(LazyFormat("Unable to close a pooled connection", connection_name=connection.name))
@@ -38,6 +38,7 @@ from dbt_metricflow.cli.utils import (
     query_options,
     start_end_time_options,
 )
+from metricflow.data_table.optional_modules import import_optional_module
 from metricflow.engine.metricflow_engine import MetricFlowExplainResult, MetricFlowQueryRequest, MetricFlowQueryResult
 from metricflow.telemetry.models import TelemetryLevel
 from metricflow.telemetry.reporter import TelemetryReporter, log_call
@@ -213,6 +214,21 @@ def tutorial(ctx: click.core.Context, cfg: CLIContext, msg: bool, clean: bool) -
     required=False,
     help="Provide filepath for data_table output to csv",
 )
+@click.option(
+    "--output-format",
+    type=click.Choice(["parquet", "arrow"], case_sensitive=False),
+    required=False,
+    cls=click_custom.MutuallyExclusiveOption,
+    mutually_exclusive=["csv"],
+    help="Write the data_table output to the file given by --output-file in this format. 'arrow' writes an Arrow IPC "
+    "file. Requires the 'pyarrow' package",
+)
+@click.option(
+    "--output-file",
+    type=click.Path(dir_okay=False, writable=True, path_type=pathlib.Path),
+    required=False,
+    help="Provide filepath for data_table output in the format given by --output-format",
+)
 @click.option(
     "--explain",
     is_flag=True,
@@ -263,6 +279,8 @@ def query(
     order: Optional[List[str]] = None,
     limit: Optional[int] = None,
     csv: Optional[click.utils.LazyFile] = None,
+    output_format: Optional[str] = None,
+    output_file: Optional[pathlib.Path] = None,
     explain: bool = False,
     show_dataflow_plan: bool = False,
     display_plans: bool = False,
@@ -271,6 +289,18 @@ def query(
     saved_query: Optional[str] = None,
 ) -> None:
     """Create a new query with MetricFlow and assembles a MetricFlowQueryResult."""
+    if (output_format is None) != (output_file is None):
+        raise click.UsageError("--output-format and --output-file must be used together.")
+    if output_format is not None:
+        # Check before running the query as the package is only needed to write the output.
+        try:
+            import_optional_module("pyarrow", "arrow")
+        except ImportError as e:
+            raise click.UsageError(
+                f"--output-format {output_format} requires the 'pyarrow' package, which can be installed with "
+                f"`pip install dbt-metricflow[arrow]`."
+            ) from e
+
     start = time.time()
     spinner = Halo(text="Initiating query…", spinner="dots")
     spinner.start()
@@ -345,6 +375,12 @@ def query(
             for row in df.rows:
                 csv_writer.writerow(row)
             click.echo(f"🖨 Successfully written query output to {csv.name}")
+        elif output_file is not None:
+            if output_format == "parquet":
+                df.to_parquet(output_file)
+            else:
+                df.to_arrow_ipc_file(output_file)
+            click.echo(f"🖨 Successfully written query output to {output_file}")
         else:
             click.echo(df.text_format(decimals))
         if display_plans:
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Generic, Hashable, Optional, Tuple, TypeVar
+
+from metricflow_semantics.mf_logging.lazy_formattable import LazyFormat
+
+logger = logging.getLogger(__name__)
+
+CacheKeyT = TypeVar("CacheKeyT", bound=Hashable)
+CacheValueT = TypeVar("CacheValueT")
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """A snapshot of the counters kept by a cache.
+
+    Attributes:
+        hit_count: Number of lookups that found an entry.
+        miss_count: Number of lookups that did not find an entry.
+        eviction_count: Number of entries that were removed to stay within the size limits.
+        expiration_count: Number of entries that were removed as they were older than their time-to-live.
+        entry_count: Number of entries currently in the cache.
+        size_in_bytes: Approximate size of the entries currently in the cache.
+    """
+
+    hit_count: int
+    miss_count: int
+    eviction_count: int
+    expiration_count: int
+    entry_count: int
+    size_in_bytes: int
+
+    @property
+    def hit_rate(self) -> float:
+        """The fraction of lookups that found an entry, or 0.0 if there have been no lookups."""
+        lookup_count = self.hit_count + self.miss_count
+        if lookup_count == 0:
+            return 0.0
+        return self.hit_count / lookup_count
+
+
+class LruCache(Generic[CacheKeyT, CacheValueT]):
+    """A thread-safe, bounded cache that evicts the least recently used entries first.
+
+    The cache is bounded by the number of entries, and optionally, by the total size of the entries. Since measuring
+    the actual memory used by an object graph is expensive, the size of an entry is computed by `size_function`, and
+    it's expected to be an approximation.
+
+    Entries can also have a time-to-live (TTL), after which they are treated as missing and removed on the next lookup.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        max_bytes: Optional[int] = None,
+        size_function: Optional[Callable[[CacheValueT], int]] = None,
+        default_ttl: Optional[float] = None,
+        time_function: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initializer.
+
+        Args:
+            max_entries: The maximum number of entries to keep.
+            max_bytes: If specified, the maximum total size of the entries as computed by `size_function`.
+            size_function: Returns the approximate size of an entry in bytes. Required if `max_bytes` is specified.
+            default_ttl: If specified, the number of seconds an entry is valid for when a TTL is not given in `put`.
+            time_function: Returns the current time in seconds. Used for computing expiration times.
+        """
+        if max_entries < 1:
+            raise ValueError(f"max_entries should be >= 1. Got: {max_entries}")
+        if max_bytes is not None and max_bytes < 1:
+            raise ValueError(f"max_bytes should be >= 1. Got: {max_bytes}")
+        if max_bytes is not None and size_function is None:
+            raise ValueError("A size_function is required when max_bytes is specified.")
+        if default_ttl is not None and default_ttl <= 0:
+            raise ValueError(f"default_ttl should be > 0. Got: {default_ttl}")
+
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._size_function = size_function
+        self._default_ttl = default_ttl
+        self._time_function = time_function
+        self._lock = threading.Lock()
+        # Ordered from the least recently used to the most recently used. The value is a tuple of the cached value,
+        # the size of the entry, and the time when the entry expires.
+        self._entries: OrderedDict[CacheKeyT, Tuple[CacheValueT, int, Optional[float]]] = OrderedDict()
+        self._size_in_bytes = 0
+        self._hit_count = 0
+        self._miss_count = 0
+        self._eviction_count = 0
+        self._expiration_count = 0
+
+    @property
+    def max_entries(self) -> int:  # noqa: D102
+        return self._max_entries
+
+    @property
+    def max_bytes(self) -> Optional[int]:  # noqa: D102
+        return self._max_bytes
+
+    def get(self, key: CacheKeyT) -> Optional[CacheValueT]:
+        """Return the value for the given key, or None if the key is not in the cache."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._miss_count += 1
+                return None
+            expiration_time = entry[2]
+            if expiration_time is not None and self._time_function() >= expiration_time:
+                self._remove_entry(key)
+                self._expiration_count += 1
+                self._miss_count += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hit_count += 1
+            return entry[0]
+
+    def put(self, key: CacheKeyT, value: CacheValueT, ttl: Optional[float] = None) -> None:
+        """Add an entry to the cache, evicting the least recently used entries if the limits are exceeded.
+
+        If the entry by itself exceeds `max_bytes`, it's not added. `ttl` is the number of seconds the entry is valid
+        for, and if not specified, the default TTL is used.
+        """
+        entry_size = self._size_function(value) if self._size_function is not None else 0
+        if self._max_bytes is not None and entry_size > self._max_bytes:
+            logger.debug(
+                LazyFormat(
+                    lambda: f"Not caching an entry of size {entry_size} as it exceeds the limit of {self._max_bytes}"
+                )
+            )
+            return
+
+        ttl = ttl if ttl is not None else self._default_ttl
+        with self._lock:
+            self._remove_entry(key)
+            self._entries[key] = (value, entry_size, self._time_function() + ttl if ttl is not None else None)
+            self._size_in_bytes += entry_size
+            while len(self._entries) > self._max_entries or (
+                self._max_bytes is not None and self._size_in_bytes > self._max_bytes
+            ):
+                evicted_key = next(iter(self._entries))
+                self._remove_entry(evicted_key)
+                self._eviction_count += 1
+
+    def remove(self, key: CacheKeyT) -> bool:
+        """Remove the entry with the given key. Returns true if an entry was removed."""
+        with self._lock:
+            return self._remove_entry(key)
+
+    def remove_matching(self, predicate: Callable[[CacheKeyT, CacheValueT], bool]) -> int:
+        """Remove the entries where the predicate returns true for the key and value. Returns the number removed."""
+        with self._lock:
+            keys_to_remove = [key for key, entry in self._entries.items() if predicate(key, entry[0])]
+            for key in keys_to_remove:
+                self._remove_entry(key)
+            return len(keys_to_remove)
+
+    def clear(self) -> None:
+        """Remove all entries. The counters are not reset."""
+        with self._lock:
+            self._entries.clear()
+            self._size_in_bytes = 0
+
+    @property
+    def stats(self) -> CacheStats:  # noqa: D102
+        with self._lock:
+            return CacheStats(
+                hit_count=self._hit_count,
+                miss_count=self._miss_count,
+                eviction_count=self._eviction_count,
+                expiration_count=self._expiration_count,
+                entry_count=len(self._entries),
+                size_in_bytes=self._size_in_bytes,
+            )
+
+    def _remove_entry(self, key: CacheKeyT) -> bool:
+        """Remove the entry with the given key. The lock must be held when calling this."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        self._size_in_bytes -= entry[1]
+        return True
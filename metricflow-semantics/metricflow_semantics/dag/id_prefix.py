@@ -64,6 +64,7 @@ class StaticIdPrefix(IdPrefix, Enum, metaclass=EnumMetaClassHelper):
     SQL_EXPR_NULL_PREFIX = "null"
     SQL_EXPR_LOGICAL_OPERATOR_PREFIX = "lo"
     SQL_EXPR_STRING_LITERAL_PREFIX = "sl"
+    SQL_EXPR_BIND_PARAMETER_PREFIX = "bp"
     SQL_EXPR_IS_NULL_PREFIX = "isn"
     SQL_EXPR_CAST_TO_TIMESTAMP_PREFIX = "ctt"
     SQL_EXPR_DATE_TRUNC = "dt"
@@ -2,12 +2,14 @@
 
 from __future__ import annotations
 
+import dataclasses
 import html
 import logging
 import textwrap
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Any, Generic, Optional, Sequence, Tuple, TypeVar
+from functools import lru_cache
+from typing import Any, Dict, Generic, Optional, Sequence, Tuple, Type, TypeVar
 
 import jinja2
 from typing_extensions import override
@@ -56,16 +58,77 @@ class DagNodeVisitor(Generic[VisitorOutputT], ABC):
 
 DagNodeT = TypeVar("DagNodeT", bound="DagNode")
 
+# The attribute for the cached hash of a node.
+_CACHED_HASH_ATTRIBUTE_NAME = "_cached_structural_hash"
+
+
+@lru_cache(maxsize=None)
+def _compared_field_names(node_class: Type[DagNode]) -> Tuple[str, ...]:
+    """Return the names of the fields used in `__eq__` by the `dataclass` generated method."""
+    return tuple(field.name for field in dataclasses.fields(node_class) if field.compare)
+
+
+@lru_cache(maxsize=None)
+def _hashed_field_names(node_class: Type[DagNode]) -> Tuple[str, ...]:
+    """Return the names of the fields used in `__hash__` by the `dataclass` generated method."""
+    return tuple(
+        field.name for field in dataclasses.fields(node_class) if (field.compare if field.hash is None else field.hash)
+    )
+
 
 @dataclass(frozen=True)
 class DagNode(MetricFlowPrettyFormattable, Generic[DagNodeT], ABC):
-    """A node in a DAG. These should be immutable."""
+    """A node in a DAG. These should be immutable.
+
+    Nodes are compared structurally, so the methods generated by `dataclass` would hash the whole DAG component above a
+    node each time it's used as a dictionary key. Instead, the hash is cached in the node after it's first computed, so
+    it only uses the cached hashes of the parent nodes. Equality checks compare identity and the cached hashes before
+    comparing the fields.
+    """
 
     parent_nodes: Tuple[DagNodeT, ...]
 
+    def __init_subclass__(cls, **kwargs: object) -> None:  # noqa: D105
+        super().__init_subclass__(**kwargs)
+        # `dataclass` only generates `__eq__` and `__hash__` when they are not defined in the class, so these need to be
+        # set for each subclass.
+        if "__eq__" not in cls.__dict__:
+            cls.__eq__ = DagNode._structural_eq  # type: ignore[method-assign, assignment]
+            cls.__hash__ = DagNode._structural_hash  # type: ignore[method-assign, assignment]
+
     def __post_init__(self) -> None:  # noqa: D105
         object.__setattr__(self, "_post_init_node_id", self.create_unique_id())
 
+    def _structural_hash(self) -> int:
+        """Return the same hash as the method generated by `dataclass`, but cache it after the first call."""
+        cached_hash: Optional[int] = self.__dict__.get(_CACHED_HASH_ATTRIBUTE_NAME)
+        if cached_hash is None:
+            cached_hash = hash(tuple(getattr(self, field_name) for field_name in _hashed_field_names(self.__class__)))
+            object.__setattr__(self, _CACHED_HASH_ATTRIBUTE_NAME, cached_hash)
+        return cached_hash
+
+    def _structural_eq(self, other: object) -> bool:
+        """Equivalent to the method generated by `dataclass`, but with checks that avoid comparing the fields."""
+        if self is other:
+            return True
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        # The hashes are only compared if they are already computed as a field could be unhashable.
+        self_hash = self.__dict__.get(_CACHED_HASH_ATTRIBUTE_NAME)
+        other_hash = other.__dict__.get(_CACHED_HASH_ATTRIBUTE_NAME)
+        if self_hash is not None and other_hash is not None and self_hash != other_hash:
+            return False
+        return all(
+            getattr(self, field_name) == getattr(other, field_name)
+            for field_name in _compared_field_names(self.__class__)
+        )
+
+    def __getstate__(self) -> Dict[str, Any]:  # type: ignore[misc]  # noqa: D105
+        # The hashes of strings differ between processes, so the cached hash should not be pickled.
+        state = dict(self.__dict__)
+        state.pop(_CACHED_HASH_ATTRIBUTE_NAME, None)
+        return state
+
     @property
     def node_id(self) -> NodeId:
         """ID for uniquely identifying a given node.
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
 from dataclasses import dataclass
-from typing import Dict
+from typing import Dict, Iterator, Optional
 
 from typing_extensions import override
 
@@ -25,8 +27,31 @@ class SequentialId:
         return self.str_value
 
 
+class _SequentialIdScope:
+    """The numbering state for IDs generated within `SequentialIdGenerator.id_scope()`."""
+
+    def __init__(self, start_value: int) -> None:  # noqa: D107
+        self._start_value = start_value
+        # A lock is still needed as the context (and this scope) could be copied to other threads.
+        self._state_lock = threading.Lock()
+        self._prefix_to_next_value: Dict[IdPrefix, int] = {}
+
+    def create_next_id(self, id_prefix: IdPrefix) -> SequentialId:  # noqa: D102
+        with self._state_lock:
+            index = self._prefix_to_next_value.get(id_prefix, self._start_value)
+            self._prefix_to_next_value[id_prefix] = index + 1
+            return SequentialId(id_prefix, index)
+
+
+_current_id_scope: ContextVar[Optional[_SequentialIdScope]] = ContextVar("_current_id_scope", default=None)
+
+
 class SequentialIdGenerator:
-    """Generates sequential ID values based on a prefix."""
+    """Generates sequential ID values based on a prefix.
+
+    By default, the numbering is shared by the process. Within `id_scope()`, the numbering is local to the current
+    context (i.e. thread or async task), so that concurrent operations can each generate deterministic IDs.
+    """
 
     _default_start_value = 0
     _state_lock = threading.Lock()
@@ -34,6 +59,10 @@ class SequentialIdGenerator:
 
     @classmethod
     def create_next_id(cls, id_prefix: IdPrefix) -> SequentialId:  # noqa: D102
+        id_scope = _current_id_scope.get()
+        if id_scope is not None:
+            return id_scope.create_next_id(id_prefix)
+
         with cls._state_lock:
             if id_prefix not in cls._prefix_to_next_value:
                 cls._prefix_to_next_value[id_prefix] = cls._default_start_value
@@ -48,3 +77,16 @@ class SequentialIdGenerator:
         with cls._state_lock:
             cls._prefix_to_next_value = {}
             cls._default_start_value = default_start_value
+
+    @staticmethod
+    @contextmanager
+    def id_scope(start_value: int = 0) -> Iterator[None]:
+        """Within this context, generate IDs using a numbering that starts at the given value.
+
+        The numbering is not shared with other contexts, and the process-wide numbering is not changed.
+        """
+        token = _current_id_scope.set(_SequentialIdScope(start_value))
+        try:
+            yield None
+        finally:
+            _current_id_scope.reset(token)
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import pytest
+from metricflow_semantics.collection_helpers.lru_cache import LruCache
+
+
+def test_get_and_put() -> None:  # noqa: D103
+    cache: LruCache[str, int] = LruCache(max_entries=2)
+    assert cache.get("a") is None
+    cache.put("a", 1)
+    assert cache.get("a") == 1
+
+    stats = cache.stats
+    assert stats.hit_count == 1
+    assert stats.miss_count == 1
+    assert stats.entry_count == 1
+    assert stats.hit_rate == 0.5
+
+
+def test_eviction_by_entry_count() -> None:
+    """Check that the least recently used entry is evicted first."""
+    cache: LruCache[str, int] = LruCache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    # Access "a" so that "b" becomes the least recently used entry.
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats.eviction_count == 1
+
+
+def test_eviction_by_size() -> None:  # noqa: D103
+    cache: LruCache[str, str] = LruCache(max_entries=10, max_bytes=5, size_function=len)
+    cache.put("a", "aa")
+    cache.put("b", "bb")
+    assert cache.stats.size_in_bytes == 4
+    cache.put("c", "cc")
+
+    assert cache.get("a") is None
+    assert cache.stats.size_in_bytes == 4
+    assert cache.stats.eviction_count == 1
+
+    # An entry that's larger than the limit is not cached.
+    cache.put("d", "dddddd")
+    assert cache.get("d") is None
+    assert cache.stats.entry_count == 2
+
+
+def test_replace_and_remove() -> None:  # noqa: D103
+    cache: LruCache[str, str] = LruCache(max_entries=10, max_bytes=10, size_function=len)
+    cache.put("a", "a")
+    cache.put("a", "aaa")
+    assert cache.get("a") == "aaa"
+    assert cache.stats.size_in_bytes == 3
+
+    assert cache.remove("a")
+    assert not cache.remove("a")
+    assert cache.stats.size_in_bytes == 0
+
+    cache.put("b", "b")
+    cache.clear()
+    assert cache.stats.entry_count == 0
+
+
+def test_invalid_limits() -> None:  # noqa: D103
+    with pytest.raises(ValueError):
+        LruCache(max_entries=0)
+    with pytest.raises(ValueError):
+        LruCache(max_entries=1, max_bytes=10)
+
+
+def test_expiration() -> None:  # noqa: D103
+    current_time = [0.0]
+    cache: LruCache[str, int] = LruCache(max_entries=10, default_ttl=10.0, time_function=lambda: current_time[0])
+    cache.put("a", 1)
+    cache.put("b", 2, ttl=20.0)
+
+    current_time[0] = 15.0
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+
+    current_time[0] = 20.0
+    assert cache.get("b") is None
+
+    stats = cache.stats
+    assert stats.expiration_count == 2
+    assert stats.entry_count == 0
+
+
+def test_remove_matching() -> None:  # noqa: D103
+    cache: LruCache[str, int] = LruCache(max_entries=10)
+    for i, key in enumerate(("a", "b", "c", "d")):
+        cache.put(key, i)
+
+    assert cache.remove_matching(lambda key, value: value % 2 == 0) == 2
+    assert cache.get("a") is None
+    assert cache.get("b") == 1
+    assert cache.get("c") is None
+    assert cache.get("d") == 3
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import pickle
+from dataclasses import dataclass
+from typing import Tuple
+
+from metricflow_semantics.dag.id_prefix import IdPrefix, StaticIdPrefix
+from metricflow_semantics.dag.mf_dag import DagNode
+from typing_extensions import override
+
+
+class _HashCounter:
+    """A field value that counts how many times it has been hashed."""
+
+    def __init__(self) -> None:
+        self.hash_count = 0
+
+    def __hash__(self) -> int:
+        self.hash_count += 1
+        return 0
+
+
+@dataclass(frozen=True)
+class _ExampleNode(DagNode["_ExampleNode"]):
+    name: str
+    hash_counter: _HashCounter
+
+    @staticmethod
+    def create(  # noqa: D102
+        name: str, hash_counter: _HashCounter, parent_nodes: Tuple[_ExampleNode, ...] = ()
+    ) -> _ExampleNode:
+        return _ExampleNode(parent_nodes=parent_nodes, name=name, hash_counter=hash_counter)
+
+    @property
+    @override
+    def description(self) -> str:
+        return self.name
+
+    @classmethod
+    @override
+    def id_prefix(cls) -> IdPrefix:
+        return StaticIdPrefix.DATAFLOW_NODE_READ_SQL_SOURCE_ID_PREFIX
+
+
+def test_structural_equality() -> None:  # noqa: D103
+    hash_counter = _HashCounter()
+    node = _ExampleNode.create("child", hash_counter, parent_nodes=(_ExampleNode.create("parent", hash_counter),))
+    same_node = _ExampleNode.create("child", hash_counter, parent_nodes=(_ExampleNode.create("parent", hash_counter),))
+    different_node = _ExampleNode.create(
+        "child", hash_counter, parent_nodes=(_ExampleNode.create("other_parent", hash_counter),)
+    )
+
+    assert node.node_id != same_node.node_id
+    assert node == same_node
+    assert hash(node) == hash(same_node)
+    assert hash(node) == hash((node.parent_nodes, node.name, node.hash_counter))
+    assert node != different_node
+    assert len({node, same_node, different_node}) == 2
+
+
+def test_hash_is_cached() -> None:  # noqa: D103
+    hash_counter = _HashCounter()
+    node = _ExampleNode.create("parent", hash_counter)
+    for i in range(10):
+        node = _ExampleNode.create(f"child_{i}", hash_counter, parent_nodes=(node,))
+
+    hash(node)
+    # Each node hashes the counter once.
+    assert hash_counter.hash_count == 11
+    hash(node)
+    hash(_ExampleNode.create("child", hash_counter, parent_nodes=(node,)))
+    assert hash_counter.hash_count == 12
+
+
+def test_pickled_node() -> None:  # noqa: D103
+    node = _ExampleNode.create("child", _HashCounter(), parent_nodes=(_ExampleNode.create("parent", _HashCounter()),))
+    hash(node)
+    unpickled_node = pickle.loads(pickle.dumps(node))
+
+    # The cached hash should be computed again in the new object.
+    assert "_cached_structural_hash" not in unpickled_node.__dict__
+    assert unpickled_node.node_id == node.node_id
+    assert unpickled_node.name == node.name
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import threading
+from typing import List
+
+from metricflow_semantics.dag.id_prefix import StaticIdPrefix
+from metricflow_semantics.dag.sequential_id import SequentialIdGenerator
+from metricflow_semantics.test_helpers.id_helpers import patch_id_generators_helper
+
+_PREFIX = StaticIdPrefix.SUB_QUERY
+
+
+def test_id_scope() -> None:
+    """Check that IDs generated in a scope use a separate numbering from the process-wide numbering."""
+    with patch_id_generators_helper(start_value=100):
+        assert SequentialIdGenerator.create_next_id(_PREFIX).index == 100
+        with SequentialIdGenerator.id_scope(start_value=0):
+            assert SequentialIdGenerator.create_next_id(_PREFIX).index == 0
+            with SequentialIdGenerator.id_scope(start_value=10):
+                assert SequentialIdGenerator.create_next_id(_PREFIX).index == 10
+            assert SequentialIdGenerator.create_next_id(_PREFIX).index == 1
+        assert SequentialIdGenerator.create_next_id(_PREFIX).index == 101
+
+
+def test_id_scope_in_threads() -> None:
+    """Check that threads that each use a scope generate the same IDs."""
+    thread_count = 4
+    id_count = 100
+    barrier = threading.Barrier(thread_count)
+    results: List[List[int]] = [[] for _ in range(thread_count)]
+
+    def _generate_ids(thread_index: int) -> None:
+        with SequentialIdGenerator.id_scope():
+            barrier.wait()
+            for _ in range(id_count):
+                results[thread_index].append(SequentialIdGenerator.create_next_id(_PREFIX).index)
+
+    threads = [threading.Thread(target=_generate_ids, args=(i,)) for i in range(thread_count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for result in results:
+        assert result == list(range(id_count))
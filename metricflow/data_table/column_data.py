@@ -0,0 +1,477 @@
+from __future__ import annotations
+
+import datetime
+import sys
+from abc import ABC, abstractmethod
+from array import array
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Type, Union
+
+from metricflow.data_table.column_types import CellValue, InputCellValue
+from metricflow.data_table.optional_modules import import_optional_module
+
+if TYPE_CHECKING:
+    import pyarrow
+
+# Timestamps are stored as the number of microseconds from this value.
+_EPOCH = datetime.datetime(1970, 1, 1)
+_ONE_MICROSECOND = datetime.timedelta(microseconds=1)
+
+# The approximate size of a boxed Python object that's stored in a tuple. This includes the reference in the tuple.
+_APPROXIMATE_BOXED_VALUE_SIZE_IN_BYTES = 40
+
+
+class ColumnData(ABC):
+    """Stores the values of a column in a `MetricFlowDataTable`.
+
+    Columns are stored using compact, typed arrays where possible, and cell values are created when they are accessed.
+    """
+
+    @abstractmethod
+    def __len__(self) -> int:  # noqa: D105
+        raise NotImplementedError
+
+    @abstractmethod
+    def __getitem__(self, index: int) -> CellValue:  # noqa: D105
+        raise NotImplementedError
+
+    @abstractmethod
+    def __iter__(self) -> Iterator[CellValue]:  # noqa: D105
+        raise NotImplementedError
+
+    @abstractmethod
+    def take(self, indexes: Sequence[int]) -> ColumnData:
+        """Return a column with the values at the given indexes, in that order."""
+        raise NotImplementedError
+
+    def slice(self, start: int, stop: int) -> ColumnData:
+        """Return a column with the values in the given range."""
+        return self.take(range(start, min(stop, len(self))))
+
+    @property
+    @abstractmethod
+    def approximate_size_in_bytes(self) -> int:
+        """The approximate memory used by the values in the column."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def to_arrow(self) -> pyarrow.Array:
+        """Return the column as an Arrow array, sharing the buffers of the column where possible.
+
+        Requires the `pyarrow` package.
+        """
+        raise NotImplementedError
+
+    @staticmethod
+    def create(column_type: Type[CellValue], values: Sequence[CellValue]) -> ColumnData:
+        """Create a column from values that are either None or of the given type."""
+        if column_type is type(None):
+            return NullColumnData(row_count=len(values))
+        if column_type is str:
+            return DictionaryEncodedColumnData.from_values(values)
+        if column_type is datetime.datetime:
+            return TimestampColumnData.from_values(values)
+        if column_type is bool:
+            return ArrayColumnData.from_values("b", bool, values)
+        if column_type is float:
+            return ArrayColumnData.from_values("d", float, values)
+        if column_type is int:
+            try:
+                return ArrayColumnData.from_values("q", int, values)
+            except OverflowError:
+                # For integers that don't fit in 64 bits.
+                return ObjectColumnData(tuple(values))
+        raise ValueError(f"Unsupported column type: {column_type}")
+
+
+def _null_mask(values: Sequence[InputCellValue]) -> Optional[bytes]:
+    """Return a mask where nulls are 1, or None if there are no nulls."""
+    if None not in values:
+        return None
+    return bytes(value is None for value in values)
+
+
+def _take_null_mask(null_mask: Optional[bytes], indexes: Sequence[int]) -> Optional[bytes]:
+    if null_mask is None:
+        return None
+    return bytes(null_mask[i] for i in indexes)
+
+
+def _arrow_array_from_buffer(
+    arrow_type: pyarrow.DataType, values: array, null_mask: Optional[bytes] = None, null_code: Optional[int] = None
+) -> pyarrow.Array:
+    """Create an Arrow array that uses the memory of the given `array.array` for the values.
+
+    Nulls are specified either by a mask where nulls are 1, or by a value in the array that is used for nulls.
+    """
+    pa = import_optional_module("pyarrow", "arrow")
+    pc = import_optional_module("pyarrow.compute", "arrow")
+    values_buffer = pa.py_buffer(values)
+    validity_buffer = None
+    if null_mask is not None:
+        mask_array = pa.Array.from_buffers(pa.uint8(), len(null_mask), [None, pa.py_buffer(null_mask)])
+        validity_buffer = pc.equal(mask_array, 0).buffers()[1]
+    elif null_code is not None:
+        code_array = pa.Array.from_buffers(arrow_type, len(values), [None, values_buffer])
+        validity_buffer = pc.not_equal(code_array, null_code).buffers()[1]
+    return pa.Array.from_buffers(arrow_type, len(values), [validity_buffer, values_buffer])
+
+
+@dataclass(frozen=True, eq=False)
+class NullColumnData(ColumnData):
+    """A column where all values are None."""
+
+    row_count: int
+
+    def __len__(self) -> int:  # noqa: D105
+        return self.row_count
+
+    def __getitem__(self, index: int) -> CellValue:  # noqa: D105
+        if not -self.row_count <= index < self.row_count:
+            raise IndexError(f"Index {index} is out of range for a column with {self.row_count} values.")
+        return None
+
+    def __iter__(self) -> Iterator[CellValue]:  # noqa: D105
+        return iter((None,) * self.row_count)
+
+    def take(self, indexes: Sequence[int]) -> ColumnData:  # noqa: D102
+        return NullColumnData(row_count=len(indexes))
+
+    def to_arrow(self) -> pyarrow.Array:  # noqa: D102
+        return import_optional_module("pyarrow", "arrow").nulls(self.row_count)
+
+    @property
+    def approximate_size_in_bytes(self) -> int:  # noqa: D102
+        return 0
+
+
+@dataclass(frozen=True, eq=False)
+class ArrayColumnData(ColumnData):
+    """A column of numbers or bools that are stored in an `array.array`.
+
+    Attributes:
+        values: The values in the column. Nulls are stored as 0.
+        null_mask: A mask where the nulls are 1, or None if there are no nulls.
+        value_type: The type of the cell values, which is used for conversion from the array values.
+    """
+
+    values: array
+    null_mask: Optional[bytes]
+    value_type: Callable[[float], CellValue]
+
+    @staticmethod
+    def from_values(
+        typecode: str, value_type: Callable[[float], CellValue], values: Sequence[CellValue]
+    ) -> ArrayColumnData:
+        """Create a column with the given array type code. Raises `OverflowError` if a value does not fit."""
+        null_mask = _null_mask(values)
+        return ArrayColumnData(
+            values=array(
+                typecode, values if null_mask is None else [0 if value is None else value for value in values]
+            ),
+            null_mask=null_mask,
+            value_type=value_type,
+        )
+
+    def __len__(self) -> int:  # noqa: D105
+        return len(self.values)
+
+    def __getitem__(self, index: int) -> CellValue:  # noqa: D105
+        value = self.values[index]
+        if self.null_mask is not None and self.null_mask[index]:
+            return None
+        return self.value_type(value)
+
+    def __iter__(self) -> Iterator[CellValue]:  # noqa: D105
+        # Ints and floats are returned from the array as the right type, so the conversion can be skipped.
+        values: Iterator[CellValue] = iter(self.values) if self.value_type is not bool else map(bool, self.values)
+        if self.null_mask is None:
+            return values
+        return (None if is_null else value for value, is_null in zip(values, self.null_mask))
+
+    def take(self, indexes: Sequence[int]) -> ColumnData:  # noqa: D102
+        return ArrayColumnData(
+            values=array(self.values.typecode, (self.values[i] for i in indexes)),
+            null_mask=_take_null_mask(self.null_mask, indexes),
+            value_type=self.value_type,
+        )
+
+    def to_arrow(self) -> pyarrow.Array:  # noqa: D102
+        pa = import_optional_module("pyarrow", "arrow")
+        if self.values.typecode == "b":
+            # Arrow stores bools as bits, so the values need to be converted.
+            return _arrow_array_from_buffer(pa.int8(), self.values, self.null_mask).cast(pa.bool_())
+        arrow_type = pa.float64() if self.values.typecode == "d" else pa.int64()
+        return _arrow_array_from_buffer(arrow_type, self.values, self.null_mask)
+
+    @property
+    def approximate_size_in_bytes(self) -> int:  # noqa: D102
+        return self.values.itemsize * len(self.values) + (len(self.null_mask) if self.null_mask is not None else 0)
+
+
+@dataclass(frozen=True, eq=False)
+class TimestampColumnData(ColumnData):
+    """A column of timestamps stored as the number of microseconds from the Unix epoch in an `array.array`.
+
+    Attributes:
+        values: The timestamps in the column. Nulls are stored as 0.
+        null_mask: A mask where the nulls are 1, or None if there are no nulls.
+    """
+
+    values: array
+    null_mask: Optional[bytes]
+
+    @staticmethod
+    def from_values(values: Sequence[CellValue]) -> TimestampColumnData:  # noqa: D102
+        null_mask = _null_mask(values)
+        microseconds: List[int] = []
+        for value in values:
+            if value is None:
+                microseconds.append(0)
+                continue
+            assert isinstance(value, datetime.datetime), f"Expected a datetime but got: {value!r}"
+            microseconds.append((value - _EPOCH) // _ONE_MICROSECOND)
+        return TimestampColumnData(values=array("q", microseconds), null_mask=null_mask)
+
+    @staticmethod
+    def _to_datetime(microseconds: int) -> datetime.datetime:
+        return _EPOCH + datetime.timedelta(microseconds=microseconds)
+
+    def __len__(self) -> int:  # noqa: D105
+        return len(self.values)
+
+    def __getitem__(self, index: int) -> CellValue:  # noqa: D105
+        value = self.values[index]
+        if self.null_mask is not None and self.null_mask[index]:
+            return None
+        return TimestampColumnData._to_datetime(value)
+
+    def __iter__(self) -> Iterator[CellValue]:  # noqa: D105
+        values = map(TimestampColumnData._to_datetime, self.values)
+        if self.null_mask is None:
+            return iter(values)
+        return (None if is_null else value for value, is_null in zip(values, self.null_mask))
+
+    def take(self, indexes: Sequence[int]) -> ColumnData:  # noqa: D102
+        return TimestampColumnData(
+            values=array("q", (self.values[i] for i in indexes)),
+            null_mask=_take_null_mask(self.null_mask, indexes),
+        )
+
+    def to_arrow(self) -> pyarrow.Array:  # noqa: D102
+        pa = import_optional_module("pyarrow", "arrow")
+        return _arrow_array_from_buffer(pa.timestamp("us"), self.values, self.null_mask)
+
+    @property
+    def approximate_size_in_bytes(self) -> int:  # noqa: D102
+        return self.values.itemsize * len(self.values) + (len(self.null_mask) if self.null_mask is not None else 0)
+
+
+@dataclass(frozen=True, eq=False)
+class DictionaryEncodedColumnData(ColumnData):
+    """A column of strings where each distinct string is stored once, and the rows store an index to the string.
+
+    Attributes:
+        dictionary: The distinct values in the column, followed by None. The index -1 is used for nulls.
+        codes: For each row, the index of the value in the dictionary.
+    """
+
+    dictionary: Tuple[Optional[str], ...]
+    codes: array
+
+    @staticmethod
+    def from_values(values: Sequence[CellValue]) -> DictionaryEncodedColumnData:  # noqa: D102
+        value_to_code: Dict[CellValue, int] = {None: -1}
+        codes = array("i", [value_to_code.setdefault(value, len(value_to_code) - 1) for value in values])
+        dictionary = tuple(value for value in value_to_code if value is not None)
+        for value in dictionary:
+            assert isinstance(value, str), f"Expected a str but got: {value!r}"
+        return DictionaryEncodedColumnData(dictionary=dictionary + (None,), codes=codes)  # type: ignore[arg-type]
+
+    def __len__(self) -> int:  # noqa: D105
+        return len(self.codes)
+
+    def __getitem__(self, index: int) -> CellValue:  # noqa: D105
+        return self.dictionary[self.codes[index]]
+
+    def __iter__(self) -> Iterator[CellValue]:  # noqa: D105
+        return map(self.dictionary.__getitem__, self.codes)
+
+    def take(self, indexes: Sequence[int]) -> ColumnData:  # noqa: D102
+        return DictionaryEncodedColumnData(
+            dictionary=self.dictionary, codes=array("i", (self.codes[i] for i in indexes))
+        )
+
+    def to_arrow(self) -> pyarrow.Array:  # noqa: D102
+        pa = import_optional_module("pyarrow", "arrow")
+        indices = _arrow_array_from_buffer(pa.int32(), self.codes, null_code=-1)
+        return pa.DictionaryArray.from_arrays(indices, pa.array(self.dictionary[:-1], type=pa.string()))
+
+    @property
+    def approximate_size_in_bytes(self) -> int:  # noqa: D102
+        return self.codes.itemsize * len(self.codes) + sum(
+            sys.getsizeof(value) for value in self.dictionary if value is not None
+        )
+
+
+@dataclass(frozen=True, eq=False)
+class ObjectColumnData(ColumnData):
+    """A column where the values are stored as Python objects in a tuple.
+
+    This is used for values that can't be stored in a typed array e.g. integers that don't fit in 64 bits.
+    """
+
+    values: Tuple[CellValue, ...]
+
+    def __len__(self) -> int:  # noqa: D105
+        return len(self.values)
+
+    def __getitem__(self, index: int) -> CellValue:  # noqa: D105
+        return self.values[index]
+
+    def __iter__(self) -> Iterator[CellValue]:  # noqa: D105
+        return iter(self.values)
+
+    def take(self, indexes: Sequence[int]) -> ColumnData:  # noqa: D102
+        return ObjectColumnData(tuple(self.values[i] for i in indexes))
+
+    def to_arrow(self) -> pyarrow.Array:  # noqa: D102
+        pa = import_optional_module("pyarrow", "arrow")
+        # Integers that don't fit in 64 bits are stored as decimals, which supports 128-bit integers.
+        return pa.array(self.values, type=pa.decimal128(38, 0))
+
+    @property
+    def approximate_size_in_bytes(self) -> int:  # noqa: D102
+        return _APPROXIMATE_BOXED_VALUE_SIZE_IN_BYTES * len(self.values)
+
+
+# Types that can be used in a column without conversion.
+_SUPPORTED_CELL_TYPES = frozenset((type(None), int, float, bool, str, datetime.datetime))
+
+
+def _convert_input_value(value: InputCellValue, stringify_unsupported_value: bool) -> CellValue:
+    """Since only a limited set of types are supported, convert the input type to the supported type.
+
+    This also handles subclasses of the supported types, and datetimes with a time zone.
+    """
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return bool(value)
+    if isinstance(value, int):
+        return int(value)
+    if isinstance(value, float):
+        return float(value)
+    if isinstance(value, str):
+        return str(value)
+    if isinstance(value, datetime.datetime):
+        return datetime.datetime(
+            value.year, value.month, value.day, value.hour, value.minute, value.second, value.microsecond
+        )
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, datetime.date):
+        return datetime.datetime(value.year, value.month, value.day)
+    if stringify_unsupported_value:
+        return str(value)
+    raise ValueError(f"Row cell has unexpected type: {value!r}")
+
+
+def create_column_data(
+    values: Sequence[InputCellValue], stringify_unsupported_values: bool = False
+) -> Tuple[Type[CellValue], ColumnData]:
+    """Create a column from input values, and return the type of the column along with the column.
+
+    The types of the values are checked once for the column instead of for each value, so values are only converted
+    when the column contains one of the input-only types (e.g. `Decimal`). Raises `ValueError` if there are values with
+    different types, or if there are values with an unsupported type and `stringify_unsupported_values` is not set.
+    """
+    value_types = set(map(type, values))
+    cell_values: Sequence[CellValue]
+    has_time_zones = datetime.datetime in value_types and any(
+        value.tzinfo is not None for value in values if isinstance(value, datetime.datetime)
+    )
+    if value_types.issubset(_SUPPORTED_CELL_TYPES) and not has_time_zones:
+        cell_values = values  # type: ignore[assignment]
+    else:
+        cell_values = tuple(_convert_input_value(value, stringify_unsupported_values) for value in values)
+        value_types = set(map(type, cell_values))
+
+    value_types.discard(type(None))
+    if len(value_types) > 1:
+        raise ValueError(f"Expected cells in a column to have the same type but got: {sorted(map(str, value_types))}")
+    column_type: Type[CellValue] = value_types.pop() if len(value_types) == 1 else type(None)
+    return column_type, ColumnData.create(column_type, cell_values)
+
+
+def _array_from_arrow_buffer(typecode: str, arrow_array: pyarrow.Array) -> array:
+    """Copy the values buffer of a fixed-width Arrow array without nulls into an `array.array`."""
+    values = array(typecode)
+    item_size = values.itemsize
+    values_buffer = arrow_array.buffers()[1]
+    values.frombytes(
+        memoryview(values_buffer)[arrow_array.offset * item_size : (arrow_array.offset + len(arrow_array)) * item_size]
+    )
+    return values
+
+
+def _null_mask_from_arrow(arrow_array: pyarrow.Array) -> Optional[bytes]:
+    """Return a mask where nulls are 1, or None if there are no nulls."""
+    if arrow_array.null_count == 0:
+        return None
+    pa = import_optional_module("pyarrow", "arrow")
+    return _array_from_arrow_buffer("B", arrow_array.is_null().cast(pa.uint8())).tobytes()
+
+
+def column_data_from_arrow(
+    arrow_array: Union[pyarrow.Array, pyarrow.ChunkedArray]
+) -> Tuple[Type[CellValue], ColumnData]:
+    """Create a column from an Arrow array, and return the type of the column along with the column.
+
+    Numeric, timestamp, and string columns are converted using the Arrow buffers without creating a Python object for
+    each value. Other types are converted through Python objects in the same way as `create_column_data`.
+    """
+    pa = import_optional_module("pyarrow", "arrow")
+    pc = import_optional_module("pyarrow.compute", "arrow")
+    if isinstance(arrow_array, pa.ChunkedArray):
+        arrow_array = arrow_array.combine_chunks()
+    arrow_type = arrow_array.type
+
+    if pa.types.is_null(arrow_type):
+        return type(None), NullColumnData(row_count=len(arrow_array))
+
+    if pa.types.is_dictionary(arrow_type) and pa.types.is_string(arrow_type.value_type):
+        arrow_array = arrow_array.cast(pa.string())
+        arrow_type = arrow_array.type
+    if pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type):
+        encoded_array = pc.dictionary_encode(arrow_array)
+        dictionary: Tuple[Optional[str], ...] = tuple(encoded_array.dictionary.to_pylist())
+        codes = _array_from_arrow_buffer("i", encoded_array.indices.fill_null(-1).cast(pa.int32()))
+        return str, DictionaryEncodedColumnData(dictionary=dictionary + (None,), codes=codes)
+
+    column_type: Optional[Type[CellValue]] = None
+    typecode = "q"
+    if pa.types.is_boolean(arrow_type):
+        column_type, typecode, arrow_array = bool, "b", arrow_array.cast(pa.int8())
+    elif pa.types.is_floating(arrow_type) or pa.types.is_decimal(arrow_type):
+        # Decimals are converted to floats, as in `create_column_data`.
+        column_type, typecode, arrow_array = float, "d", arrow_array.cast(pa.float64())
+    elif pa.types.is_integer(arrow_type) and not pa.types.is_uint64(arrow_type):
+        column_type, arrow_array = int, arrow_array.cast(pa.int64())
+    elif (pa.types.is_timestamp(arrow_type) and arrow_type.tz is None) or pa.types.is_date(arrow_type):
+        # Sub-microsecond values are truncated as `datetime` only has microsecond resolution.
+        column_type, arrow_array = datetime.datetime, pc.cast(arrow_array, pa.timestamp("us"), safe=False)
+
+    if column_type is None:
+        return create_column_data(arrow_array.to_pylist(), stringify_unsupported_values=True)
+
+    null_mask = _null_mask_from_arrow(arrow_array)
+    if column_type is datetime.datetime:
+        arrow_array = arrow_array.cast(pa.int64())
+    if null_mask is not None:
+        arrow_array = arrow_array.fill_null(0)
+    values = _array_from_arrow_buffer(typecode, arrow_array)
+    if column_type is datetime.datetime:
+        return column_type, TimestampColumnData(values=values, null_mask=null_mask)
+    return column_type, ArrayColumnData(values=values, null_mask=null_mask, value_type=column_type)
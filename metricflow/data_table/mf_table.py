@@ -1,24 +1,30 @@
 from __future__ import annotations
 
 import datetime
-import itertools
 import logging
+import pathlib
 from dataclasses import dataclass
-from decimal import Decimal
-from typing import Iterable, Iterator, List, Optional, Sequence, Tuple, Type
+from typing import TYPE_CHECKING, Iterable, Iterator, List, Optional, Sequence, Tuple, Union, overload
 
 import tabulate
 from metricflow_semantics.mf_logging.formatting import indent
 from metricflow_semantics.mf_logging.pretty_print import mf_pformat, mf_pformat_many
 from typing_extensions import Self
 
-from metricflow.data_table.column_types import CellValue, InputCellValue, row_cell_types
+from metricflow.data_table.column_data import ColumnData, column_data_from_arrow, create_column_data
+from metricflow.data_table.column_types import CellValue, InputCellValue
 from metricflow.data_table.mf_column import ColumnDescription
+from metricflow.data_table.optional_modules import import_optional_module
+
+if TYPE_CHECKING:
+    import pandas
+    import polars
+    import pyarrow
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass(frozen=True, eq=False)
+@dataclass(frozen=True, eq=False, init=False)
 class MetricFlowDataTable:
     """Container for tabular data stored in memory.
 
@@ -28,45 +34,48 @@ class MetricFlowDataTable:
     When constructing the table, additional input types (as described by `InputCellValue`) can be used, but those
     additional types will be converted into one of the `CellValue` types.
 
+    The data is stored by column using `ColumnData`, which keeps the values in compact, typed arrays. The types of the
+    values are checked once per column when the table is built. `rows` provides a row-oriented view of the data, and
+    the table can still be constructed from rows.
+
     Don't use `=` to compare tables as there many be NaNs. Instead, use `check_data_tables_are_equal`.
     """
 
     column_descriptions: Tuple[ColumnDescription, ...]
-    rows: Tuple[Tuple[CellValue, ...], ...]
-
-    def __post_init__(self) -> None:  # noqa: D105
-        expected_column_count = self.column_count
-        for row_index, row in enumerate(self.rows):
-            # Check that the number of columns in the rows match.
-            row_column_count = len(row)
-            assert row_column_count == expected_column_count, (
-                f"Row at index {row_index} has {row_column_count} columns instead of {expected_column_count}. "
-                f"Row is:"
-                f"\n{indent(mf_pformat(row))}"
-            )
-            # Check that the type of the object in the rows match.
-            for column_index, cell_value in enumerate(row):
-                expected_cell_value_type = self.column_descriptions[column_index].column_type
-                assert cell_value is None or isinstance(cell_value, expected_cell_value_type), mf_pformat_many(
-                    "Cell value type mismatch.",
-                    {
-                        "row_index": row_index,
-                        "column_index": column_index,
-                        "expected_cell_value_type": expected_cell_value_type,
-                        "actual_cell_value_type": type(cell_value),
-                        "cell_value": cell_value,
-                    },
-                )
-                # Check that datetimes don't have a timezone set.
-                if isinstance(cell_value, datetime.datetime):
-                    assert cell_value.tzinfo is None, mf_pformat_many(
-                        "Time zone provided for datetime.",
-                        {
-                            "row_index": row_index,
-                            "column_index": column_index,
-                            "cell_value": cell_value,
-                        },
-                    )
+    columns: Tuple[ColumnData, ...]
+
+    def __init__(
+        self,
+        column_descriptions: Sequence[ColumnDescription],
+        rows: Optional[Sequence[Sequence[CellValue]]] = None,
+        columns: Optional[Sequence[ColumnData]] = None,
+    ) -> None:
+        """Initializer.
+
+        Args:
+            column_descriptions: Describes the columns in the table.
+            rows: The values in the table by row. The values must have the type given in the column description.
+            columns: The values in the table by column. Exactly one of `rows` or `columns` must be specified.
+        """
+        if (rows is None) == (columns is None):
+            raise ValueError("Exactly one of `rows` or `columns` must be specified.")
+        column_descriptions = tuple(column_descriptions)
+        if rows is not None:
+            columns = _columns_from_rows(column_descriptions, rows)
+        assert columns is not None
+        object.__setattr__(self, "column_descriptions", column_descriptions)
+        object.__setattr__(self, "columns", tuple(columns))
+
+        assert len(self.columns) == len(self.column_descriptions), (
+            f"Got {len(self.columns)} columns but {len(self.column_descriptions)} column descriptions. Column "
+            f"descriptions are:\n{indent(mf_pformat(self.column_descriptions))}"
+        )
+        # Check that the number of rows in the columns match.
+        column_lengths = tuple(len(column) for column in self.columns)
+        assert len(set(column_lengths)) <= 1, mf_pformat_many(
+            "Columns have different numbers of rows.",
+            {"column_names": self.column_names, "column_lengths": column_lengths},
+        )
 
     @property
     def column_count(self) -> int:  # noqa: D102
@@ -74,7 +83,12 @@ class MetricFlowDataTable:
 
     @property
     def row_count(self) -> int:  # noqa: D102
-        return len(self.rows)
+        return len(self.columns[0]) if len(self.columns) > 0 else 0
+
+    @property
+    def rows(self) -> Sequence[Tuple[CellValue, ...]]:
+        """A view of the data as a sequence of rows. Row tuples are created when they are accessed."""
+        return _RowView(self)
 
     def column_name_index(self, column_name: str) -> int:
         """Return the index of the column that matches the given name. Raises `ValueError` if the name is invalid."""
@@ -92,23 +106,18 @@ class MetricFlowDataTable:
 
     def column_values_iterator(self, column_index: int) -> Iterator[CellValue]:
         """Returns an iterator for values of the column at the tiven index."""
-        return (row[column_index] for row in self.rows)
+        return iter(self.columns[column_index])
 
-    def _sorted_by_column_name(self) -> MetricFlowDataTable:  # noqa: D102
-        new_rows: List[List[CellValue]] = [[] for _ in range(self.row_count)]
-        sorted_column_names = sorted(self.column_names)
-        for column_name in sorted_column_names:
-            old_column_index = self.column_name_index(column_name)
-            for row_index, cell_value in enumerate(self.column_values_iterator(old_column_index)):
-                new_rows[row_index].append(cell_value)
+    @property
+    def approximate_size_in_bytes(self) -> int:
+        """The approximate memory used by the values in this table."""
+        return sum(column.approximate_size_in_bytes for column in self.columns)
 
+    def _sorted_by_column_name(self) -> MetricFlowDataTable:  # noqa: D102
+        column_indexes = tuple(self.column_name_index(column_name) for column_name in sorted(self.column_names))
         return MetricFlowDataTable(
-            column_descriptions=tuple(
-                self.column_descriptions[self.column_name_index(column_name)] for column_name in sorted_column_names
-            ),
-            rows=tuple(
-                tuple(row_dict[column_index] for column_index in range(self.column_count)) for row_dict in new_rows
-            ),
+            column_descriptions=tuple(self.column_descriptions[column_index] for column_index in column_indexes),
+            columns=tuple(self.columns[column_index] for column_index in column_indexes),
         )
 
     def _sorted_by_row(self) -> MetricFlowDataTable:  # noqa: D102
@@ -117,18 +126,27 @@ class MetricFlowDataTable:
                 return cell.isoformat()
             return str(cell)
 
-        def _row_sort_key(row: Tuple[CellValue, ...]) -> Tuple[str, ...]:
-            return tuple(_cell_sort_key(cell) for cell in row)
+        row_sort_keys = tuple(tuple(_cell_sort_key(cell) for cell in row) for row in self.rows)
+        return self._take_rows(sorted(range(self.row_count), key=row_sort_keys.__getitem__))
 
+    def _take_rows(self, row_indexes: Sequence[int]) -> MetricFlowDataTable:
+        """Return a table with the rows at the given indexes, in that order."""
         return MetricFlowDataTable(
             column_descriptions=self.column_descriptions,
-            rows=tuple(sorted((row for row in self.rows), key=_row_sort_key)),
+            columns=tuple(column.take(row_indexes) for column in self.columns),
         )
 
     def sorted(self) -> MetricFlowDataTable:
         """Returns this but with the columns in order by name, and the rows in order by values."""
         return self._sorted_by_column_name()._sorted_by_row()
 
+    def slice_rows(self, start: int, stop: int) -> MetricFlowDataTable:
+        """Return a table with the rows in the given range. Similar to list slicing, `stop` may exceed the row count."""
+        return MetricFlowDataTable(
+            column_descriptions=self.column_descriptions,
+            columns=tuple(column.slice(start, stop) for column in self.columns),
+        )
+
     def text_format(self, float_decimals: int = 2) -> str:
         """Return a text version of this table that is suitable for printing."""
         str_rows: List[List[str]] = []
@@ -156,11 +174,42 @@ class MetricFlowDataTable:
             column_descriptions=tuple(
                 column_description.with_lower_case_column_name() for column_description in self.column_descriptions
             ),
-            rows=self.rows,
+            columns=self.columns,
         )
 
     def get_cell_value(self, row_index: int, column_index: int) -> CellValue:  # noqa: D102
-        return self.rows[row_index][column_index]
+        return self.columns[column_index][row_index]
+
+    def to_arrow(self) -> pyarrow.Table:
+        """Return this as an Arrow table. Requires the `arrow` extra.
+
+        The columns are converted directly without creating the rows, and the numeric and timestamp columns share
+        memory with this table. String columns are converted to dictionary-encoded Arrow columns.
+        """
+        pa = import_optional_module("pyarrow", "arrow")
+        return pa.Table.from_arrays([column.to_arrow() for column in self.columns], names=list(self.column_names))
+
+    def to_parquet(self, path: Union[str, pathlib.Path]) -> None:
+        """Write this to a Parquet file at the given path. Requires the `arrow` extra."""
+        pq = import_optional_module("pyarrow.parquet", "arrow")
+        pq.write_table(self.to_arrow(), str(path))
+
+    def to_arrow_ipc_file(self, path: Union[str, pathlib.Path]) -> None:
+        """Write this to a file in the Arrow IPC (Feather V2) format at the given path. Requires the `arrow` extra."""
+        ipc = import_optional_module("pyarrow.ipc", "arrow")
+        arrow_table = self.to_arrow()
+        with ipc.new_file(str(path), arrow_table.schema) as writer:
+            writer.write_table(arrow_table)
+
+    def to_pandas(self) -> pandas.DataFrame:
+        """Return this as a pandas `DataFrame`. Requires the `pandas` extra."""
+        import_optional_module("pandas", "pandas")
+        return self.to_arrow().to_pandas()
+
+    def to_polars(self) -> polars.DataFrame:
+        """Return this as a Polars `DataFrame`, which uses the memory of the Arrow table. Requires the `polars` extra."""
+        pl = import_optional_module("polars", "polars")
+        return pl.from_arrow(self.to_arrow())
 
     @staticmethod
     def create_from_rows(  # noqa: D102
@@ -171,92 +220,137 @@ class MetricFlowDataTable:
             builder.add_row(row)
         return builder.build()
 
+    @staticmethod
+    def create_from_columns(
+        column_names: Sequence[str],
+        columns: Sequence[Sequence[InputCellValue]],
+        stringify_unsupported_values: bool = False,
+    ) -> MetricFlowDataTable:
+        """Create a table from the values in each column.
+
+        If `stringify_unsupported_values` is set, values with types that are not supported (e.g. `UUID`) are converted
+        to strings instead of raising a `ValueError`.
+        """
+        if len(column_names) != len(columns):
+            raise ValueError(f"Got {len(columns)} columns but {len(column_names)} column names: {column_names}")
+        column_descriptions: List[ColumnDescription] = []
+        column_datas: List[ColumnData] = []
+        for column_name, column_values in zip(column_names, columns):
+            column_type, column_data = create_column_data(column_values, stringify_unsupported_values)
+            column_descriptions.append(ColumnDescription(column_name=column_name, column_type=column_type))
+            column_datas.append(column_data)
+        return MetricFlowDataTable(column_descriptions=tuple(column_descriptions), columns=tuple(column_datas))
 
-class _MetricFlowDataTableBuilder:
-    """Helps build `MetricFlowDataTable`, one row at a time.
+    @staticmethod
+    def create_from_arrow(arrow_data: Union[pyarrow.Table, pyarrow.RecordBatch]) -> MetricFlowDataTable:
+        """Create a table from an Arrow table or record batch. Requires the `arrow` extra.
+
+        The columns are converted from the Arrow buffers where possible, so the rows don't need to be created.
+        """
+        import_optional_module("pyarrow", "arrow")
+        column_descriptions: List[ColumnDescription] = []
+        column_datas: List[ColumnData] = []
+        for column_name, arrow_column in zip(arrow_data.column_names, arrow_data.columns):
+            column_type, column_data = column_data_from_arrow(arrow_column)
+            column_descriptions.append(ColumnDescription(column_name=column_name, column_type=column_type))
+            column_datas.append(column_data)
+        return MetricFlowDataTable(column_descriptions=tuple(column_descriptions), columns=tuple(column_datas))
+
+
+def _columns_from_rows(
+    column_descriptions: Sequence[ColumnDescription], rows: Sequence[Sequence[CellValue]]
+) -> Tuple[ColumnData, ...]:
+    """Convert rows to columns, checking that the values match the column descriptions."""
+    expected_column_count = len(column_descriptions)
+    for row_index, row in enumerate(rows):
+        # Check that the number of columns in the rows match.
+        row_column_count = len(row)
+        assert row_column_count == expected_column_count, (
+            f"Row at index {row_index} has {row_column_count} columns instead of {expected_column_count}. "
+            f"Row is:"
+            f"\n{indent(mf_pformat(row))}"
+        )
 
-    This validates each row as it is input to give better error messages.
-    """
+    columns: List[ColumnData] = []
+    for column_index, column_description in enumerate(column_descriptions):
+        expected_cell_value_type = column_description.column_type
+        column_values = tuple(row[column_index] for row in rows)
+        # Check that the type of the values in the column match.
+        for row_index, cell_value in enumerate(column_values):
+            assert cell_value is None or isinstance(cell_value, expected_cell_value_type), mf_pformat_many(
+                "Cell value type mismatch.",
+                {
+                    "row_index": row_index,
+                    "column_index": column_index,
+                    "expected_cell_value_type": expected_cell_value_type,
+                    "actual_cell_value_type": type(cell_value),
+                    "cell_value": cell_value,
+                },
+            )
+            # Check that datetimes don't have a timezone set.
+            if isinstance(cell_value, datetime.datetime):
+                assert cell_value.tzinfo is None, mf_pformat_many(
+                    "Time zone provided for datetime.",
+                    {
+                        "row_index": row_index,
+                        "column_index": column_index,
+                        "cell_value": cell_value,
+                    },
+                )
+        columns.append(ColumnData.create(expected_cell_value_type, column_values))
+    return tuple(columns)
 
-    def __init__(self, column_names: Sequence[str]) -> None:  # noqa: D107
-        self._rows: List[Tuple[CellValue, ...]] = []
-        self._column_names = tuple(column_names)
 
-    def _build_table_from_rows(self) -> MetricFlowDataTable:  # noqa: D102
-        # Figure out the type of the column based on the types of the values in the rows.
-        # Can't use the type of the columns in the first row because it might contain None, so iterate through the rows
-        # and use the first non-None type.
-        column_types_so_far: Optional[Tuple[Type[CellValue], ...]] = None
-        cell_value: CellValue
-        for row in self._rows:
-            if column_types_so_far is None:
-                column_types_so_far = row_cell_types(row)
-                continue
-
-            # If the types of the objects in the row are the same, no need for updates.
-            row_column_types = row_cell_types(row)
-            if row_column_types == column_types_so_far:
-                continue
-
-            # Types of objects in the row are different from what's known so far.
-            # They can only be different in that one can be None and other can be not None.
-            updated_column_types: List[Type[CellValue]] = []
-            for column_type_so_far, cell_type, cell_value in itertools.zip_longest(
-                column_types_so_far, row_column_types, row
-            ):
-                if column_type_so_far is cell_type:
-                    updated_column_types.append(column_type_so_far)
-                elif column_type_so_far is type(None) and cell_type is not None:
-                    updated_column_types.append(cell_type)
-                elif column_type_so_far is not None and cell_type is type(None):
-                    updated_column_types.append(column_type_so_far)
-                else:
-                    raise ValueError(f"Expected cell type {column_type_so_far} but got: {cell_type}")
-
-            column_types_so_far = tuple(updated_column_types)
-
-        # Empty table case.
-        if column_types_so_far is None:
-            column_types_so_far = tuple(type(None) for _ in range(len(self._column_names)))
-
-        final_column_types = column_types_so_far
+class _RowView(Sequence[Tuple[CellValue, ...]]):
+    """A read-only, row-oriented view of the data in a `MetricFlowDataTable`."""
 
-        return MetricFlowDataTable(
-            column_descriptions=tuple(
-                ColumnDescription(column_name=column_name, column_type=column_type)
-                for column_name, column_type in itertools.zip_longest(self._column_names, final_column_types)
-            ),
-            rows=tuple(self._rows),
-        )
+    def __init__(self, data_table: MetricFlowDataTable) -> None:  # noqa: D107
+        self._data_table = data_table
 
-    def _convert_row_to_supported_types(self, row: Sequence[InputCellValue]) -> Sequence[CellValue]:
-        """Since only a limited set of types are supported, convert the input type to the supported type."""
-        updated_row: List[CellValue] = []
-        for cell_value in row:
-            if (
-                cell_value is None
-                or isinstance(cell_value, float)
-                or isinstance(cell_value, bool)
-                or isinstance(cell_value, int)
-                or isinstance(cell_value, str)
-            ):
-                updated_row.append(cell_value)
-                continue
+    def __len__(self) -> int:  # noqa: D105
+        return self._data_table.row_count
 
-            if isinstance(cell_value, datetime.datetime):
-                updated_row.append(cell_value.replace(tzinfo=None))
-                continue
+    @overload
+    def __getitem__(self, index: int) -> Tuple[CellValue, ...]:  # noqa: D105
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> Sequence[Tuple[CellValue, ...]]:  # noqa: D105
+        ...
+
+    def __getitem__(
+        self, index: Union[int, slice]
+    ) -> Union[Tuple[CellValue, ...], Sequence[Tuple[CellValue, ...]]]:  # noqa: D105
+        if isinstance(index, slice):
+            return tuple(self)[index]
+        if not -len(self) <= index < len(self):
+            raise IndexError(f"Row index {index} is out of range for a table with {len(self)} rows.")
+        return tuple(column[index] for column in self._data_table.columns)
+
+    def __iter__(self) -> Iterator[Tuple[CellValue, ...]]:  # noqa: D105
+        if self._data_table.column_count == 0:
+            return iter(() for _ in range(self._data_table.row_count))
+        return zip(*self._data_table.columns)
+
+    def __eq__(self, other: object) -> bool:  # noqa: D105
+        if not isinstance(other, Sequence) or isinstance(other, str):
+            return NotImplemented
+        return len(self) == len(other) and all(row == tuple(other_row) for row, other_row in zip(self, other))
 
-            if isinstance(cell_value, Decimal):
-                updated_row.append(float(cell_value))
-                continue
+    def __repr__(self) -> str:  # noqa: D105
+        return repr(tuple(self))
 
-            if isinstance(cell_value, datetime.date):
-                updated_row.append(datetime.datetime.combine(cell_value, datetime.datetime.min.time()))
-                continue
 
-            raise ValueError(f"Row cell has unexpected type: {repr(cell_value)}")
-        return updated_row
+class _MetricFlowDataTableBuilder:
+    """Helps build `MetricFlowDataTable`, one row at a time.
+
+    This validates the length of each row as it is input to give better error messages. The types of the values are
+    checked per column when the table is built.
+    """
+
+    def __init__(self, column_names: Sequence[str]) -> None:  # noqa: D107
+        self._rows: List[Tuple[InputCellValue, ...]] = []
+        self._column_names = tuple(column_names)
 
     def add_row(self, row: Sequence[InputCellValue], parse_strings: bool = False) -> Self:  # noqa: D102
         row = tuple(row)
@@ -267,8 +361,12 @@ class _MetricFlowDataTableBuilder:
                 f"Input row has {actual_column_count} columns, but expected {expected_column_count} columns. Row is:"
                 f"\n{indent(mf_pformat(row))}"
             )
-        self._rows.append(tuple(self._convert_row_to_supported_types(row)))
+        self._rows.append(row)
         return self
 
     def build(self) -> MetricFlowDataTable:  # noqa: D102
-        return self._build_table_from_rows()
+        if len(self._rows) == 0:
+            columns: Sequence[Sequence[InputCellValue]] = tuple(() for _ in self._column_names)
+        else:
+            columns = tuple(zip(*self._rows))
+        return MetricFlowDataTable.create_from_columns(column_names=self._column_names, columns=columns)
@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+import importlib
+from types import ModuleType
+
+
+def import_optional_module(module_name: str, extra_name: str) -> ModuleType:
+    """Import a module that is only installed with one of the extras of this package.
+
+    Raises an `ImportError` that describes how to install the module if it's not installed.
+    """
+    try:
+        return importlib.import_module(module_name)
+    except ImportError as e:
+        raise ImportError(
+            f"This requires the {module_name!r} package, which can be installed with `pip install "
+            f"metricflow[{extra_name}]`."
+        ) from e
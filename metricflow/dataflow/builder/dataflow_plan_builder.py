@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import dataclasses
 import logging
+import math
 import time
 from dataclasses import dataclass
 from typing import Dict, FrozenSet, List, Optional, Sequence, Set, Tuple, Union
@@ -18,6 +20,7 @@ from dbt_semantic_interfaces.protocols.metric import (
 from dbt_semantic_interfaces.references import MetricReference, TimeDimensionReference
 from dbt_semantic_interfaces.type_enums.time_granularity import TimeGranularity
 from dbt_semantic_interfaces.validations.unique_valid_name import MetricFlowReservedKeywords
+from metricflow_semantics.collection_helpers.lru_cache import LruCache
 from metricflow_semantics.dag.id_prefix import StaticIdPrefix
 from metricflow_semantics.dag.mf_dag import DagId
 from metricflow_semantics.errors.error_classes import UnableToSatisfyQueryError
@@ -65,6 +68,7 @@ from metricflow.dataflow.builder.node_evaluator import (
     NodeEvaluatorForLinkableInstances,
 )
 from metricflow.dataflow.builder.source_node import SourceNodeBuilder, SourceNodeSet
+from metricflow.dataflow.builder.source_node_index import SourceNodeSpecIndex
 from metricflow.dataflow.dataflow_plan import (
     DataflowPlan,
     DataflowPlanNode,
@@ -93,10 +97,12 @@ from metricflow.dataflow.optimizer.dataflow_optimizer_factory import (
 )
 from metricflow.dataset.dataset_classes import DataSet
 from metricflow.plan_conversion.node_processor import (
+    PrecomputedMultiHopJoinCandidates,
     PredicateInputType,
     PredicatePushdownState,
     PreJoinNodeProcessor,
 )
+from metricflow.protocols.table_statistics import TableStatisticsProvider
 
 logger = logging.getLogger(__name__)
 
@@ -125,17 +131,65 @@ class MeasureSpecProperties:
     non_additive_dimension_spec: Optional[NonAdditiveDimensionSpec] = None
 
 
+@dataclass(frozen=True)
+class SourceNodeRecipeCacheKey:
+    """The inputs that determine the result of `DataflowPlanBuilder._find_source_node_recipe` for a manifest.
+
+    The other properties in `MeasureSpecProperties` are derived from the measure specs and the manifest, so only the
+    measure specs are included.
+    """
+
+    linkable_spec_set: LinkableSpecSet
+    predicate_pushdown_state: PredicatePushdownState
+    measure_specs: Optional[Tuple[MeasureSpec, ...]]
+
+    @staticmethod
+    def create(  # noqa: D102
+        linkable_spec_set: LinkableSpecSet,
+        predicate_pushdown_state: PredicatePushdownState,
+        measure_spec_properties: Optional[MeasureSpecProperties],
+    ) -> SourceNodeRecipeCacheKey:
+        # Sequences in the inputs may be lists, so they are converted to tuples to make the key hashable.
+        return SourceNodeRecipeCacheKey(
+            linkable_spec_set=linkable_spec_set,
+            predicate_pushdown_state=dataclasses.replace(
+                predicate_pushdown_state, where_filter_specs=tuple(predicate_pushdown_state.where_filter_specs)
+            ),
+            measure_specs=(
+                tuple(measure_spec_properties.measure_specs) if measure_spec_properties is not None else None
+            ),
+        )
+
+
 class DataflowPlanBuilder:
     """Builds a dataflow plan to satisfy a given query."""
 
-    def __init__(  # noqa: D107
+    def __init__(
         self,
         source_node_set: SourceNodeSet,
         semantic_manifest_lookup: SemanticManifestLookup,
         node_output_resolver: DataflowPlanNodeOutputDataSetResolver,
         column_association_resolver: ColumnAssociationResolver,
         source_node_builder: SourceNodeBuilder,
+        source_node_recipe_cache_max_entries: int = 0,
+        precompute_multi_hop_join_candidates: bool = False,
+        table_statistics_provider: Optional[TableStatisticsProvider] = None,
     ) -> None:
+        """Initializer.
+
+        source_node_recipe_cache_max_entries can be set to a positive value to cache the recipes found for the source
+        nodes of a query, so that queries with the same group-by items, measures, and filters skip the search. Since
+        cached recipes contain the nodes created for an earlier query, the IDs of those nodes in a plan may not be
+        sequential.
+
+        precompute_multi_hop_join_candidates can be set to True to build the candidate nodes for two-hop joins between
+        the source nodes here, instead of for each query that has multi-hop group-by items. Like cached recipes, the
+        candidate nodes in a plan will have IDs that were generated here.
+
+        table_statistics_provider can be set to use the sizes of the tables when choosing source nodes. Candidate nodes
+        are then ordered by the number of rows that they read, and between recipes with the same number of joins, the
+        one that reads the fewest rows is used.
+        """
         self._semantic_model_lookup = semantic_manifest_lookup.semantic_model_lookup
         self._metric_lookup = semantic_manifest_lookup.metric_lookup
         self._metric_time_dimension_reference = DataSet.metric_time_dimension_reference()
@@ -144,6 +198,39 @@ class DataflowPlanBuilder:
         self._node_data_set_resolver = node_output_resolver
         self._source_node_builder = source_node_builder
         self._time_period_adjuster = DateutilTimePeriodAdjuster()
+        self._table_statistics_provider = table_statistics_provider
+        # Indexes for finding the source nodes with the requested specs without scanning all source nodes.
+        self._metric_query_source_node_index = SourceNodeSpecIndex.create(
+            source_nodes=source_node_set.source_nodes_for_metric_queries, node_data_set_resolver=node_output_resolver
+        )
+        self._group_by_item_query_source_node_index = SourceNodeSpecIndex.create(
+            source_nodes=source_node_set.source_nodes_for_group_by_item_queries,
+            node_data_set_resolver=node_output_resolver,
+        )
+        self._source_node_recipe_cache: Optional[LruCache[SourceNodeRecipeCacheKey, SourceNodeRecipe]] = (
+            LruCache(max_entries=source_node_recipe_cache_max_entries)
+            if source_node_recipe_cache_max_entries > 0
+            else None
+        )
+        self._precomputed_multi_hop_join_candidates: Tuple[PrecomputedMultiHopJoinCandidates, ...] = ()
+        if precompute_multi_hop_join_candidates:
+            node_processor = PreJoinNodeProcessor(
+                semantic_model_lookup=self._semantic_model_lookup,
+                node_data_set_resolver=self._node_data_set_resolver,
+            )
+            # Only metric queries are covered since multi-hop group-by items are not supported in distinct values
+            # queries. The join type should match the default join type for metric queries in
+            # `_find_source_node_recipe`.
+            self._precomputed_multi_hop_join_candidates = (
+                node_processor.precompute_multi_hop_join_candidates(
+                    nodes=source_node_set.source_nodes_for_metric_queries, join_type=SqlJoinType.LEFT_OUTER
+                ),
+            )
+
+    @property
+    def source_node_recipe_cache(self) -> Optional[LruCache[SourceNodeRecipeCacheKey, SourceNodeRecipe]]:
+        """The cache for the recipes found for source nodes, or None if recipe caching is not enabled."""
+        return self._source_node_recipe_cache
 
     def build_plan(
         self,
@@ -234,7 +321,9 @@ class DataflowPlanBuilder:
         return self._optimize_plan(plan, optimizations)
 
     def _optimize_plan(self, plan: DataflowPlan, optimizations: FrozenSet[DataflowPlanOptimization]) -> DataflowPlan:
-        optimizer_factory = DataflowPlanOptimizerFactory(self._node_data_set_resolver)
+        optimizer_factory = DataflowPlanOptimizerFactory(
+            node_data_set_resolver=self._node_data_set_resolver, semantic_model_lookup=self._semantic_model_lookup
+        )
         for optimizer in optimizer_factory.get_optimizers(optimizations):
             logger.debug(LazyFormat(lambda: f"Applying {optimizer.__class__.__name__}"))
             try:
@@ -878,47 +967,51 @@ class DataflowPlanBuilder:
     def _sort_by_suitability(self, nodes: Sequence[DataflowPlanNode]) -> Sequence[DataflowPlanNode]:
         """Sort nodes by the number of linkable specs.
 
-        The lower the number of linkable specs means less aggregation required.
+        The lower the number of linkable specs means less aggregation required. If table statistics are available,
+        nodes are sorted by the estimated number of rows read first.
         """
 
-        def sort_function(node: DataflowPlanNode) -> int:
+        def sort_function(node: DataflowPlanNode) -> Tuple[float, int]:
             data_set = self._node_data_set_resolver.get_output_data_set(node)
-            return len(data_set.instance_set.spec_set.linkable_specs)
+            return self._estimate_scan_cost(node), len(data_set.instance_set.spec_set.linkable_specs)
 
         return sorted(nodes, key=sort_function)
 
-    def _select_source_nodes_with_measures(
-        self, measure_specs: Set[MeasureSpec], source_nodes: Sequence[DataflowPlanNode]
-    ) -> Sequence[DataflowPlanNode]:
-        nodes = []
-        measure_specs_set = set(measure_specs)
-        for source_node in source_nodes:
-            measure_specs_in_node = self._node_data_set_resolver.get_output_data_set(
-                source_node
-            ).instance_set.spec_set.measure_specs
-            if measure_specs_set.intersection(set(measure_specs_in_node)) == measure_specs_set:
-                nodes.append(source_node)
-        return nodes
-
-    def _select_source_nodes_with_linkable_specs(
-        self, linkable_specs: LinkableSpecSet, source_nodes: Sequence[DataflowPlanNode]
-    ) -> Sequence[DataflowPlanNode]:
-        """Find source nodes with requested linkable specs and no measures."""
-        # Use a dictionary to dedupe for consistent ordering.
-        selected_nodes: Dict[DataflowPlanNode, None] = {}
+    def _estimate_scan_cost(self, node: DataflowPlanNode) -> float:
+        """Estimate the cost of the node as the number of rows in the tables that it reads from.
 
+        Returns 0 if table statistics are not used, and infinity if the statistics for a table are not available.
+        """
+        if self._table_statistics_provider is None:
+            return 0.0
+
+        source_semantic_models = node.as_plan().source_semantic_models
+        if len(source_semantic_models) == 0:
+            return math.inf
+        scan_cost = 0.0
+        for semantic_model_reference in source_semantic_models:
+            statistics = self._table_statistics_provider.get_statistics(semantic_model_reference)
+            if statistics is None:
+                return math.inf
+            scan_cost += statistics.row_count
+        return scan_cost
+
+    def _estimate_recipe_cost(
+        self, node: DataflowPlanNode, evaluation: LinkableInstanceSatisfiabilityEvaluation
+    ) -> float:
+        """Estimate the cost of using the node with the joins in the evaluation, as the number of rows read."""
+        return self._estimate_scan_cost(node) + sum(
+            self._estimate_scan_cost(join_recipe.node_to_join) for join_recipe in evaluation.join_recipes
+        )
+
+    def _select_source_nodes_with_measures(self, measure_specs: Set[MeasureSpec]) -> Sequence[DataflowPlanNode]:
+        """Find source nodes for metric queries that contain all of the requested measures."""
+        return self._metric_query_source_node_index.nodes_with_all_measure_specs(measure_specs)
+
+    def _select_source_nodes_with_linkable_specs(self, linkable_specs: LinkableSpecSet) -> Sequence[DataflowPlanNode]:
+        """Find source nodes with requested linkable specs and no measures."""
         # TODO: Add support for no-metrics queries for custom grains without a join (i.e., select directly from time spine).
-        linkable_specs_set_with_base_granularities = set(linkable_specs.as_tuple)
-        for source_node in source_nodes:
-            output_spec_set = self._node_data_set_resolver.get_output_data_set(source_node).instance_set.spec_set
-            all_linkable_specs_in_node = set(output_spec_set.linkable_specs)
-            requested_linkable_specs_in_node = linkable_specs_set_with_base_granularities.intersection(
-                all_linkable_specs_in_node
-            )
-            if requested_linkable_specs_in_node:
-                selected_nodes[source_node] = None
-
-        return tuple(selected_nodes.keys())
+        return self._group_by_item_query_source_node_index.nodes_with_any_linkable_spec(linkable_specs.as_tuple)
 
     def _find_non_additive_dimension_in_linkable_specs(
         self,
@@ -979,6 +1072,43 @@ class DataflowPlanBuilder:
         linkable_spec_set: LinkableSpecSet,
         predicate_pushdown_state: PredicatePushdownState,
         measure_spec_properties: Optional[MeasureSpecProperties] = None,
+    ) -> Optional[SourceNodeRecipe]:
+        """Find the most suitable source nodes to satisfy the requested specs, as well as how to join them.
+
+        If recipe caching is enabled, a recipe found earlier for the same inputs is returned.
+        """
+        if self._source_node_recipe_cache is None:
+            return self._find_source_node_recipe_non_cached(
+                linkable_spec_set=linkable_spec_set,
+                predicate_pushdown_state=predicate_pushdown_state,
+                measure_spec_properties=measure_spec_properties,
+            )
+
+        cache_key = SourceNodeRecipeCacheKey.create(
+            linkable_spec_set=linkable_spec_set,
+            predicate_pushdown_state=predicate_pushdown_state,
+            measure_spec_properties=measure_spec_properties,
+        )
+        source_node_recipe = self._source_node_recipe_cache.get(cache_key)
+        if source_node_recipe is not None:
+            logger.debug(LazyFormat(lambda: "Using cached source node recipe", cache_key=cache_key))
+            return source_node_recipe
+
+        source_node_recipe = self._find_source_node_recipe_non_cached(
+            linkable_spec_set=linkable_spec_set,
+            predicate_pushdown_state=predicate_pushdown_state,
+            measure_spec_properties=measure_spec_properties,
+        )
+        # A missing recipe results in an error, so it's not cached.
+        if source_node_recipe is not None:
+            self._source_node_recipe_cache.put(cache_key, source_node_recipe)
+        return source_node_recipe
+
+    def _find_source_node_recipe_non_cached(
+        self,
+        linkable_spec_set: LinkableSpecSet,
+        predicate_pushdown_state: PredicatePushdownState,
+        measure_spec_properties: Optional[MeasureSpecProperties] = None,
     ) -> Optional[SourceNodeRecipe]:
         """Find the most suitable source nodes to satisfy the requested specs, as well as how to join them."""
         candidate_nodes_for_left_side_of_join: List[DataflowPlanNode] = []
@@ -993,7 +1123,6 @@ class DataflowPlanBuilder:
             candidate_nodes_for_right_side_of_join += self._source_node_set.source_nodes_for_metric_queries
             candidate_nodes_for_left_side_of_join += self._select_source_nodes_with_measures(
                 measure_specs=set(measure_spec_properties.measure_specs),
-                source_nodes=self._source_node_set.source_nodes_for_metric_queries,
             )
             default_join_type = SqlJoinType.LEFT_OUTER
         else:
@@ -1001,7 +1130,6 @@ class DataflowPlanBuilder:
             candidate_nodes_for_left_side_of_join += list(
                 self._select_source_nodes_with_linkable_specs(
                     linkable_specs=linkable_specs_to_satisfy,
-                    source_nodes=self._source_node_set.source_nodes_for_group_by_item_queries,
                 )
             )
             # If metric_time is requested without metrics, choose appropriate time spine node to select those values from.
@@ -1028,6 +1156,7 @@ class DataflowPlanBuilder:
         node_processor = PreJoinNodeProcessor(
             semantic_model_lookup=self._semantic_model_lookup,
             node_data_set_resolver=self._node_data_set_resolver,
+            precomputed_multi_hop_join_candidates=self._precomputed_multi_hop_join_candidates,
         )
 
         if predicate_pushdown_state.has_pushdown_potential and default_join_type is not SqlJoinType.FULL_OUTER:
@@ -1174,8 +1303,13 @@ class DataflowPlanBuilder:
 
         if len(node_to_evaluation) > 0:
             # Find evaluation with lowest number of joins.
+            # Between evaluations with the same number of joins, use the one that reads the fewest rows.
             node_with_lowest_cost_plan = min(
-                node_to_evaluation, key=lambda node: len(node_to_evaluation[node].join_recipes)
+                node_to_evaluation,
+                key=lambda node: (
+                    len(node_to_evaluation[node].join_recipes),
+                    self._estimate_recipe_cost(node, node_to_evaluation[node]),
+                ),
             )
             evaluation = node_to_evaluation[node_with_lowest_cost_plan]
 
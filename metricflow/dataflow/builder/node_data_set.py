@@ -1,7 +1,10 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Dict, Optional, Sequence
+import threading
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, Mapping, Optional, Sequence
 
+from metricflow_semantics.collection_helpers.lru_cache import CacheStats, LruCache
 from metricflow_semantics.dag.id_prefix import StaticIdPrefix
 from metricflow_semantics.dag.sequential_id import SequentialIdGenerator
 from metricflow_semantics.mf_logging.runtime import log_block_runtime
@@ -18,6 +21,32 @@ if TYPE_CHECKING:
     from metricflow_semantics.model.semantic_manifest_lookup import SemanticManifestLookup
 
 
+@dataclass(frozen=True)
+class NodeOutputDataSetCacheStats:
+    """A snapshot of the counters for the caches in `DataflowPlanNodeOutputDataSetResolver`.
+
+    Attributes:
+        persistent_entry_count: Number of output data sets cached through `cache_output_data_sets`, e.g. for source
+        nodes. These are never evicted.
+        persistent_hit_count: Number of lookups that found an output data set in the persistent tier.
+        query_node_stats: The counters for the bounded tier that holds the output data sets of other nodes, e.g. the
+        nodes created while planning a query. Lookups that miss the persistent tier are counted here.
+    """
+
+    persistent_entry_count: int
+    persistent_hit_count: int
+    query_node_stats: CacheStats
+
+    @property
+    def hit_rate(self) -> float:
+        """The fraction of lookups that found an output data set in either tier, or 0.0 if there have been none."""
+        hit_count = self.persistent_hit_count + self.query_node_stats.hit_count
+        lookup_count = hit_count + self.query_node_stats.miss_count
+        if lookup_count == 0:
+            return 0.0
+        return hit_count / lookup_count
+
+
 class DataflowPlanNodeOutputDataSetResolver(DataflowToSqlQueryPlanConverter):
     """Given a node in a dataflow plan, figure out what is the data set output by that node.
 
@@ -59,42 +88,91 @@ class DataflowPlanNodeOutputDataSetResolver(DataflowToSqlQueryPlanConverter):
     The logic to figure the dataset output by a node is the same as DataflowToSqlQueryPlanConverter because the same
     information is needed for generating SQL queries, so inheriting from that. We may want to look later at making
     another class to have better separation of concerns.
+
+    The output data sets are cached in two tiers. The ones for nodes passed to `cache_output_data_sets` (e.g. source
+    nodes) are kept for the lifetime of this object, while the ones for other nodes (e.g. the nodes for multi-hop joins
+    that are created for each query) are kept in a bounded LRU cache so that memory use doesn't grow with the number of
+    queries.
     """
 
-    def __init__(  # noqa: D107
+    # The default limit for the number of output data sets cached for nodes created during queries.
+    DEFAULT_QUERY_NODE_CACHE_MAX_ENTRIES = 10000
+
+    def __init__(
         self,
         column_association_resolver: ColumnAssociationResolver,
         semantic_manifest_lookup: SemanticManifestLookup,
         _node_to_output_data_set: Optional[Dict[DataflowPlanNode, SqlDataSet]] = None,
+        query_node_cache_max_entries: int = DEFAULT_QUERY_NODE_CACHE_MAX_ENTRIES,
     ) -> None:
+        """Initializer.
+
+        Args:
+            column_association_resolver: Resolves the column names for specs.
+            semantic_manifest_lookup: Lookup for the semantic manifest.
+            _node_to_output_data_set: The output data sets to keep in the persistent tier of the cache.
+            query_node_cache_max_entries: The maximum number of output data sets to cache for nodes that were not
+            passed to `cache_output_data_sets`.
+        """
         self._node_to_output_data_set: Dict[DataflowPlanNode, SqlDataSet] = _node_to_output_data_set or {}
+        self._persistent_hit_count = 0
+        self._persistent_hit_count_lock = threading.Lock()
+        self._query_node_cache: LruCache[DataflowPlanNode, SqlDataSet] = LruCache(
+            max_entries=query_node_cache_max_entries
+        )
         super().__init__(
             column_association_resolver=column_association_resolver,
             semantic_manifest_lookup=semantic_manifest_lookup,
         )
 
     def get_output_data_set(self, node: DataflowPlanNode) -> SqlDataSet:
-        """Cached since this will be called repeatedly during the computation of multiple metrics.
-
-        # TODO: The cache needs to be pruned, but has not yet been an issue.
-        """
-        if node not in self._node_to_output_data_set:
-            self._node_to_output_data_set[node] = node.accept(self)
-
-        return self._node_to_output_data_set[node]
+        """Cached since this will be called repeatedly during the computation of multiple metrics."""
+        output_data_set = self._node_to_output_data_set.get(node)
+        if output_data_set is not None:
+            with self._persistent_hit_count_lock:
+                self._persistent_hit_count += 1
+            return output_data_set
+
+        output_data_set = self._query_node_cache.get(node)
+        if output_data_set is None:
+            output_data_set = node.accept(self)
+            self._query_node_cache.put(node, output_data_set)
+        return output_data_set
+
+    @property
+    def node_to_output_data_set(self) -> Mapping[DataflowPlanNode, SqlDataSet]:
+        """The output data sets in the persistent tier of the cache, keyed by the node."""
+        return self._node_to_output_data_set
+
+    @property
+    def cache_stats(self) -> NodeOutputDataSetCacheStats:  # noqa: D102
+        with self._persistent_hit_count_lock:
+            persistent_hit_count = self._persistent_hit_count
+        return NodeOutputDataSetCacheStats(
+            persistent_entry_count=len(self._node_to_output_data_set),
+            persistent_hit_count=persistent_hit_count,
+            query_node_stats=self._query_node_cache.stats,
+        )
 
     def cache_output_data_sets(self, nodes: Sequence[DataflowPlanNode]) -> None:
-        """Cache the output of the given nodes for consistent retrieval with `get_output_data_set`."""
+        """Cache the output of the given nodes in the persistent tier for consistent retrieval.
+
+        This should only be called during setup, as the entries are never evicted and concurrent lookups are not
+        synchronized with this.
+        """
         with log_block_runtime(f"cache_output_data_sets for {len(nodes)} nodes"):
             for node in nodes:
-                self.get_output_data_set(node)
+                if node not in self._node_to_output_data_set:
+                    self._node_to_output_data_set[node] = node.accept(self)
+                    self._query_node_cache.remove(node)
 
     def copy(self) -> DataflowPlanNodeOutputDataSetResolver:
-        """Return a copy of this with the same nodes cached."""
+        """Return a copy of this with the same nodes in the persistent tier of the cache."""
         return DataflowPlanNodeOutputDataSetResolver(
             column_association_resolver=self.column_association_resolver,
             semantic_manifest_lookup=self._semantic_manifest_lookup,
             _node_to_output_data_set=dict(self._node_to_output_data_set),
+            query_node_cache_max_entries=self._query_node_cache.max_entries,
         )
 
     @override
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Dict, Iterable, List, Sequence, Set, Tuple
+
+from metricflow_semantics.specs.instance_spec import LinkableInstanceSpec
+from metricflow_semantics.specs.measure_spec import MeasureSpec
+
+from metricflow.dataflow.builder.node_data_set import DataflowPlanNodeOutputDataSetResolver
+from metricflow.dataflow.dataflow_plan import DataflowPlanNode
+
+
+class SourceNodeSpecIndex:
+    """An inverted index from the measure and linkable specs in the output of source nodes to those nodes.
+
+    This is built once for a set of source nodes so that finding the source nodes with the requested specs does not
+    need to resolve the output data set of every source node for each query. Nodes are returned in the same order as
+    the sequence the index was created from.
+    """
+
+    def __init__(
+        self,
+        source_nodes: Tuple[DataflowPlanNode, ...],
+        measure_spec_to_node_indexes: Dict[MeasureSpec, Tuple[int, ...]],
+        linkable_spec_to_node_indexes: Dict[LinkableInstanceSpec, Tuple[int, ...]],
+    ) -> None:
+        """Initializer. Use `create` to build the index from the source nodes.
+
+        Args:
+            source_nodes: The nodes in the index.
+            measure_spec_to_node_indexes: Maps a measure spec to the positions in `source_nodes` of the nodes that
+            output it.
+            linkable_spec_to_node_indexes: Maps a linkable spec to the positions in `source_nodes` of the nodes that
+            output it.
+        """
+        self._source_nodes = source_nodes
+        self._measure_spec_to_node_indexes = measure_spec_to_node_indexes
+        self._linkable_spec_to_node_indexes = linkable_spec_to_node_indexes
+
+    @staticmethod
+    def create(
+        source_nodes: Sequence[DataflowPlanNode], node_data_set_resolver: DataflowPlanNodeOutputDataSetResolver
+    ) -> SourceNodeSpecIndex:
+        """Build the index by resolving the output data set of each source node."""
+        measure_spec_to_node_indexes: Dict[MeasureSpec, List[int]] = defaultdict(list)
+        linkable_spec_to_node_indexes: Dict[LinkableInstanceSpec, List[int]] = defaultdict(list)
+        for node_index, source_node in enumerate(source_nodes):
+            spec_set = node_data_set_resolver.get_output_data_set(source_node).instance_set.spec_set
+            # A spec may be in the output of a node more than once, so the specs are deduped.
+            for measure_spec in dict.fromkeys(spec_set.measure_specs):
+                measure_spec_to_node_indexes[measure_spec].append(node_index)
+            for linkable_spec in dict.fromkeys(spec_set.linkable_specs):
+                linkable_spec_to_node_indexes[linkable_spec].append(node_index)
+
+        return SourceNodeSpecIndex(
+            source_nodes=tuple(source_nodes),
+            measure_spec_to_node_indexes={
+                spec: tuple(node_indexes) for spec, node_indexes in measure_spec_to_node_indexes.items()
+            },
+            linkable_spec_to_node_indexes={
+                spec: tuple(node_indexes) for spec, node_indexes in linkable_spec_to_node_indexes.items()
+            },
+        )
+
+    @property
+    def source_nodes(self) -> Tuple[DataflowPlanNode, ...]:  # noqa: D102
+        return self._source_nodes
+
+    def nodes_with_all_measure_specs(self, measure_specs: Iterable[MeasureSpec]) -> Sequence[DataflowPlanNode]:
+        """Return the nodes that output all of the given measure specs."""
+        node_indexes: Set[int] = set(range(len(self._source_nodes)))
+        for measure_spec in set(measure_specs):
+            node_indexes.intersection_update(self._measure_spec_to_node_indexes.get(measure_spec, ()))
+            if len(node_indexes) == 0:
+                break
+        return self._nodes_at(node_indexes)
+
+    def nodes_with_any_linkable_spec(
+        self, linkable_specs: Iterable[LinkableInstanceSpec]
+    ) -> Sequence[DataflowPlanNode]:
+        """Return the nodes that output at least one of the given linkable specs."""
+        node_indexes: Set[int] = set()
+        for linkable_spec in set(linkable_specs):
+            node_indexes.update(self._linkable_spec_to_node_indexes.get(linkable_spec, ()))
+        return self._nodes_at(node_indexes)
+
+    def _nodes_at(self, node_indexes: Set[int]) -> Sequence[DataflowPlanNode]:
+        return tuple(self._source_nodes[node_index] for node_index in sorted(node_indexes))
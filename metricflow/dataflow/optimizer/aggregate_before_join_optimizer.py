@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import logging
+from typing import Dict, List, Optional, Tuple, Type
+
+from metricflow_semantics.aggregation_properties import AggregationState, is_expansive
+from metricflow_semantics.dag.id_prefix import StaticIdPrefix
+from metricflow_semantics.dag.mf_dag import DagId, NodeId
+from metricflow_semantics.mf_logging.lazy_formattable import LazyFormat
+from metricflow_semantics.model.semantics.semantic_model_lookup import SemanticModelLookup
+from metricflow_semantics.specs.measure_spec import MetricInputMeasureSpec
+
+from metricflow.dataflow.builder.node_data_set import DataflowPlanNodeOutputDataSetResolver
+from metricflow.dataflow.dataflow_plan import DataflowPlan, DataflowPlanNode
+from metricflow.dataflow.nodes.aggregate_measures import AggregateMeasuresNode
+from metricflow.dataflow.nodes.constrain_time import ConstrainTimeRangeNode
+from metricflow.dataflow.nodes.filter_elements import FilterElementsNode
+from metricflow.dataflow.nodes.join_to_base import JoinOnEntitiesNode
+from metricflow.dataflow.nodes.where_filter import WhereConstraintNode
+from metricflow.dataflow.optimizer.dataflow_plan_optimizer import DataflowPlanOptimizer
+
+logger = logging.getLogger(__name__)
+
+
+class AggregateBeforeJoinOptimizer(DataflowPlanOptimizer):
+    """Aggregates measures before they are joined to other sources, to reduce the number of rows in the join.
+
+    To get measures with dimensions from other semantic models, the plan joins the measure source at the fact-table
+    grain, and aggregates the measures after the join:
+
+        <AggregateMeasuresNode>
+            <FilterElementsNode>
+                <JoinOnEntitiesNode>
+                    <FilterElementsNode include_specs="[bookings, listing, metric_time__day]">
+                        ...
+                    </FilterElementsNode>
+                    <FilterElementsNode include_specs="[listing, country_latest]">
+                        ...
+                    </FilterElementsNode>
+                </JoinOnEntitiesNode>
+            </FilterElementsNode>
+        </AggregateMeasuresNode>
+
+    If the measures can be re-aggregated without changing the result (i.e. the aggregation is expansive like SUM or
+    MAX, see `is_expansive`), the measures can be aggregated to the grain of the other columns on the left side of the
+    join first:
+
+        <AggregateMeasuresNode>
+            <FilterElementsNode>
+                <JoinOnEntitiesNode>
+                    <AggregateMeasuresNode>
+                        <FilterElementsNode include_specs="[bookings, listing, metric_time__day]">
+                            ...
+                        </FilterElementsNode>
+                    </AggregateMeasuresNode>
+                    <FilterElementsNode include_specs="[listing, country_latest]">
+                        ...
+                    </FilterElementsNode>
+                </JoinOnEntitiesNode>
+            </FilterElementsNode>
+        </AggregateMeasuresNode>
+
+    The join changes the aggregation state of the measures to partial, so the outer `AggregateMeasuresNode` aggregates
+    them again. Since every row on the left side of the join becomes a group of rows with the same values in the
+    non-measure columns, filters after the join produce the same result.
+
+    This is only done if the left side of the join is a `FilterElementsNode` (so that only the columns that are needed
+    are used to group the measures), and if all measures on that side are expansive and don't have a non-additive
+    dimension.
+    """
+
+    # Nodes between the AggregateMeasuresNode and the JoinOnEntitiesNode that don't change the grain of the rows.
+    _ROW_FILTER_NODE_TYPES: Tuple[Type[DataflowPlanNode], ...] = (
+        ConstrainTimeRangeNode,
+        FilterElementsNode,
+        WhereConstraintNode,
+    )
+
+    def __init__(  # noqa: D107
+        self,
+        node_data_set_resolver: DataflowPlanNodeOutputDataSetResolver,
+        semantic_model_lookup: SemanticModelLookup,
+    ) -> None:
+        self._node_data_set_resolver = node_data_set_resolver
+        self._semantic_model_lookup = semantic_model_lookup
+        # Maps the ID of a node in the input plan to the node that should be used in the output plan.
+        self._node_id_to_replacement: Dict[NodeId, DataflowPlanNode] = {}
+        self._rewritten_join_count = 0
+
+    def optimize(self, dataflow_plan: DataflowPlan) -> DataflowPlan:  # noqa: D102
+        self._node_id_to_replacement = {}
+        self._rewritten_join_count = 0
+        optimized_sink_node = self._optimize_node(dataflow_plan.sink_node)
+
+        logger.debug(
+            LazyFormat(
+                lambda: f"Aggregated measures before {self._rewritten_join_count} joins in:\n\n"
+                f"{dataflow_plan.sink_node.structure_text()}\n\n"
+                f"to get:\n\n"
+                f"{optimized_sink_node.structure_text()}",
+            )
+        )
+        return DataflowPlan(
+            plan_id=DagId.from_id_prefix(StaticIdPrefix.OPTIMIZED_DATAFLOW_PLAN_PREFIX),
+            sink_nodes=[optimized_sink_node],
+        )
+
+    def _optimize_node(self, node: DataflowPlanNode) -> DataflowPlanNode:
+        """Return the node to use in the output plan for the given node in the input plan."""
+        replacement = self._node_id_to_replacement.get(node.node_id)
+        if replacement is not None:
+            return replacement
+
+        new_parent_nodes = tuple(self._optimize_node(parent_node) for parent_node in node.parent_nodes)
+        if all(
+            new_parent_node is parent_node for new_parent_node, parent_node in zip(new_parent_nodes, node.parent_nodes)
+        ):
+            replacement = node
+        else:
+            replacement = node.with_new_parents(new_parent_nodes)
+
+        if isinstance(replacement, AggregateMeasuresNode):
+            replacement = self._aggregate_before_join(replacement)
+
+        self._node_id_to_replacement[node.node_id] = replacement
+        return replacement
+
+    def _aggregate_before_join(self, node: AggregateMeasuresNode) -> DataflowPlanNode:
+        """If possible, return an equivalent node that aggregates the measures before the join in the parent branch."""
+        # Find the join, and the nodes between the join and the given node.
+        nodes_after_join: List[DataflowPlanNode] = []
+        current_node = node.parent_node
+        while isinstance(current_node, AggregateBeforeJoinOptimizer._ROW_FILTER_NODE_TYPES):
+            nodes_after_join.append(current_node)
+            current_node = current_node.parent_nodes[0]
+        if not isinstance(current_node, JoinOnEntitiesNode):
+            return node
+        join_node = current_node
+
+        pre_aggregation_specs = self._pre_aggregation_specs(join_node.left_node)
+        if pre_aggregation_specs is None:
+            return node
+
+        new_node: DataflowPlanNode = join_node.with_new_parents(
+            (
+                AggregateMeasuresNode.create(
+                    parent_node=join_node.left_node, metric_input_measure_specs=pre_aggregation_specs
+                ),
+            )
+            + tuple(join_target.join_node for join_target in join_node.join_targets)
+        )
+        for node_after_join in reversed(nodes_after_join):
+            new_node = node_after_join.with_new_parents((new_node,))
+
+        self._rewritten_join_count += 1
+        return node.with_new_parents((new_node,))
+
+    def _pre_aggregation_specs(self, left_node: DataflowPlanNode) -> Optional[Tuple[MetricInputMeasureSpec, ...]]:
+        """Return the specs to aggregate the measures on the left side of a join, or None if that's not possible."""
+        if not isinstance(left_node, FilterElementsNode):
+            return None
+
+        measure_instances = self._node_data_set_resolver.get_output_data_set(left_node).instance_set.measure_instances
+        if len(measure_instances) == 0:
+            return None
+
+        for measure_instance in measure_instances:
+            if measure_instance.aggregation_state is not AggregationState.NON_AGGREGATED:
+                return None
+            if measure_instance.spec.non_additive_dimension_spec is not None:
+                return None
+            measure = self._semantic_model_lookup.get_measure(measure_instance.spec.reference)
+            if not is_expansive(measure.agg):
+                return None
+
+        # The aliases and the fill-null values are applied by the aggregation after the join.
+        return tuple(
+            MetricInputMeasureSpec(measure_spec=measure_instance.spec) for measure_instance in measure_instances
+        )
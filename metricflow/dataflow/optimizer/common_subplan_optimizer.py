@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import logging
+from typing import Dict, List, Tuple, Type
+
+from metricflow_semantics.dag.id_prefix import StaticIdPrefix
+from metricflow_semantics.dag.mf_dag import DagId, NodeId
+from metricflow_semantics.mf_logging.lazy_formattable import LazyFormat
+
+from metricflow.dataflow.dataflow_plan import DataflowPlan, DataflowPlanNode
+from metricflow.dataflow.nodes.add_generated_uuid import AddGeneratedUuidColumnNode
+from metricflow.dataflow.optimizer.dataflow_plan_optimizer import DataflowPlanOptimizer
+
+logger = logging.getLogger(__name__)
+
+
+class CommonSubplanOptimizer(DataflowPlanOptimizer):
+    """Replaces nodes that compute the same thing as another node in the dataflow plan with that node.
+
+    Derived metrics can produce plans with multiple branches that are the same, but have different node IDs. e.g. a
+    derived metric that uses the same input metric twice (with different aliases) would have a plan like:
+
+        <ComputeMetricsNode metrics="[derived_metric]">
+            <CombineAggregatedOutputsNode>
+                <ComputeMetricsNode metrics="[bookings]">
+                    <AggregateMeasuresNode node_id="am_0">
+                        <ReadSqlSourceNode node_id="rss_0">
+                    </AggregateMeasuresNode>
+                </ComputeMetricsNode>
+                <ComputeMetricsNode metrics="[bookings]">
+                    <AggregateMeasuresNode node_id="am_1">
+                        <ReadSqlSourceNode node_id="rss_1">
+                    </AggregateMeasuresNode>
+                </ComputeMetricsNode>
+                ...
+
+    This traverses the plan from the source nodes and replaces a node with one that was already seen if it's of the
+    same type, has the same parents, and is functionally identical (`DataflowPlanNode.functionally_identical`). Since
+    the parents are replaced first, the branches above end up sharing the same `AggregateMeasuresNode`, and the SQL for
+    it can be rendered once.
+
+    Nodes that generate a different output each time they're evaluated (e.g. `AddGeneratedUuidColumnNode`) are not
+    replaced.
+    """
+
+    # Node types that should not be shared.
+    _NON_DETERMINISTIC_NODE_TYPES: Tuple[Type[DataflowPlanNode], ...] = (AddGeneratedUuidColumnNode,)
+
+    def __init__(self) -> None:  # noqa: D107
+        # Maps the ID of a node in the input plan to the node that should be used in the output plan.
+        self._node_id_to_replacement: Dict[NodeId, DataflowPlanNode] = {}
+        # Maps the node type and parent node IDs to the nodes in the output plan with those properties.
+        self._key_to_output_nodes: Dict[Tuple[Type[DataflowPlanNode], Tuple[NodeId, ...]], List[DataflowPlanNode]] = {}
+        self._replaced_node_count = 0
+
+    def optimize(self, dataflow_plan: DataflowPlan) -> DataflowPlan:  # noqa: D102
+        self._node_id_to_replacement = {}
+        self._key_to_output_nodes = {}
+        self._replaced_node_count = 0
+        optimized_sink_node = self._replace_common_nodes(dataflow_plan.sink_node)
+
+        logger.debug(
+            LazyFormat(
+                lambda: f"Replaced {self._replaced_node_count} nodes that are the same as other nodes in:\n\n"
+                f"{dataflow_plan.sink_node.structure_text()}\n\n"
+                f"to get:\n\n"
+                f"{optimized_sink_node.structure_text()}",
+            )
+        )
+        return DataflowPlan(
+            plan_id=DagId.from_id_prefix(StaticIdPrefix.OPTIMIZED_DATAFLOW_PLAN_PREFIX),
+            sink_nodes=[optimized_sink_node],
+        )
+
+    def _replace_common_nodes(self, node: DataflowPlanNode) -> DataflowPlanNode:
+        """Return the node to use in the output plan for the given node in the input plan."""
+        replacement = self._node_id_to_replacement.get(node.node_id)
+        if replacement is not None:
+            return replacement
+
+        new_parent_nodes = tuple(self._replace_common_nodes(parent_node) for parent_node in node.parent_nodes)
+        if all(
+            new_parent_node is parent_node for new_parent_node, parent_node in zip(new_parent_nodes, node.parent_nodes)
+        ):
+            replacement = node
+        else:
+            replacement = node.with_new_parents(new_parent_nodes)
+
+        if not isinstance(node, CommonSubplanOptimizer._NON_DETERMINISTIC_NODE_TYPES):
+            key = (type(replacement), tuple(parent_node.node_id for parent_node in new_parent_nodes))
+            output_nodes = self._key_to_output_nodes.setdefault(key, [])
+            existing_node = next(
+                (output_node for output_node in output_nodes if output_node.functionally_identical(replacement)), None
+            )
+            if existing_node is not None:
+                replacement = existing_node
+                self._replaced_node_count += 1
+            else:
+                output_nodes.append(replacement)
+
+        self._node_id_to_replacement[node.node_id] = replacement
+        return replacement
@@ -4,9 +4,13 @@ from enum import Enum
 from typing import FrozenSet, List, Sequence
 
 from dbt_semantic_interfaces.enum_extension import assert_values_exhausted
+from metricflow_semantics.model.semantics.semantic_model_lookup import SemanticModelLookup
 
 from metricflow.dataflow.builder.node_data_set import DataflowPlanNodeOutputDataSetResolver
+from metricflow.dataflow.optimizer.aggregate_before_join_optimizer import AggregateBeforeJoinOptimizer
+from metricflow.dataflow.optimizer.common_subplan_optimizer import CommonSubplanOptimizer
 from metricflow.dataflow.optimizer.dataflow_plan_optimizer import DataflowPlanOptimizer
+from metricflow.dataflow.optimizer.join_elimination_optimizer import JoinEliminationOptimizer
 from metricflow.dataflow.optimizer.predicate_pushdown_optimizer import PredicatePushdownOptimizer
 from metricflow.dataflow.optimizer.source_scan.source_scan_optimizer import SourceScanOptimizer
 
@@ -18,24 +22,40 @@ class DataflowPlanOptimization(Enum):
     making for maximally parsimonious queries prior to application of predicate pushdown. Note this is safe only
     because the SourceScanOptimizer combines from the CombineAggregatedOutputNode, and will only combine branches
     from there to source if they are functionally identical (i.e., they have all of the same WhereConstraintNode
-    configurations).
+    configurations). Measures are aggregated before joins after predicate pushdown, so that filters can still be
+    pushed past the joins, and after unused joins are removed, so that they are only aggregated early for the joins
+    that remain. The common subplan optimizer is applied last as the other optimizers create separate copies of nodes
+    that are shared between branches.
     """
 
     SOURCE_SCAN = 0
     PREDICATE_PUSHDOWN = 1
+    JOIN_ELIMINATION = 2
+    AGGREGATE_BEFORE_JOIN = 3
+    COMMON_SUBPLAN = 4
 
     @staticmethod
     def all_optimizations() -> FrozenSet[DataflowPlanOptimization]:
         """Convenience method for getting a set of all available optimizations."""
-        return frozenset((DataflowPlanOptimization.SOURCE_SCAN, DataflowPlanOptimization.PREDICATE_PUSHDOWN))
+        return frozenset(
+            (
+                DataflowPlanOptimization.SOURCE_SCAN,
+                DataflowPlanOptimization.PREDICATE_PUSHDOWN,
+                DataflowPlanOptimization.JOIN_ELIMINATION,
+                DataflowPlanOptimization.AGGREGATE_BEFORE_JOIN,
+                DataflowPlanOptimization.COMMON_SUBPLAN,
+            )
+        )
 
     @staticmethod
     def enabled_optimizations() -> FrozenSet[DataflowPlanOptimization]:
         """Set of DataflowPlanOptimization that are currently enabled.
 
-        Predicate pushdown optimizer is currently disabled.
+        Predicate pushdown and aggregate-before-join optimizers are currently disabled. The common subplan optimizer
+        is only enabled by `MetricFlowEngine` when CTE rendering is configured, as shared nodes are otherwise rendered
+        once per use.
         """
-        return frozenset((DataflowPlanOptimization.SOURCE_SCAN,))
+        return frozenset((DataflowPlanOptimization.SOURCE_SCAN, DataflowPlanOptimization.JOIN_ELIMINATION))
 
 
 class DataflowPlanOptimizerFactory:
@@ -45,12 +65,17 @@ class DataflowPlanOptimizerFactory:
     processing between the DataflowPlanBuilder and the optimizer instances requiring that functionality.
     """
 
-    def __init__(self, node_data_set_resolver: DataflowPlanNodeOutputDataSetResolver) -> None:
+    def __init__(
+        self,
+        node_data_set_resolver: DataflowPlanNodeOutputDataSetResolver,
+        semantic_model_lookup: SemanticModelLookup,
+    ) -> None:
         """Initializer.
 
         This collects all of the initialization requirements for the optimizers it manages.
         """
         self._node_data_set_resolver = node_data_set_resolver
+        self._semantic_model_lookup = semantic_model_lookup
 
     def get_optimizers(self, optimizations: FrozenSet[DataflowPlanOptimization]) -> Sequence[DataflowPlanOptimizer]:
         """Initializes and returns a sequence of optimizers matching the input optimization requests."""
@@ -60,6 +85,22 @@ class DataflowPlanOptimizerFactory:
                 optimizers.append(SourceScanOptimizer())
             elif optimization is DataflowPlanOptimization.PREDICATE_PUSHDOWN:
                 optimizers.append(PredicatePushdownOptimizer(self._node_data_set_resolver))
+            elif optimization is DataflowPlanOptimization.JOIN_ELIMINATION:
+                optimizers.append(
+                    JoinEliminationOptimizer(
+                        node_data_set_resolver=self._node_data_set_resolver,
+                        semantic_model_lookup=self._semantic_model_lookup,
+                    )
+                )
+            elif optimization is DataflowPlanOptimization.AGGREGATE_BEFORE_JOIN:
+                optimizers.append(
+                    AggregateBeforeJoinOptimizer(
+                        node_data_set_resolver=self._node_data_set_resolver,
+                        semantic_model_lookup=self._semantic_model_lookup,
+                    )
+                )
+            elif optimization is DataflowPlanOptimization.COMMON_SUBPLAN:
+                optimizers.append(CommonSubplanOptimizer())
             else:
                 assert_values_exhausted(optimization)
 
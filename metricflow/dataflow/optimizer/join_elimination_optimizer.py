@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import logging
+from typing import Dict, List, Tuple, Type
+
+from dbt_semantic_interfaces.protocols.entity import EntityType
+from metricflow_semantics.dag.id_prefix import StaticIdPrefix
+from metricflow_semantics.dag.mf_dag import DagId, NodeId
+from metricflow_semantics.mf_logging.lazy_formattable import LazyFormat
+from metricflow_semantics.model.semantics.semantic_model_lookup import SemanticModelLookup
+from metricflow_semantics.specs.entity_spec import LinklessEntitySpec
+from metricflow_semantics.sql.sql_join_type import SqlJoinType
+
+from metricflow.dataflow.builder.node_data_set import DataflowPlanNodeOutputDataSetResolver
+from metricflow.dataflow.dataflow_plan import DataflowPlan, DataflowPlanNode
+from metricflow.dataflow.nodes.constrain_time import ConstrainTimeRangeNode
+from metricflow.dataflow.nodes.filter_elements import FilterElementsNode
+from metricflow.dataflow.nodes.join_to_base import JoinDescription, JoinOnEntitiesNode
+from metricflow.dataflow.nodes.metric_time_transform import MetricTimeDimensionTransformNode
+from metricflow.dataflow.nodes.read_sql_source import ReadSqlSourceNode
+from metricflow.dataflow.nodes.where_filter import WhereConstraintNode
+from metricflow.dataflow.optimizer.dataflow_plan_optimizer import DataflowPlanOptimizer
+
+logger = logging.getLogger(__name__)
+
+
+class JoinEliminationOptimizer(DataflowPlanOptimizer):
+    """Removes joins to nodes whose columns are not used.
+
+    The elements from a join are selected by the `FilterElementsNode` that follows it. If none of the selected elements
+    come from one of the joined nodes, e.g. in:
+
+        <FilterElementsNode include_specs="[bookings, listing, metric_time__day]">
+            <JoinOnEntitiesNode>
+                <FilterElementsNode include_specs="[bookings, listing, metric_time__day]">
+                    ...
+                </FilterElementsNode>
+                <FilterElementsNode include_specs="[listing, country_latest]">
+                    ...
+                </FilterElementsNode>
+            </JoinOnEntitiesNode>
+        </FilterElementsNode>
+
+    the join to that node can be removed as long as it can't change the rows from the left side of the join. This is
+    the case for a LEFT OUTER join if there is at most one row in the joined node for each value of the join entity,
+    i.e. the entity is a primary or unique entity in the semantic model that the joined node reads from. A join that
+    only reads the join entity is also removed since the left side has the same entity.
+    """
+
+    # Nodes that don't add rows, so an entity that is unique in the parent is unique in the output.
+    _ROW_PRESERVING_NODE_TYPES: Tuple[Type[DataflowPlanNode], ...] = (
+        ConstrainTimeRangeNode,
+        FilterElementsNode,
+        MetricTimeDimensionTransformNode,
+        WhereConstraintNode,
+    )
+
+    # The types of entities that have at most one row for each value in a semantic model.
+    _UNIQUE_ENTITY_TYPES = (EntityType.PRIMARY, EntityType.UNIQUE)
+
+    def __init__(  # noqa: D107
+        self,
+        node_data_set_resolver: DataflowPlanNodeOutputDataSetResolver,
+        semantic_model_lookup: SemanticModelLookup,
+    ) -> None:
+        self._node_data_set_resolver = node_data_set_resolver
+        self._semantic_model_lookup = semantic_model_lookup
+        # Maps the ID of a node in the input plan to the node that should be used in the output plan.
+        self._node_id_to_replacement: Dict[NodeId, DataflowPlanNode] = {}
+        self._removed_join_count = 0
+
+    def optimize(self, dataflow_plan: DataflowPlan) -> DataflowPlan:  # noqa: D102
+        self._node_id_to_replacement = {}
+        self._removed_join_count = 0
+        optimized_sink_node = self._optimize_node(dataflow_plan.sink_node)
+
+        logger.debug(
+            LazyFormat(
+                lambda: f"Removed {self._removed_join_count} joins in:\n\n"
+                f"{dataflow_plan.sink_node.structure_text()}\n\n"
+                f"to get:\n\n"
+                f"{optimized_sink_node.structure_text()}",
+            )
+        )
+        return DataflowPlan(
+            plan_id=DagId.from_id_prefix(StaticIdPrefix.OPTIMIZED_DATAFLOW_PLAN_PREFIX),
+            sink_nodes=[optimized_sink_node],
+        )
+
+    def _optimize_node(self, node: DataflowPlanNode) -> DataflowPlanNode:
+        """Return the node to use in the output plan for the given node in the input plan."""
+        replacement = self._node_id_to_replacement.get(node.node_id)
+        if replacement is not None:
+            return replacement
+
+        new_parent_nodes = tuple(self._optimize_node(parent_node) for parent_node in node.parent_nodes)
+        if all(
+            new_parent_node is parent_node for new_parent_node, parent_node in zip(new_parent_nodes, node.parent_nodes)
+        ):
+            replacement = node
+        else:
+            replacement = node.with_new_parents(new_parent_nodes)
+
+        if isinstance(replacement, FilterElementsNode) and isinstance(replacement.parent_node, JoinOnEntitiesNode):
+            replacement = self._remove_unused_joins(replacement, replacement.parent_node)
+
+        self._node_id_to_replacement[node.node_id] = replacement
+        return replacement
+
+    def _remove_unused_joins(self, node: FilterElementsNode, join_node: JoinOnEntitiesNode) -> FilterElementsNode:
+        """Return an equivalent node without the joins in the parent that don't provide any of the included elements."""
+        included_specs = set(node.include_specs.all_specs)
+        remaining_join_targets: List[JoinDescription] = list(join_node.join_targets)
+        for join_target in join_node.join_targets:
+            if not self._join_preserves_left_rows(join_target):
+                continue
+
+            join_targets_without_target = [
+                remaining_join_target
+                for remaining_join_target in remaining_join_targets
+                if remaining_join_target is not join_target
+            ]
+            node_without_target = JoinEliminationOptimizer._create_join_node(
+                join_node.left_node, join_targets_without_target
+            )
+            output_specs = self._node_data_set_resolver.get_output_data_set(node_without_target).instance_set.spec_set
+            if included_specs.issubset(output_specs.all_specs):
+                remaining_join_targets = join_targets_without_target
+
+        if len(remaining_join_targets) == len(join_node.join_targets):
+            return node
+
+        self._removed_join_count += len(join_node.join_targets) - len(remaining_join_targets)
+        return FilterElementsNode.create(
+            parent_node=JoinEliminationOptimizer._create_join_node(join_node.left_node, remaining_join_targets),
+            include_specs=node.include_specs,
+            replace_description=node.replace_description,
+            distinct=node.distinct,
+        )
+
+    @staticmethod
+    def _create_join_node(left_node: DataflowPlanNode, join_targets: List[JoinDescription]) -> DataflowPlanNode:
+        if len(join_targets) == 0:
+            return left_node
+        return JoinOnEntitiesNode.create(left_node=left_node, join_targets=join_targets)
+
+    def _join_preserves_left_rows(self, join_description: JoinDescription) -> bool:
+        """Returns true if the join keeps every row on the left side, and doesn't create additional rows."""
+        return join_description.join_type is SqlJoinType.LEFT_OUTER and self._join_has_at_most_one_match(
+            join_description
+        )
+
+    def _join_has_at_most_one_match(self, join_description: JoinDescription) -> bool:
+        """Returns true if each row on the left side of the join matches at most one row in the joined node."""
+        join_on_entity = join_description.join_on_entity
+        return (
+            join_on_entity is not None
+            and join_description.validity_window is None
+            and join_description.join_type in (SqlJoinType.LEFT_OUTER, SqlJoinType.INNER)
+            and self._entity_is_unique(join_description.join_node, join_on_entity)
+        )
+
+    def _entity_is_unique(self, node: DataflowPlanNode, entity_spec: LinklessEntitySpec) -> bool:
+        """Returns true if there is at most one row for each value of the entity in the output of the node."""
+        if isinstance(node, JoinEliminationOptimizer._ROW_PRESERVING_NODE_TYPES):
+            return self._entity_is_unique(node.parent_nodes[0], entity_spec)
+
+        if isinstance(node, JoinOnEntitiesNode):
+            return self._entity_is_unique(node.left_node, entity_spec) and all(
+                self._join_has_at_most_one_match(join_target) for join_target in node.join_targets
+            )
+
+        if isinstance(node, ReadSqlSourceNode):
+            semantic_model_reference = node.data_set.semantic_model_reference
+            if semantic_model_reference is None:
+                return False
+            semantic_model = self._semantic_model_lookup.get_by_reference(semantic_model_reference)
+            if semantic_model is None:
+                return False
+            return any(
+                entity.reference == entity_spec.reference
+                and entity.type in JoinEliminationOptimizer._UNIQUE_ENTITY_TYPES
+                for entity in semantic_model.entities
+            )
+
+        return False
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import logging
 from dataclasses import dataclass
-from typing import List, Optional, Sequence
+from typing import Hashable, List, Optional, Sequence, Tuple, Type
 
 from metricflow_semantics.specs.metric_spec import MetricSpec
 
@@ -34,6 +34,16 @@ from metricflow.dataflow.optimizer.source_scan.matching_linkable_specs import Ma
 
 logger = logging.getLogger(__name__)
 
+# The types of nodes that are not handled by ComputeMetricsBranchCombiner, so branches with these nodes can't be
+# combined.
+_UNSUPPORTED_NODE_TYPES: Tuple[Type[DataflowPlanNode], ...] = (
+    CombineAggregatedOutputsNode,
+    OrderByLimitNode,
+    WindowReaggregationNode,
+    WriteToResultDataTableNode,
+    WriteToResultTableNode,
+)
+
 
 @dataclass(frozen=True)
 class ComputeMetricsBranchCombinerResult:  # noqa: D101
@@ -131,6 +141,49 @@ class ComputeMetricsBranchCombiner(DataflowPlanNodeVisitor[ComputeMetricsBranchC
         self._current_left_node: DataflowPlanNode = left_branch_node
         self._log_level = logging.DEBUG
 
+    @staticmethod
+    def combination_signature(branch_node: DataflowPlanNode) -> Optional[Hashable]:
+        """Return a value that is the same for any two branches that can be combined.
+
+        The signature includes the structure of the branch, the node types, and the properties of the nodes that have
+        to match for the nodes to be combined (e.g. the source semantic model, the filters, and the linkable specs that
+        the measures are aggregated to). Branches with different signatures can't be combined, so this can be used to
+        skip trying to combine most pairs of branches. Branches with the same signature may still fail to combine.
+
+        Returns None if the branch can't be combined with any other branch.
+        """
+        if isinstance(branch_node, _UNSUPPORTED_NODE_TYPES):
+            return None
+
+        parent_signatures = []
+        for parent_node in branch_node.parent_nodes:
+            parent_signature = ComputeMetricsBranchCombiner.combination_signature(parent_node)
+            if parent_signature is None:
+                return None
+            parent_signatures.append(parent_signature)
+
+        node_signature: Hashable = None
+        if isinstance(branch_node, ReadSqlSourceNode):
+            node_signature = branch_node.data_set.semantic_model_reference
+        elif isinstance(branch_node, WhereConstraintNode):
+            node_signature = (branch_node.where.where_sql, branch_node.always_apply)
+        elif isinstance(branch_node, ConstrainTimeRangeNode):
+            node_signature = branch_node.time_range_constraint
+        elif isinstance(branch_node, MetricTimeDimensionTransformNode):
+            node_signature = branch_node.aggregation_time_dimension_reference
+        elif isinstance(branch_node, FilterElementsNode):
+            include_specs = branch_node.include_specs
+            node_signature = (
+                frozenset(include_specs.dimension_specs),
+                frozenset(include_specs.time_dimension_specs),
+                frozenset(include_specs.entity_specs),
+                frozenset(include_specs.group_by_metric_specs),
+            )
+        elif isinstance(branch_node, ComputeMetricsNode):
+            node_signature = (frozenset(branch_node.aggregated_to_elements), branch_node.for_group_by_source_node)
+
+        return type(branch_node), node_signature, tuple(parent_signatures)
+
     def _log_visit_node_type(self, node: DataflowPlanNode) -> None:
         logger.log(level=self._log_level, msg=f"Visiting {node}")
 
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import logging
 from dataclasses import dataclass
-from typing import List, Optional, Sequence
+from typing import Dict, Hashable, List, Sequence
 
 from metricflow_semantics.dag.id_prefix import StaticIdPrefix
 from metricflow_semantics.dag.mf_dag import DagId
@@ -47,15 +47,6 @@ class OptimizeBranchResult:  # noqa: D101
     optimized_branch: DataflowPlanNode
 
 
-@dataclass(frozen=True)
-class BranchCombinationResult:
-    """Holds the results of combining a branch (right_branch) with one of the branches in a list (left_branch)."""
-
-    left_branch: DataflowPlanNode
-    right_branch: DataflowPlanNode
-    combined_branch: Optional[DataflowPlanNode] = None
-
-
 class SourceScanOptimizer(
     DataflowPlanNodeVisitor[OptimizeBranchResult],
     DataflowPlanOptimizer,
@@ -180,41 +171,43 @@ class SourceScanOptimizer(
         return self._default_base_output_handler(node)
 
     @staticmethod
-    def _combine_branches(
-        left_branches: Sequence[DataflowPlanNode], right_branch: DataflowPlanNode
-    ) -> Sequence[BranchCombinationResult]:
-        """Combine the right branch with one of the left branches.
-
-        This is intended to be used in a loop where the goal is to combine a set of branches with each other in the most
-        optimal way. This should be the case if the combination of branches is commutative e.g. if combining branches
-        (a + b) + c is the same as a + (b + c).
+    def _combine_branches(branches: Sequence[DataflowPlanNode]) -> Sequence[DataflowPlanNode]:
+        """Combine as many of the given branches with each other as possible.
+
+        Each branch is combined with the first branch before it (or the result of a previous combination) that it can be
+        combined with, in a greedy approach. The optimality of this approach needs more thought to prove conclusively,
+        but given the seemingly transitive properties of the combination operation, this seems reasonable.
+
+        Trying to combine every pair of branches via ComputeMetricsBranchCombiner is O(n^2) for n branches, which is
+        slow for queries with many metrics. Since branches can only be combined if they have the same combination
+        signature, the branches are grouped by signature first, and only branches in the same group are tried.
         """
-        results = []
-        combined = False
-        for left_branch in left_branches:
-            # Try combining only if we haven't combined before.
-            if not combined:
-                combiner = ComputeMetricsBranchCombiner(left_branch_node=left_branch)
-                combiner_result: ComputeMetricsBranchCombinerResult = right_branch.accept(combiner)
+        combined_branches: List[DataflowPlanNode] = []
+        # Maps the combination signature to the indexes of the branches in combined_branches with that signature.
+        signature_to_branch_indexes: Dict[Hashable, List[int]] = {}
+
+        for branch in branches:
+            signature = ComputeMetricsBranchCombiner.combination_signature(branch)
+            if signature is None:
+                combined_branches.append(branch)
+                continue
+
+            branch_indexes = signature_to_branch_indexes.setdefault(signature, [])
+            combined = False
+            for branch_index in branch_indexes:
+                combiner = ComputeMetricsBranchCombiner(left_branch_node=combined_branches[branch_index])
+                combiner_result: ComputeMetricsBranchCombinerResult = branch.accept(combiner)
                 if combiner_result.combined_branch is not None:
+                    # The combined branch has the same signature as the branches that were combined.
+                    combined_branches[branch_index] = combiner_result.combined_branch
                     combined = True
-                    results.append(
-                        BranchCombinationResult(
-                            left_branch=left_branch,
-                            right_branch=right_branch,
-                            combined_branch=combiner_result.combined_branch,
-                        )
-                    )
-                    continue
-
-            # Add to results if we didn't combine with left_branch
-            results.append(
-                BranchCombinationResult(
-                    left_branch=left_branch,
-                    right_branch=right_branch,
-                )
-            )
-        return results
+                    break
+
+            if not combined:
+                branch_indexes.append(len(combined_branches))
+                combined_branches.append(branch)
+
+        return combined_branches
 
     def visit_combine_aggregated_outputs_node(  # noqa: D102
         self, node: CombineAggregatedOutputsNode
@@ -231,28 +224,7 @@ class SourceScanOptimizer(
             result: OptimizeBranchResult = parent_branch.accept(self)
             optimized_parent_branches.append(result.optimized_branch)
 
-        # Try to combine (using ComputeMetricsBranchCombiner) as many parent branches as possible in a
-        # greedy N^2 approach. The optimality of this approach needs more thought to prove conclusively, but given
-        # the seemingly transitive properties of the combination operation, this seems reasonable.
-        combined_parent_branches: List[DataflowPlanNode] = []
-        for optimized_parent_branch in optimized_parent_branches:
-            combination_results = SourceScanOptimizer._combine_branches(
-                left_branches=combined_parent_branches, right_branch=optimized_parent_branch
-            )
-
-            # If optimized_parent_branch couldn't be combined with any of the existing ones, add it to the list.
-            if not any(x.combined_branch is not None for x in combination_results):
-                combined_parent_branches.append(optimized_parent_branch)
-            # Otherwise, replaced the branch with the one that was combined in combined_parent_branches
-            else:
-                combined_parent_branches = [
-                    (
-                        branch_combination_result.left_branch
-                        if branch_combination_result.combined_branch is None
-                        else branch_combination_result.combined_branch
-                    )
-                    for branch_combination_result in combination_results
-                ]
+        combined_parent_branches = SourceScanOptimizer._combine_branches(optimized_parent_branches)
 
         logger.debug(lambda: f"Got {len(combined_parent_branches)} branches after combination")
         assert len(combined_parent_branches) > 0
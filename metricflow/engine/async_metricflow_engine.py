@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+from concurrent.futures import Executor
+from typing import Generator, Optional, Sequence
+
+from metricflow_semantics.mf_logging.lazy_formattable import LazyFormat
+from metricflow_semantics.sql.sql_bind_parameters import SqlBindParameters
+
+from metricflow.data_table.mf_table import MetricFlowDataTable
+from metricflow.engine.metricflow_engine import (
+    DEFAULT_QUERY_MANY_MAX_CONCURRENCY,
+    MetricFlowEngine,
+    MetricFlowExplainResult,
+    MetricFlowQueryRequest,
+    MetricFlowQueryResult,
+)
+from metricflow.execution.execution_plan import SelectSqlQueryToDataTableTask
+from metricflow.protocols.sql_client import DEFAULT_QUERY_BATCH_SIZE, AsyncSqlClient, SqlEngine
+from metricflow.sql.render.sql_plan_renderer import SqlQueryPlanRenderer
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncMetricFlowEngine:
+    """Entry point for queries from services that use asyncio.
+
+    Planning a query is CPU-bound, so it's run in an executor to avoid blocking the event loop. The queries are then
+    run through an `AsyncSqlClient`, so a thread is not used while waiting for the data warehouse.
+
+    The queries are planned by a `MetricFlowEngine`, so the options for planning and caching (e.g. the plan cache, the
+    result cache, and the setup snapshot) are set when creating that engine. If the engine only needs to plan queries,
+    it can be created with `PlanningOnlySqlClient`:
+
+        mf_engine = MetricFlowEngine(
+            semantic_manifest_lookup=semantic_manifest_lookup,
+            sql_client=PlanningOnlySqlClient(async_sql_client),
+            result_cache_max_entries=100,
+        )
+        async_mf_engine = AsyncMetricFlowEngine(mf_engine=mf_engine, sql_client=async_sql_client)
+    """
+
+    def __init__(
+        self,
+        mf_engine: MetricFlowEngine,
+        sql_client: AsyncSqlClient,
+        planning_executor: Optional[Executor] = None,
+    ) -> None:
+        """Initializer.
+
+        Args:
+            mf_engine: The engine used for planning queries. Its result cache is also used by this engine.
+            sql_client: The client used to run queries.
+            planning_executor: The executor used for planning queries, and for running plans with multiple tasks. If
+            not specified, the default executor of the event loop is used.
+        """
+        self._sql_client = sql_client
+        self._planning_executor = planning_executor
+        self._mf_engine = mf_engine
+
+    @property
+    def mf_engine(self) -> MetricFlowEngine:
+        """The engine used for planning queries.
+
+        This can be used for the methods that don't access the data warehouse, e.g. `list_metrics()`.
+        """
+        return self._mf_engine
+
+    async def explain(self, mf_request: MetricFlowQueryRequest) -> MetricFlowExplainResult:
+        """Return the plans and the SQL for a query without running it."""
+        return await asyncio.get_running_loop().run_in_executor(
+            self._planning_executor, self._mf_engine.explain, mf_request
+        )
+
+    async def query(self, mf_request: MetricFlowQueryRequest) -> MetricFlowQueryResult:
+        """Query for metrics.
+
+        Plans with a single query are run through the `AsyncSqlClient`, and use the result cache of the
+        `MetricFlowEngine` in the same way as `MetricFlowEngine.query()`. Plans with multiple tasks are run by the
+        `MetricFlowEngine` in the planning executor, so those require the `MetricFlowEngine` to have a `SqlClient` that
+        can run queries.
+        """
+        logger.info(LazyFormat("Starting query request", mf_request=mf_request))
+        explain_result = await self.explain(mf_request)
+        execution_plan = explain_result.convert_to_execution_plan_result.execution_plan
+
+        task = execution_plan.tasks[-1]
+        if len(execution_plan.tasks) != 1:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._planning_executor,
+                functools.partial(
+                    self._mf_engine.execute_explain_result, mf_request=mf_request, explain_result=explain_result
+                ),
+            )
+        if not isinstance(task, SelectSqlQueryToDataTableTask) or task.sql_query is None:
+            raise NotImplementedError(f"Running a {task.__class__.__name__} is not yet supported.")
+
+        sql_query = task.sql_query
+        result_cache = self._mf_engine.result_cache
+        result_df = result_cache.get(sql_query) if result_cache is not None else None
+        if result_df is not None:
+            logger.info(LazyFormat("Finished query request using cached result", request_id=mf_request.request_id))
+        else:
+            result_df = await self._sql_client.query(sql_query.sql_query, sql_bind_parameters=sql_query.bind_parameters)
+            if result_cache is not None:
+                result_cache.put(
+                    sql_query=sql_query,
+                    data_table=result_df,
+                    source_semantic_models=explain_result.dataflow_plan.source_semantic_models,
+                )
+            logger.info(LazyFormat("Finished query request", request_id=mf_request.request_id))
+
+        return MetricFlowQueryResult(
+            query_spec=explain_result.query_spec,
+            dataflow_plan=explain_result.dataflow_plan,
+            sql=sql_query.sql_query,
+            result_df=result_df,
+            result_table=explain_result.output_table,
+        )
+
+    async def query_many(
+        self,
+        mf_requests: Sequence[MetricFlowQueryRequest],
+        max_concurrency: int = DEFAULT_QUERY_MANY_MAX_CONCURRENCY,
+    ) -> Sequence[MetricFlowQueryResult]:
+        """Query for metrics using multiple requests, running up to max_concurrency queries at the same time.
+
+        The results are returned in the same order as the requests.
+        """
+        if max_concurrency < 1:
+            raise ValueError(f"max_concurrency should be >= 1. Got: {max_concurrency}")
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def _query_with_limit(mf_request: MetricFlowQueryRequest) -> MetricFlowQueryResult:
+            async with semaphore:
+                return await self.query(mf_request)
+
+        return tuple(await asyncio.gather(*(_query_with_limit(mf_request) for mf_request in mf_requests)))
+
+
+class PlanningOnlySqlClient:
+    """Provides the parts of an `AsyncSqlClient` that are needed to plan queries in `MetricFlowEngine`.
+
+    Queries are run by `AsyncMetricFlowEngine` through the `AsyncSqlClient`, so the methods that access the data
+    warehouse raise an error. An engine created with this client can't run plans with multiple tasks.
+    """
+
+    def __init__(self, async_sql_client: AsyncSqlClient) -> None:  # noqa: D107
+        self._async_sql_client = async_sql_client
+
+    @property
+    def sql_engine_type(self) -> SqlEngine:  # noqa: D102
+        return self._async_sql_client.sql_engine_type
+
+    @property
+    def sql_query_plan_renderer(self) -> SqlQueryPlanRenderer:  # noqa: D102
+        return self._async_sql_client.sql_query_plan_renderer
+
+    def query(  # noqa: D102
+        self, stmt: str, sql_bind_parameters: SqlBindParameters = SqlBindParameters()
+    ) -> MetricFlowDataTable:
+        raise RuntimeError(f"{self.__class__.__name__} can't run queries. Use the AsyncSqlClient instead.")
+
+    def query_batches(  # noqa: D102
+        self,
+        stmt: str,
+        sql_bind_parameters: SqlBindParameters = SqlBindParameters(),
+        batch_size: int = DEFAULT_QUERY_BATCH_SIZE,
+    ) -> Generator[MetricFlowDataTable, None, None]:
+        raise RuntimeError(f"{self.__class__.__name__} can't run queries. Use the AsyncSqlClient instead.")
+
+    def execute(self, stmt: str, sql_bind_parameters: SqlBindParameters = SqlBindParameters()) -> None:  # noqa: D102
+        raise RuntimeError(f"{self.__class__.__name__} can't run queries. Use the AsyncSqlClient instead.")
+
+    def dry_run(self, stmt: str, sql_bind_parameters: SqlBindParameters = SqlBindParameters()) -> None:  # noqa: D102
+        raise RuntimeError(f"{self.__class__.__name__} can't run queries. Use the AsyncSqlClient instead.")
+
+    def close(self) -> None:  # noqa: D102
+        pass
+
+    def render_bind_parameter_key(self, bind_parameter_key: str) -> str:  # noqa: D102
+        return self._async_sql_client.render_bind_parameter_key(bind_parameter_key)
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import datetime
+import json
+import logging
+import time
+from dataclasses import dataclass
+from hashlib import sha256
+from typing import Callable, FrozenSet, Optional
+
+from dbt_semantic_interfaces.implementations.semantic_manifest import PydanticSemanticManifest
+from dbt_semantic_interfaces.protocols.semantic_manifest import SemanticManifest
+from dbt_semantic_interfaces.references import SemanticModelReference
+from metricflow_semantics.collection_helpers.lru_cache import CacheStats, LruCache
+from metricflow_semantics.mf_logging.lazy_formattable import LazyFormat
+
+from metricflow.data_table.mf_table import MetricFlowDataTable
+from metricflow.execution.execution_plan import SqlQuery
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CachedQueryResult:
+    """A query result stored in the result cache.
+
+    Attributes:
+        data_table: The data returned by the query.
+        source_semantic_models: The semantic models that the query reads from. Used for invalidation.
+    """
+
+    data_table: MetricFlowDataTable
+    source_semantic_models: FrozenSet[SemanticModelReference]
+
+
+class QueryResultCache:
+    """Caches the data returned by queries, keyed by the SQL and the bind parameters.
+
+    Entries expire after a time-to-live (TTL) as the underlying tables may change. When it's known that the tables for a
+    semantic model have changed, `invalidate` can be used to remove the affected entries right away.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        max_bytes: Optional[int] = None,
+        default_ttl: Optional[datetime.timedelta] = None,
+        time_function: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initializer.
+
+        Args:
+            max_entries: The maximum number of results to keep.
+            max_bytes: If specified, the maximum total size of the results, as estimated by the data tables.
+            default_ttl: If specified, how long a result is valid for when a TTL is not given in `put`.
+            time_function: Returns the current time in seconds. Used for computing expiration times.
+        """
+        self._cache: LruCache[SqlQuery, CachedQueryResult] = LruCache(
+            max_entries=max_entries,
+            max_bytes=max_bytes,
+            size_function=QueryResultCache.approximate_size_in_bytes,
+            default_ttl=default_ttl.total_seconds() if default_ttl is not None else None,
+            time_function=time_function,
+        )
+
+    @staticmethod
+    def approximate_size_in_bytes(cached_result: CachedQueryResult) -> int:
+        """Estimate the memory used by a cached result."""
+        return cached_result.data_table.approximate_size_in_bytes
+
+    def get(self, sql_query: SqlQuery) -> Optional[MetricFlowDataTable]:
+        """Return the cached data for the given query, or None if it's not in the cache or has expired."""
+        cached_result = self._cache.get(sql_query)
+        return cached_result.data_table if cached_result is not None else None
+
+    def put(
+        self,
+        sql_query: SqlQuery,
+        data_table: MetricFlowDataTable,
+        source_semantic_models: FrozenSet[SemanticModelReference],
+        ttl: Optional[datetime.timedelta] = None,
+    ) -> None:
+        """Cache the data returned by a query.
+
+        Args:
+            sql_query: The query that was run.
+            data_table: The data returned by the query.
+            source_semantic_models: The semantic models that the query reads from.
+            ttl: How long the result is valid for. If not specified, the default TTL is used.
+        """
+        self._cache.put(
+            key=sql_query,
+            value=CachedQueryResult(data_table=data_table, source_semantic_models=source_semantic_models),
+            ttl=ttl.total_seconds() if ttl is not None else None,
+        )
+
+    def invalidate(self, semantic_model: Optional[SemanticModelReference] = None) -> int:
+        """Remove the results of queries that read from the given semantic model, or all results if not specified.
+
+        Returns the number of results that were removed.
+        """
+        if semantic_model is None:
+            entry_count = self._cache.stats.entry_count
+            self._cache.clear()
+            invalidated_count = entry_count
+        else:
+            invalidated_count = self._cache.remove_matching(
+                lambda _, cached_result: semantic_model in cached_result.source_semantic_models
+            )
+        logger.debug(
+            LazyFormat(lambda: f"Invalidated {invalidated_count} cached results", semantic_model=semantic_model)
+        )
+        return invalidated_count
+
+    @property
+    def stats(self) -> CacheStats:  # noqa: D102
+        return self._cache.stats
+
+
+# Fields in the type parameters of a metric that are lists where the order doesn't matter. These are set by
+# transformations that collect the items in a set, so the order depends on the hash seed of the process.
+_ORDER_INSENSITIVE_METRIC_TYPE_PARAMS_FIELDS = ("input_measures",)
+
+
+def semantic_manifest_fingerprint(semantic_manifest: SemanticManifest) -> str:
+    """Return a hash of the contents of the semantic manifest.
+
+    This can be included in cache keys so that entries created from one manifest are not used with another. The hash
+    is the same in different processes for the same manifest, so it can be used for entries that are saved to disk.
+    """
+    if isinstance(semantic_manifest, PydanticSemanticManifest):
+        manifest_dict = json.loads(semantic_manifest.json())
+        for metric_dict in manifest_dict["metrics"]:
+            type_params_dict = metric_dict["type_params"]
+            for field_name in _ORDER_INSENSITIVE_METRIC_TYPE_PARAMS_FIELDS:
+                if type_params_dict.get(field_name) is not None:
+                    type_params_dict[field_name] = sorted(
+                        type_params_dict[field_name], key=lambda item: json.dumps(item, sort_keys=True)
+                    )
+        serialized_manifest = json.dumps(manifest_dict, sort_keys=True)
+    else:
+        serialized_manifest = repr(semantic_manifest)
+    return sha256(serialized_manifest.encode("utf-8")).hexdigest()
@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+import os
+import pathlib
+import tempfile
+
+
+def write_file_atomically(file_path: pathlib.Path, data: bytes) -> None:
+    """Write the data to the file, replacing it if it exists.
+
+    The data is written to a temporary file in the same directory that is then renamed, so readers (e.g. other
+    processes that start at the same time) see either the previous file or the complete new file. The parent
+    directories are created if needed.
+    """
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    file_descriptor, temp_file_path = tempfile.mkstemp(dir=file_path.parent, prefix=f".{file_path.name}.")
+    try:
+        with os.fdopen(file_descriptor, "wb") as f:
+            f.write(data)
+        os.replace(temp_file_path, file_path)
+    except BaseException:
+        os.unlink(temp_file_path)
+        raise
@@ -3,18 +3,21 @@ from __future__ import annotations
 import datetime
 import logging
 from abc import ABC, abstractmethod
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 from enum import Enum
-from typing import FrozenSet, List, Optional, Sequence, Tuple
+from typing import FrozenSet, Generator, List, Optional, Sequence, Tuple, TypeVar
 
 from dbt_semantic_interfaces.implementations.elements.dimension import PydanticDimensionTypeParams
 from dbt_semantic_interfaces.implementations.filters.where_filter import PydanticWhereFilter
 from dbt_semantic_interfaces.references import EntityReference, MeasureReference, MetricReference
 from dbt_semantic_interfaces.type_enums import DimensionType
+from metricflow_semantics.collection_helpers.lru_cache import LruCache
 from metricflow_semantics.dag.sequential_id import SequentialIdGenerator
 from metricflow_semantics.errors.error_classes import ExecutionException
 from metricflow_semantics.filters.time_constraint import TimeRangeConstraint
 from metricflow_semantics.mf_logging.lazy_formattable import LazyFormat
+from metricflow_semantics.mf_logging.pretty_print import mf_pformat
 from metricflow_semantics.mf_logging.runtime import log_block_runtime
 from metricflow_semantics.model.linkable_element_property import LinkableElementProperty
 from metricflow_semantics.model.semantic_manifest_lookup import SemanticManifestLookup
@@ -36,32 +39,48 @@ from metricflow_semantics.time.time_source import TimeSource
 from metricflow_semantics.time.time_spine_source import TimeSpineSource
 
 from metricflow.data_table.mf_table import MetricFlowDataTable
-from metricflow.dataflow.builder.dataflow_plan_builder import DataflowPlanBuilder
-from metricflow.dataflow.builder.node_data_set import DataflowPlanNodeOutputDataSetResolver
+from metricflow.dataflow.builder.dataflow_plan_builder import (
+    DataflowPlanBuilder,
+    SourceNodeRecipe,
+    SourceNodeRecipeCacheKey,
+)
+from metricflow.dataflow.builder.node_data_set import (
+    DataflowPlanNodeOutputDataSetResolver,
+    NodeOutputDataSetCacheStats,
+)
 from metricflow.dataflow.builder.source_node import SourceNodeBuilder
 from metricflow.dataflow.dataflow_plan import DataflowPlan
 from metricflow.dataflow.optimizer.dataflow_optimizer_factory import DataflowPlanOptimization
 from metricflow.dataset.convert_semantic_model import SemanticModelToDataSetConverter
 from metricflow.dataset.dataset_classes import DataSet
 from metricflow.dataset.semantic_model_adapter import SemanticModelDataSet
+from metricflow.engine.cache import QueryResultCache, semantic_manifest_fingerprint
 from metricflow.engine.models import Dimension, Entity, Measure, Metric, SavedQuery
 from metricflow.engine.time_source import ServerTimeSource
+from metricflow.engine.warm_start import EngineSetupSnapshot
 from metricflow.execution.convert_to_execution_plan import ConvertToExecutionPlanResult
 from metricflow.execution.dataflow_to_execution import (
     DataflowToExecutionPlanConverter,
 )
-from metricflow.execution.execution_plan import ExecutionPlan, SqlQuery
-from metricflow.execution.executor import SequentialPlanExecutor
+from metricflow.execution.execution_plan import ExecutionPlan, SelectSqlQueryToDataTableTask, SqlQuery
+from metricflow.execution.executor import ParallelPlanExecutor, SequentialPlanExecutor
 from metricflow.plan_conversion.dataflow_to_sql import DataflowToSqlQueryPlanConverter
-from metricflow.protocols.sql_client import SqlClient
+from metricflow.plan_conversion.sql_literal_parameterizer import SqlLiteralParameterizer
+from metricflow.protocols.sql_client import DEFAULT_QUERY_BATCH_SIZE, SqlClient
+from metricflow.protocols.table_statistics import TableStatisticsProvider
 from metricflow.sql.optimizer.optimization_levels import SqlQueryOptimizationLevel
+from metricflow.sql.render.sql_plan_renderer import SqlCteRenderingOptions
 from metricflow.telemetry.models import TelemetryLevel
 from metricflow.telemetry.reporter import TelemetryReporter, log_call
 
 logger = logging.getLogger(__name__)
+ItemT = TypeVar("ItemT")
 _telemetry_reporter = TelemetryReporter(report_levels_higher_or_equal_to=TelemetryLevel.USAGE)
 _telemetry_reporter.add_python_log_handler()
 
+# The default for the number of queries that `query_many` runs at the same time.
+DEFAULT_QUERY_MANY_MAX_CONCURRENCY = 8
+
 
 @dataclass(frozen=True)
 class MetricFlowRequestId:
@@ -155,6 +174,73 @@ class MetricFlowQueryRequest:
         )
 
 
+@dataclass(frozen=True)
+class MetricFlowPlanCacheKey:
+    """Identifies the plan for a query request in the plan cache.
+
+    This contains the fields in `MetricFlowQueryRequest` that affect the generated plan, so the request ID is excluded.
+    The order of the metrics and group-by items is kept as-is since it determines the order of the output columns.
+
+    manifest_fingerprint: A hash of the semantic manifest that the plan was generated from.
+    """
+
+    manifest_fingerprint: str
+    saved_query_name: Optional[str]
+    metric_names: Optional[Tuple[str, ...]]
+    metrics: Optional[Tuple[MetricQueryParameter, ...]]
+    group_by_names: Optional[Tuple[str, ...]]
+    group_by: Optional[Tuple[GroupByParameter, ...]]
+    limit: Optional[int]
+    time_constraint_start: Optional[datetime.datetime]
+    time_constraint_end: Optional[datetime.datetime]
+    where_constraint: Optional[str]
+    order_by_names: Optional[Tuple[str, ...]]
+    order_by: Optional[Tuple[OrderByQueryParameter, ...]]
+    min_max_only: bool
+    sql_optimization_level: SqlQueryOptimizationLevel
+    dataflow_plan_optimizations: FrozenSet[DataflowPlanOptimization]
+    query_type: MetricFlowQueryType
+
+    @staticmethod
+    def from_request(  # noqa: D102
+        mf_query_request: MetricFlowQueryRequest, manifest_fingerprint: str
+    ) -> MetricFlowPlanCacheKey:
+        return MetricFlowPlanCacheKey(
+            manifest_fingerprint=manifest_fingerprint,
+            saved_query_name=mf_query_request.saved_query_name,
+            metric_names=_optional_tuple(mf_query_request.metric_names),
+            metrics=_optional_tuple(mf_query_request.metrics),
+            group_by_names=_optional_tuple(mf_query_request.group_by_names),
+            group_by=_optional_tuple(mf_query_request.group_by),
+            limit=mf_query_request.limit,
+            time_constraint_start=mf_query_request.time_constraint_start,
+            time_constraint_end=mf_query_request.time_constraint_end,
+            where_constraint=mf_query_request.where_constraint,
+            order_by_names=_optional_tuple(mf_query_request.order_by_names),
+            order_by=_optional_tuple(mf_query_request.order_by),
+            min_max_only=mf_query_request.min_max_only,
+            sql_optimization_level=mf_query_request.sql_optimization_level,
+            dataflow_plan_optimizations=frozenset(mf_query_request.dataflow_plan_optimizations),
+            query_type=mf_query_request.query_type,
+        )
+
+    @property
+    def is_hashable(self) -> bool:
+        """Returns true if all query parameters can be hashed.
+
+        Query parameters are specified via protocols, so an implementation might not be hashable.
+        """
+        try:
+            hash(self)
+        except TypeError:
+            return False
+        return True
+
+
+def _optional_tuple(items: Optional[Sequence[ItemT]]) -> Optional[Tuple[ItemT, ...]]:
+    return tuple(items) if items is not None else None
+
+
 @dataclass(frozen=True)
 class MetricFlowQueryResult:
     """The result of a query and context on how it was generated."""
@@ -177,14 +263,18 @@ class MetricFlowExplainResult:
 
     @property
     def rendered_sql(self) -> SqlQuery:
-        """Return the SQL query that would be run for the given query."""
+        """Return the SQL query that would be run for the given query.
+
+        For plans with multiple tasks, this is the SQL of the task that returns the result. The other tasks are
+        prerequisites for it.
+        """
         execution_plan = self.execution_plan
-        if len(execution_plan.tasks) != 1:
+        if len(execution_plan.sink_nodes) != 1:
             raise NotImplementedError(
-                f"Multiple tasks in the execution plan not yet supported. Got tasks: {execution_plan.tasks}"
+                f"Execution plans with multiple sink tasks not yet supported. Got: {execution_plan.sink_nodes}"
             )
 
-        sql_query = execution_plan.tasks[0].sql_query
+        sql_query = execution_plan.sink_nodes[0].sql_query
         if not sql_query:
             raise NotImplementedError(
                 f"Execution plan tasks without a SQL query not yet supported. Got tasks: {execution_plan.tasks}"
@@ -210,6 +300,15 @@ class MetricFlowExplainResult:
     def execution_plan(self) -> ExecutionPlan:  # noqa: D102
         return self.convert_to_execution_plan_result.execution_plan
 
+    @property
+    def approximate_size_in_bytes(self) -> int:
+        """An approximation of the memory used by this result, based on the length of the rendered SQL.
+
+        The size of the plans scales with the size of the SQL that was rendered from them, so this is used to bound the
+        size of the plan cache without having to walk the object graph.
+        """
+        return sum(len(task.sql_query.sql_query) for task in self.execution_plan.tasks if task.sql_query is not None)
+
 
 class AbstractMetricFlowEngine(ABC):
     """Query interface for clients."""
@@ -222,6 +321,36 @@ class AbstractMetricFlowEngine(ABC):
         """Query for metrics."""
         pass
 
+    @abstractmethod
+    def query_many(
+        self,
+        mf_requests: Sequence[MetricFlowQueryRequest],
+        max_concurrency: int = DEFAULT_QUERY_MANY_MAX_CONCURRENCY,
+    ) -> Sequence[MetricFlowQueryResult]:
+        """Query for metrics using multiple requests, running up to max_concurrency queries at the same time.
+
+        The results are returned in the same order as the requests.
+        """
+        pass
+
+    @abstractmethod
+    def query_iter(
+        self,
+        mf_request: MetricFlowQueryRequest,
+        batch_size: int = DEFAULT_QUERY_BATCH_SIZE,
+    ) -> Generator[MetricFlowDataTable, None, None]:
+        """Query for metrics, returning the rows in batches of up to batch_size rows as they are fetched.
+
+        This allows large results to be processed without loading all rows into memory, though some SQL clients fetch
+        the full result from the database when the query is run (see `SqlClient.query_batches`). The query is planned
+        before this method returns, and it's run when the first batch is requested.
+
+        The connection used for the query is held until the generator is exhausted or closed. If the generator is not
+        consumed fully, close it (e.g. `with contextlib.closing(engine.query_iter(request)) as batches:`) so that the
+        connection is released right away instead of when the generator is garbage collected.
+        """
+        pass
+
     @abstractmethod
     def explain(
         self,
@@ -341,11 +470,63 @@ class MetricFlowEngine(AbstractMetricFlowEngine):
         query_parser: Optional[MetricFlowQueryParser] = None,
         column_association_resolver: Optional[ColumnAssociationResolver] = None,
         consistent_id_enumeration: Optional[bool] = True,
+        plan_cache_max_entries: int = 0,
+        plan_cache_max_bytes: Optional[int] = None,
+        result_cache_max_entries: int = 0,
+        result_cache_max_bytes: Optional[int] = None,
+        result_cache_ttl: Optional[datetime.timedelta] = None,
+        setup_snapshot: Optional[EngineSetupSnapshot] = None,
+        render_literals_as_bind_parameters: bool = False,
+        source_node_recipe_cache_max_entries: int = 0,
+        precompute_multi_hop_join_candidates: bool = False,
+        table_statistics_provider: Optional[TableStatisticsProvider] = None,
+        node_output_data_set_cache_max_entries: int = (
+            DataflowPlanNodeOutputDataSetResolver.DEFAULT_QUERY_NODE_CACHE_MAX_ENTRIES
+        ),
+        cte_rendering_options: Optional[SqlCteRenderingOptions] = None,
     ) -> None:
         """Initializer for MetricFlowEngine.
 
-        consistent_id_enumeration can be set to True to reset the numbering of sequentially generated IDs on each query. This
-        will help generate consistent SQL between queries as aliases will be the same.
+        consistent_id_enumeration can be set to True to start the numbering of sequentially generated IDs from the same
+        value on each query. This will help generate consistent SQL between queries as aliases will be the same. The
+        numbering is local to each query, so queries can be planned concurrently.
+
+        plan_cache_max_entries can be set to a positive value to cache the plans generated for query requests, so that
+        repeated requests skip parsing, planning, and rendering. plan_cache_max_bytes additionally bounds the cache by
+        the approximate size of the cached plans (see `MetricFlowExplainResult.approximate_size_in_bytes`).
+
+        result_cache_max_entries can be set to a positive value to cache the data returned by queries, keyed by the
+        rendered SQL and bind parameters. result_cache_max_bytes bounds the cache by the approximate size of the results,
+        and result_cache_ttl sets how long a result can be used for. When the data for a semantic model changes, use
+        `result_cache.invalidate()` to remove the results of queries that read from it.
+
+        setup_snapshot can be set to use the artifacts saved from another engine instead of computing them from the
+        semantic manifest (see `create_setup_snapshot`). semantic_manifest_lookup should be the lookup in the snapshot.
+
+        render_literals_as_bind_parameters can be set to True to render the literals in where filters and time range
+        constraints as bind parameters (using `SqlClient.render_bind_parameter_key`). Then queries that only differ in
+        those values have the same SQL, so caches in the data warehouse that are keyed by the SQL can be used. The SQL
+        client needs to support bind parameters.
+
+        source_node_recipe_cache_max_entries can be set to a positive value to cache how the source nodes are selected
+        and joined for the measures and group-by items in a query. This speeds up planning for queries that are not in
+        the plan cache, e.g. when the same metrics and group-by items are queried with a different order or limit.
+
+        precompute_multi_hop_join_candidates can be set to True to build the nodes for the possible multi-hop joins
+        during initialization and share them between queries. This speeds up planning queries with multi-hop group-by
+        items, but makes initialization slower for manifests with many semantic models.
+
+        table_statistics_provider can be set to choose between source nodes using the sizes of the tables, e.g. to read
+        a dimension from a small dimension table instead of a large fact table that also has it (see
+        `SqlTableStatisticsProvider`).
+
+        node_output_data_set_cache_max_entries limits the number of output data sets that are cached for the nodes
+        created while planning queries (e.g. for multi-hop joins). The ones for the source nodes are always cached. Use
+        `node_output_data_set_cache_stats` to check the hit rate and the number of evictions when sizing this.
+
+        cte_rendering_options can be set to render sub-queries as common table expressions in a WITH clause, e.g. so that
+        a sub-query that's used in multiple places in the query is only rendered once. This also enables the
+        `COMMON_SUBPLAN` dataflow plan optimization, so that identical branches in the plan are rendered as one CTE.
 
         For direct calls to construct MetricFlowEngine, do not pass the following parameters,
         - time_source
@@ -374,26 +555,44 @@ class MetricFlowEngine(AbstractMetricFlowEngine):
         self._time_spine_sources = TimeSpineSource.build_standard_time_spine_sources(
             semantic_manifest_lookup.semantic_manifest
         )
-        self._source_data_sets: List[SemanticModelDataSet] = []
-        converter = SemanticModelToDataSetConverter(column_association_resolver=self._column_association_resolver)
-        for semantic_model in sorted(
-            self._semantic_manifest_lookup.semantic_manifest.semantic_models, key=lambda model: model.name
-        ):
-            data_set = converter.create_sql_source_data_set(semantic_model)
-            self._source_data_sets.append(data_set)
-            logger.debug(LazyFormat(lambda: f"Created source dataset from semantic model '{semantic_model.name}'"))
-
         source_node_builder = SourceNodeBuilder(
             column_association_resolver=self._column_association_resolver,
             semantic_manifest_lookup=self._semantic_manifest_lookup,
         )
-        source_node_set = source_node_builder.create_from_data_sets(self._source_data_sets)
-
-        node_output_resolver = DataflowPlanNodeOutputDataSetResolver(
-            column_association_resolver=self._column_association_resolver,
-            semantic_manifest_lookup=self._semantic_manifest_lookup,
-        )
-        node_output_resolver.cache_output_data_sets(source_node_set.all_nodes)
+        self._source_data_sets: List[SemanticModelDataSet] = []
+        if setup_snapshot is not None:
+            if setup_snapshot.semantic_manifest_lookup is not semantic_manifest_lookup:
+                raise ValueError("The semantic_manifest_lookup should be the one in the setup snapshot.")
+            logger.info(LazyFormat("Using setup snapshot", manifest_fingerprint=setup_snapshot.manifest_fingerprint))
+            self._source_data_sets.extend(setup_snapshot.source_data_sets)
+            source_node_set = setup_snapshot.source_node_set
+            node_output_resolver = DataflowPlanNodeOutputDataSetResolver(
+                column_association_resolver=self._column_association_resolver,
+                semantic_manifest_lookup=self._semantic_manifest_lookup,
+                _node_to_output_data_set=dict(setup_snapshot.node_to_output_data_set),
+                query_node_cache_max_entries=node_output_data_set_cache_max_entries,
+            )
+        else:
+            converter = SemanticModelToDataSetConverter(column_association_resolver=self._column_association_resolver)
+            for semantic_model in sorted(
+                self._semantic_manifest_lookup.semantic_manifest.semantic_models, key=lambda model: model.name
+            ):
+                data_set = converter.create_sql_source_data_set(semantic_model)
+                self._source_data_sets.append(data_set)
+                logger.debug(LazyFormat(lambda: f"Created source dataset from semantic model '{semantic_model.name}'"))
+
+            source_node_set = source_node_builder.create_from_data_sets(self._source_data_sets)
+
+            node_output_resolver = DataflowPlanNodeOutputDataSetResolver(
+                column_association_resolver=self._column_association_resolver,
+                semantic_manifest_lookup=self._semantic_manifest_lookup,
+                query_node_cache_max_entries=node_output_data_set_cache_max_entries,
+            )
+            node_output_resolver.cache_output_data_sets(source_node_set.all_nodes)
+        self._source_node_set = source_node_set
+        # A copy of the resolver is made so that the snapshot only includes the output data sets of the source nodes.
+        self._source_node_output_resolver = node_output_resolver.copy()
+        self._node_output_resolver = node_output_resolver
 
         self._dataflow_plan_builder = DataflowPlanBuilder(
             source_node_set=source_node_set,
@@ -401,25 +600,140 @@ class MetricFlowEngine(AbstractMetricFlowEngine):
             column_association_resolver=self._column_association_resolver,
             node_output_resolver=node_output_resolver,
             source_node_builder=source_node_builder,
+            source_node_recipe_cache_max_entries=source_node_recipe_cache_max_entries,
+            precompute_multi_hop_join_candidates=precompute_multi_hop_join_candidates,
+            table_statistics_provider=table_statistics_provider,
+        )
+        # Shared nodes in the dataflow plan are only rendered once when CTEs are used, so the common subplan
+        # optimization is only worthwhile then.
+        self._additional_dataflow_plan_optimizations: FrozenSet[DataflowPlanOptimization] = (
+            frozenset((DataflowPlanOptimization.COMMON_SUBPLAN,)) if cte_rendering_options is not None else frozenset()
         )
         self._to_sql_query_plan_converter = DataflowToSqlQueryPlanConverter(
             column_association_resolver=self._column_association_resolver,
             semantic_manifest_lookup=self._semantic_manifest_lookup,
+            literal_parameterizer=(
+                SqlLiteralParameterizer(sql_client.render_bind_parameter_key)
+                if render_literals_as_bind_parameters
+                else None
+            ),
+            reuse_sql_for_shared_nodes=cte_rendering_options is not None,
         )
         self._to_execution_plan_converter = DataflowToExecutionPlanConverter(
             sql_plan_converter=self._to_sql_query_plan_converter,
-            sql_plan_renderer=self._sql_client.sql_query_plan_renderer,
+            sql_plan_renderer=(
+                self._sql_client.sql_query_plan_renderer.with_cte_rendering_options(cte_rendering_options)
+                if cte_rendering_options is not None
+                else self._sql_client.sql_query_plan_renderer
+            ),
             sql_client=sql_client,
         )
         self._executor = SequentialPlanExecutor()
+        self._parallel_executor = ParallelPlanExecutor()
 
         self._query_parser = query_parser or MetricFlowQueryParser(
             semantic_manifest_lookup=self._semantic_manifest_lookup,
         )
 
+        self._plan_cache: Optional[LruCache[MetricFlowPlanCacheKey, MetricFlowExplainResult]] = None
+        self._manifest_fingerprint: Optional[str] = None
+        if plan_cache_max_entries > 0:
+            self._manifest_fingerprint = semantic_manifest_fingerprint(semantic_manifest_lookup.semantic_manifest)
+            self._plan_cache = LruCache(
+                max_entries=plan_cache_max_entries,
+                max_bytes=plan_cache_max_bytes,
+                size_function=lambda explain_result: explain_result.approximate_size_in_bytes,
+            )
+
+        self._result_cache: Optional[QueryResultCache] = None
+        if result_cache_max_entries > 0:
+            self._result_cache = QueryResultCache(
+                max_entries=result_cache_max_entries,
+                max_bytes=result_cache_max_bytes,
+                default_ttl=result_cache_ttl,
+            )
+
+    @property
+    def plan_cache(self) -> Optional[LruCache[MetricFlowPlanCacheKey, MetricFlowExplainResult]]:
+        """The cache for plans generated for query requests, or None if plan caching is not enabled."""
+        return self._plan_cache
+
+    @property
+    def source_node_recipe_cache(self) -> Optional[LruCache[SourceNodeRecipeCacheKey, SourceNodeRecipe]]:
+        """The cache for how source nodes are selected and joined, or None if recipe caching is not enabled."""
+        return self._dataflow_plan_builder.source_node_recipe_cache
+
+    @property
+    def node_output_data_set_cache_stats(self) -> NodeOutputDataSetCacheStats:
+        """The counters for the cache of the output data sets of the nodes used in planning."""
+        return self._node_output_resolver.cache_stats
+
+    def create_setup_snapshot(self) -> EngineSetupSnapshot:
+        """Return the artifacts computed from the semantic manifest during initialization, for use in another engine.
+
+        e.g. a service can save the snapshot so that new processes start faster:
+
+            snapshot = EngineSetupSnapshot.load(directory, semantic_manifest)
+            if snapshot is None:
+                mf_engine = MetricFlowEngine(SemanticManifestLookup(semantic_manifest), sql_client)
+                mf_engine.create_setup_snapshot().save(directory)
+            else:
+                mf_engine = MetricFlowEngine(snapshot.semantic_manifest_lookup, sql_client, setup_snapshot=snapshot)
+        """
+        return EngineSetupSnapshot(
+            manifest_fingerprint=self._manifest_fingerprint
+            or semantic_manifest_fingerprint(self._semantic_manifest_lookup.semantic_manifest),
+            semantic_manifest_lookup=self._semantic_manifest_lookup,
+            source_data_sets=tuple(self._source_data_sets),
+            source_node_set=self._source_node_set,
+            node_to_output_data_set=dict(self._source_node_output_resolver.node_to_output_data_set),
+        )
+
+    @property
+    def result_cache(self) -> Optional[QueryResultCache]:
+        """The cache for the data returned by queries, or None if result caching is not enabled."""
+        return self._result_cache
+
     @log_call(module_name=__name__, telemetry_reporter=_telemetry_reporter)
     def query(self, mf_request: MetricFlowQueryRequest) -> MetricFlowQueryResult:  # noqa: D102
-        logger.info(LazyFormat("Starting query request", mf_request=mf_request))
+        return self._plan_and_execute_query(mf_request)
+
+    @log_call(module_name=__name__, telemetry_reporter=_telemetry_reporter)
+    def query_many(  # noqa: D102
+        self,
+        mf_requests: Sequence[MetricFlowQueryRequest],
+        max_concurrency: int = DEFAULT_QUERY_MANY_MAX_CONCURRENCY,
+    ) -> Sequence[MetricFlowQueryResult]:
+        if max_concurrency < 1:
+            raise ValueError(f"max_concurrency should be >= 1. Got: {max_concurrency}")
+        logger.info(
+            LazyFormat(
+                "Starting query requests",
+                request_ids=[mf_request.request_id for mf_request in mf_requests],
+                max_concurrency=max_concurrency,
+            )
+        )
+        # Each request is planned and run in a worker thread, so planning a request overlaps with running the others.
+        futures: List[Future[MetricFlowQueryResult]] = []
+        with ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="mf_query") as thread_pool:
+            try:
+                for mf_request in mf_requests:
+                    futures.append(thread_pool.submit(self._plan_and_execute_query, mf_request))
+                return tuple(future.result() for future in futures)
+            except Exception:
+                # Don't start the queries that haven't started yet. Queries that are running will finish before the
+                # thread pool is shut down.
+                for future in futures:
+                    future.cancel()
+                raise
+
+    @log_call(module_name=__name__, telemetry_reporter=_telemetry_reporter)
+    def query_iter(  # noqa: D102
+        self,
+        mf_request: MetricFlowQueryRequest,
+        batch_size: int = DEFAULT_QUERY_BATCH_SIZE,
+    ) -> Generator[MetricFlowDataTable, None, None]:
+        logger.info(LazyFormat("Starting query request", mf_request=mf_request, batch_size=batch_size))
         explain_result = self._create_execution_plan(mf_request)
         execution_plan = explain_result.convert_to_execution_plan_result.execution_plan
 
@@ -427,18 +741,75 @@ class MetricFlowEngine(AbstractMetricFlowEngine):
             raise NotImplementedError("Multiple tasks not yet supported.")
 
         task = execution_plan.tasks[0]
+        if not isinstance(task, SelectSqlQueryToDataTableTask) or task.sql_query is None:
+            raise NotImplementedError(f"Returning the results of a {task.__class__.__name__} is not yet supported.")
 
-        logger.debug(LazyFormat(lambda: f"Sequentially running tasks in:\n" f"{execution_plan.structure_text()}"))
-        execution_results = self._executor.execute_plan(execution_plan)
+        # The result cache is not used as the results are not kept in memory.
+        return self._sql_client.query_batches(
+            task.sql_query.sql_query, sql_bind_parameters=task.sql_query.bind_parameters, batch_size=batch_size
+        )
+
+    def _plan_and_execute_query(self, mf_request: MetricFlowQueryRequest) -> MetricFlowQueryResult:
+        logger.info(LazyFormat("Starting query request", mf_request=mf_request))
+        explain_result = self._create_execution_plan(mf_request)
+        return self.execute_explain_result(mf_request=mf_request, explain_result=explain_result)
+
+    def execute_explain_result(
+        self, mf_request: MetricFlowQueryRequest, explain_result: MetricFlowExplainResult
+    ) -> MetricFlowQueryResult:
+        """Run the execution plan that `explain()` returned for the request.
+
+        This allows the planning and the execution of a query to be run separately, e.g. in different executors.
+        """
+        execution_plan = explain_result.convert_to_execution_plan_result.execution_plan
+
+        tasks = execution_plan.tasks
+        # The result of the query is the result of the last task. The other tasks are prerequisites for it.
+        task = tasks[-1]
+
+        # Only single-task plans are cached as the other tasks may have side effects e.g. creating a table.
+        cacheable_sql_query = (
+            task.sql_query
+            if self._result_cache is not None and len(tasks) == 1 and isinstance(task, SelectSqlQueryToDataTableTask)
+            else None
+        )
+        if self._result_cache is not None and cacheable_sql_query is not None:
+            cached_data_table = self._result_cache.get(cacheable_sql_query)
+            if cached_data_table is not None:
+                logger.info(LazyFormat("Finished query request using cached result", request_id=mf_request.request_id))
+                return MetricFlowQueryResult(
+                    query_spec=explain_result.query_spec,
+                    dataflow_plan=explain_result.dataflow_plan,
+                    sql=cacheable_sql_query.sql_query,
+                    result_df=cached_data_table,
+                    result_table=explain_result.output_table,
+                )
+
+        # Independent tasks in multi-task plans are run at the same time.
+        executor = self._executor if len(tasks) == 1 else self._parallel_executor
+        logger.debug(
+            LazyFormat(
+                lambda: f"Running tasks using {executor.__class__.__name__} in:\n{execution_plan.structure_text()}"
+            )
+        )
+        execution_results = executor.execute_plan(execution_plan)
         logger.debug(LazyFormat(lambda: "Finished running tasks in execution plan"))
 
         if execution_results.contains_task_errors:
-            raise ExecutionException(f"Got errors while executing tasks:\n{execution_results.get_result(task.task_id)}")
+            errored_results = [result for result in execution_results.all_results().values() if result.errors]
+            raise ExecutionException(f"Got errors while executing tasks:\n{mf_pformat(errored_results)}")
 
         task_execution_result = execution_results.get_result(task.task_id)
 
         assert task_execution_result.sql, "Task execution should have returned SQL that was run"
 
+        if self._result_cache is not None and cacheable_sql_query is not None and task_execution_result.df is not None:
+            self._result_cache.put(
+                sql_query=cacheable_sql_query,
+                data_table=task_execution_result.df,
+                source_semantic_models=explain_result.dataflow_plan.source_semantic_models,
+            )
+
         logger.info(LazyFormat("Finished query request", request_id=mf_request.request_id))
         return MetricFlowQueryResult(
             query_spec=explain_result.query_spec,
@@ -454,14 +825,42 @@ class MetricFlowEngine(AbstractMetricFlowEngine):
         return TimeRangeConstraint.all_time()
 
     def _create_execution_plan(self, mf_query_request: MetricFlowQueryRequest) -> MetricFlowExplainResult:
-        if self._reset_id_enumeration:
-            logger.debug(
-                LazyFormat(
-                    lambda: f"Setting ID generation to start at: {MetricFlowEngine._ID_ENUMERATION_START_VALUE_FOR_QUERIES}"
-                )
+        if self._plan_cache is None or self._manifest_fingerprint is None:
+            return self._build_execution_plan(mf_query_request)
+
+        cache_key = MetricFlowPlanCacheKey.from_request(
+            mf_query_request=mf_query_request, manifest_fingerprint=self._manifest_fingerprint
+        )
+        if not cache_key.is_hashable:
+            logger.debug(LazyFormat(lambda: "Skipping the plan cache as the request contains unhashable parameters"))
+            return self._build_execution_plan(mf_query_request)
+
+        explain_result = self._plan_cache.get(cache_key)
+        if explain_result is not None:
+            logger.info(LazyFormat("Using cached plan", request_id=mf_query_request.request_id))
+            return explain_result
+
+        explain_result = self._build_execution_plan(mf_query_request)
+        self._plan_cache.put(cache_key, explain_result)
+        return explain_result
+
+    def _build_execution_plan(self, mf_query_request: MetricFlowQueryRequest) -> MetricFlowExplainResult:
+        if not self._reset_id_enumeration:
+            return self._build_execution_plan_with_current_ids(mf_query_request)
+
+        # Generate IDs in a scope local to this request so that requests planned concurrently get the same IDs as
+        # they would when planned one at a time.
+        logger.debug(
+            LazyFormat(
+                lambda: f"Setting ID generation to start at: {MetricFlowEngine._ID_ENUMERATION_START_VALUE_FOR_QUERIES}"
             )
-            SequentialIdGenerator.reset(MetricFlowEngine._ID_ENUMERATION_START_VALUE_FOR_QUERIES)
+        )
+        with SequentialIdGenerator.id_scope(MetricFlowEngine._ID_ENUMERATION_START_VALUE_FOR_QUERIES):
+            return self._build_execution_plan_with_current_ids(mf_query_request)
 
+    def _build_execution_plan_with_current_ids(
+        self, mf_query_request: MetricFlowQueryRequest
+    ) -> MetricFlowExplainResult:
         if mf_query_request.saved_query_name is not None:
             if mf_query_request.metrics or mf_query_request.metric_names:
                 raise InvalidQueryException("Metrics can't be specified with a saved query.")
@@ -505,27 +904,26 @@ class MetricFlowEngine(AbstractMetricFlowEngine):
                 dimension_specs=query_spec.dimension_specs,
                 time_dimension_specs=query_spec.time_dimension_specs,
             )
+        dataflow_plan_optimizations = mf_query_request.dataflow_plan_optimizations.union(
+            self._additional_dataflow_plan_optimizations
+        )
         if query_spec.metric_specs:
-            logger.info(
-                LazyFormat(
-                    "Building dataflow plan", dataflow_plan_optimizations=mf_query_request.dataflow_plan_optimizations
-                )
-            )
+            logger.info(LazyFormat("Building dataflow plan", dataflow_plan_optimizations=dataflow_plan_optimizations))
             dataflow_plan = self._dataflow_plan_builder.build_plan(
                 query_spec=query_spec,
                 output_selection_specs=output_selection_specs,
-                optimizations=mf_query_request.dataflow_plan_optimizations,
+                optimizations=dataflow_plan_optimizations,
             )
         else:
             logger.info(
                 LazyFormat(
                     "Building dataflow plan for distinct values",
-                    dataflow_plan_optimizations=mf_query_request.dataflow_plan_optimizations,
+                    dataflow_plan_optimizations=dataflow_plan_optimizations,
                 )
             )
 
             dataflow_plan = self._dataflow_plan_builder.build_plan_for_distinct_values(
-                query_spec=query_spec, optimizations=mf_query_request.dataflow_plan_optimizations
+                query_spec=query_spec, optimizations=dataflow_plan_optimizations
             )
 
         if len(dataflow_plan.sink_nodes) > 1:
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import json
+import logging
+import pathlib
+import threading
+from typing import Dict, List, Optional, Sequence
+
+from dbt_semantic_interfaces.protocols.semantic_model import SemanticModel
+from dbt_semantic_interfaces.references import SemanticModelReference
+from metricflow_semantics.mf_logging.lazy_formattable import LazyFormat
+from metricflow_semantics.mf_logging.runtime import log_block_runtime
+from metricflow_semantics.model.semantic_manifest_lookup import SemanticManifestLookup
+
+from metricflow.engine.file_helpers import write_file_atomically
+from metricflow.protocols.sql_client import SqlClient
+from metricflow.protocols.table_statistics import SemanticModelStatistics
+
+logger = logging.getLogger(__name__)
+
+# Version of the layout of the cache file. Files written with a different version are ignored.
+_CACHE_FILE_FORMAT_VERSION = 1
+
+
+class SqlTableStatisticsProvider:
+    """Collects statistics about the tables of semantic models by querying them through a `SqlClient`.
+
+    Collecting the statistics requires a scan of each table, so it's done in `collect()` instead of during planning.
+    If a cache file is specified, the statistics are loaded from it during initialization, and saved to it after they
+    are collected. Statistics in the file for a semantic model are ignored if the semantic model now reads from a
+    different table.
+    """
+
+    def __init__(
+        self,
+        sql_client: SqlClient,
+        semantic_manifest_lookup: SemanticManifestLookup,
+        cache_file_path: Optional[pathlib.Path] = None,
+    ) -> None:
+        """Initializer.
+
+        Args:
+            sql_client: The client used to query the tables.
+            semantic_manifest_lookup: Lookup for the semantic models to collect statistics for.
+            cache_file_path: If specified, the JSON file where the statistics are saved and loaded from.
+        """
+        self._sql_client = sql_client
+        self._semantic_manifest_lookup = semantic_manifest_lookup
+        self._cache_file_path = cache_file_path
+        self._lock = threading.Lock()
+        self._statistics: Dict[SemanticModelReference, SemanticModelStatistics] = {}
+        if cache_file_path is not None:
+            self._statistics.update(self._load_cache_file(cache_file_path))
+
+    def get_statistics(  # noqa: D102
+        self, semantic_model_reference: SemanticModelReference
+    ) -> Optional[SemanticModelStatistics]:
+        with self._lock:
+            return self._statistics.get(semantic_model_reference)
+
+    def collect(
+        self, semantic_model_references: Optional[Sequence[SemanticModelReference]] = None, refresh: bool = False
+    ) -> None:
+        """Query the tables of the semantic models to collect statistics, and save them to the cache file if specified.
+
+        Args:
+            semantic_model_references: The semantic models to collect statistics for. If not specified, all semantic
+            models in the manifest are used.
+            refresh: If false, semantic models that already have statistics are skipped.
+        """
+        semantic_models = [
+            semantic_model
+            for semantic_model in self._semantic_manifest_lookup.semantic_manifest.semantic_models
+            if semantic_model_references is None or semantic_model.reference in semantic_model_references
+        ]
+        for semantic_model in semantic_models:
+            if not refresh and self.get_statistics(semantic_model.reference) is not None:
+                continue
+            statistics = self._query_statistics(semantic_model)
+            with self._lock:
+                self._statistics[semantic_model.reference] = statistics
+
+        if self._cache_file_path is not None:
+            self._save_cache_file(self._cache_file_path)
+
+    def _query_statistics(self, semantic_model: SemanticModel) -> SemanticModelStatistics:
+        entities = semantic_model.entities
+        select_expressions = ["COUNT(*)"] + [f"COUNT(DISTINCT {entity.expr or entity.name})" for entity in entities]
+        stmt = f"SELECT {', '.join(select_expressions)} FROM {semantic_model.node_relation.relation_name}"
+        with log_block_runtime(f"Collecting statistics for semantic model {semantic_model.name!r}"):
+            data_table = self._sql_client.query(stmt)
+
+        # The columns are read by position as some engines change the case of the column names.
+        counts: List[int] = []
+        for column_index in range(data_table.column_count):
+            cell_value = data_table.get_cell_value(0, column_index)
+            if not isinstance(cell_value, (int, float)):
+                raise ValueError(
+                    f"Expected a count in column {column_index} of the statistics query for semantic model "
+                    f"{semantic_model.name!r}, but got: {cell_value!r}"
+                )
+            counts.append(int(cell_value))
+        return SemanticModelStatistics(
+            row_count=counts[0],
+            entity_distinct_value_counts={entity.name: count for entity, count in zip(entities, counts[1:])},
+        )
+
+    def _relation_name(self, semantic_model_reference: SemanticModelReference) -> Optional[str]:
+        semantic_model = self._semantic_manifest_lookup.semantic_model_lookup.get_by_reference(semantic_model_reference)
+        return semantic_model.node_relation.relation_name if semantic_model is not None else None
+
+    def _load_cache_file(self, cache_file_path: pathlib.Path) -> Dict[SemanticModelReference, SemanticModelStatistics]:
+        if not cache_file_path.exists():
+            return {}
+
+        try:
+            with open(cache_file_path) as f:
+                contents = json.load(f)
+            if contents["format_version"] != _CACHE_FILE_FORMAT_VERSION:
+                logger.warning(
+                    LazyFormat("Ignoring table statistics with a different format", file_path=str(cache_file_path))
+                )
+                return {}
+            statistics: Dict[SemanticModelReference, SemanticModelStatistics] = {}
+            for semantic_model_name, entry in contents["semantic_models"].items():
+                semantic_model_reference = SemanticModelReference(semantic_model_name)
+                if entry["relation_name"] != self._relation_name(semantic_model_reference):
+                    continue
+                statistics[semantic_model_reference] = SemanticModelStatistics(
+                    row_count=int(entry["row_count"]),
+                    entity_distinct_value_counts={
+                        entity_name: int(count) for entity_name, count in entry["entity_distinct_value_counts"].items()
+                    },
+                )
+            return statistics
+        except Exception:
+            logger.exception(LazyFormat("Unable to load table statistics", file_path=str(cache_file_path)))
+            return {}
+
+    def _save_cache_file(self, cache_file_path: pathlib.Path) -> None:
+        with self._lock:
+            contents = {
+                "format_version": _CACHE_FILE_FORMAT_VERSION,
+                "semantic_models": {
+                    semantic_model_reference.semantic_model_name: {
+                        "relation_name": self._relation_name(semantic_model_reference),
+                        "row_count": statistics.row_count,
+                        "entity_distinct_value_counts": dict(statistics.entity_distinct_value_counts),
+                    }
+                    for semantic_model_reference, statistics in sorted(
+                        self._statistics.items(), key=lambda item: item[0].semantic_model_name
+                    )
+                },
+            }
+
+        write_file_atomically(cache_file_path, json.dumps(contents, indent=2).encode())
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import logging
+import pathlib
+import pickle
+from dataclasses import dataclass
+from typing import Mapping, Optional, Tuple
+
+from dbt_semantic_interfaces.protocols.semantic_manifest import SemanticManifest
+from metricflow_semantics.mf_logging.lazy_formattable import LazyFormat
+from metricflow_semantics.mf_logging.runtime import log_block_runtime
+from metricflow_semantics.model.semantic_manifest_lookup import SemanticManifestLookup
+
+from metricflow.dataflow.builder.source_node import SourceNodeSet
+from metricflow.dataflow.dataflow_plan import DataflowPlanNode
+from metricflow.dataset.semantic_model_adapter import SemanticModelDataSet
+from metricflow.dataset.sql_dataset import SqlDataSet
+from metricflow.engine.cache import semantic_manifest_fingerprint
+from metricflow.engine.file_helpers import write_file_atomically
+
+logger = logging.getLogger(__name__)
+
+# Increment when the contents of the snapshot change so that existing snapshot files are not used.
+_SNAPSHOT_FORMAT_VERSION = 1
+
+
+@dataclass(frozen=True)
+class EngineSetupSnapshot:
+    """The artifacts that `MetricFlowEngine` computes from the semantic manifest during initialization.
+
+    Computing these can take a while for large manifests, so they can be saved to a file and loaded when the next
+    process starts. Files are named using a hash of the manifest contents, so a snapshot is only loaded for the same
+    manifest. Since the file is loaded using `pickle`, only load snapshots from a trusted location.
+
+    Attributes:
+        manifest_fingerprint: The hash of the semantic manifest that the artifacts were computed from.
+        semantic_manifest_lookup: The lookup for the semantic manifest, which includes the index of linkable elements.
+        source_data_sets: The data sets for the semantic models.
+        source_node_set: The source nodes used by the `DataflowPlanBuilder`.
+        node_to_output_data_set: The output data sets of the source nodes.
+    """
+
+    manifest_fingerprint: str
+    semantic_manifest_lookup: SemanticManifestLookup
+    source_data_sets: Tuple[SemanticModelDataSet, ...]
+    source_node_set: SourceNodeSet
+    node_to_output_data_set: Mapping[DataflowPlanNode, SqlDataSet]
+
+    @staticmethod
+    def snapshot_file_path(directory: pathlib.Path, manifest_fingerprint: str) -> pathlib.Path:
+        """Return the path of the snapshot file for a manifest with the given fingerprint."""
+        return directory / f"mf_engine_setup_v{_SNAPSHOT_FORMAT_VERSION}_{manifest_fingerprint}.pickle"
+
+    def save(self, directory: pathlib.Path) -> pathlib.Path:
+        """Write this to a file in the given directory and return the path of the file.
+
+        The file is replaced atomically, so a process loading the snapshot never sees a partially written file.
+        """
+        file_path = EngineSetupSnapshot.snapshot_file_path(directory, self.manifest_fingerprint)
+        with log_block_runtime(f"Saving engine setup snapshot to {str(file_path)!r}"):
+            write_file_atomically(file_path, pickle.dumps(self, protocol=pickle.HIGHEST_PROTOCOL))
+        return file_path
+
+    @staticmethod
+    def load(directory: pathlib.Path, semantic_manifest: SemanticManifest) -> Optional[EngineSetupSnapshot]:
+        """Load the snapshot for the given manifest from the directory.
+
+        Returns None if there is no snapshot for the manifest, or if the snapshot could not be loaded.
+        """
+        manifest_fingerprint = semantic_manifest_fingerprint(semantic_manifest)
+        file_path = EngineSetupSnapshot.snapshot_file_path(directory, manifest_fingerprint)
+        if not file_path.exists():
+            logger.info(LazyFormat("Engine setup snapshot not found", file_path=str(file_path)))
+            return None
+
+        try:
+            with log_block_runtime(f"Loading engine setup snapshot from {str(file_path)!r}"):
+                with open(file_path, "rb") as f:
+                    snapshot = pickle.load(f)
+        except Exception:
+            logger.exception(LazyFormat("Unable to load the engine setup snapshot", file_path=str(file_path)))
+            return None
+
+        if not isinstance(snapshot, EngineSetupSnapshot) or snapshot.manifest_fingerprint != manifest_fingerprint:
+            logger.warning(
+                LazyFormat("Ignoring engine setup snapshot as it's for a different manifest", file_path=str(file_path))
+            )
+            return None
+
+        return snapshot
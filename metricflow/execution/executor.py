@@ -2,8 +2,9 @@ from __future__ import annotations
 
 import logging
 from abc import ABC, abstractmethod
-from collections import OrderedDict
-from typing import Dict
+from collections import OrderedDict, deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Deque, Dict, List, Optional, Set
 
 from metricflow_semantics.dag.mf_dag import NodeId
 from metricflow_semantics.mf_logging.lazy_formattable import LazyFormat
@@ -87,3 +88,107 @@ class SequentialPlanExecutor(ExecutionPlanExecutor):
             self._execute_dfs(leaf_node, results)
 
         return results
+
+
+class ParallelPlanExecutor(ExecutionPlanExecutor):
+    """Execute tasks using a pool of threads, starting each task once all of its parent tasks have finished.
+
+    If a task returns errors or raises an exception, tasks that have not started are not run, and tasks that are
+    running are allowed to finish as they can't be interrupted. As with `SequentialPlanExecutor`, errors are included
+    in the results and exceptions are raised to the caller.
+    """
+
+    def __init__(self, max_workers: int = 8) -> None:
+        """Initializer.
+
+        Args:
+            max_workers: The maximum number of tasks to run at the same time.
+        """
+        if max_workers < 1:
+            raise ValueError(f"max_workers should be >= 1. Got: {max_workers}")
+        self._max_workers = max_workers
+
+    @staticmethod
+    def _all_tasks(plan: ExecutionPlan) -> Dict[NodeId, ExecutionPlanTask]:
+        """Return all tasks in the plan, keyed by the task ID. Tasks that are shared by multiple children appear once."""
+        task_id_to_task: Dict[NodeId, ExecutionPlanTask] = {}
+        tasks_to_visit: List[ExecutionPlanTask] = list(plan.sink_nodes)
+        while len(tasks_to_visit) > 0:
+            task = tasks_to_visit.pop()
+            if task.task_id in task_id_to_task:
+                continue
+            task_id_to_task[task.task_id] = task
+            # Reversed so that parent tasks are visited (and started) in the listed order.
+            tasks_to_visit.extend(reversed(task.parent_nodes))
+        return task_id_to_task
+
+    @staticmethod
+    def _execute_task(task: ExecutionPlanTask) -> TaskExecutionResult:
+        logger.debug(LazyFormat(lambda: f"Started task ID: {task.node_id}"))
+        result = task.execute()
+        runtime = f"{result.end_time - result.start_time:.2f}s"
+        if result.errors:
+            logger.debug(
+                LazyFormat(lambda: f"Finished task ID: {task.node_id} with errors: {result.errors} in {runtime}")
+            )
+        else:
+            logger.debug(LazyFormat(lambda: f"Finished task ID: {task.node_id} successfully in {runtime}"))
+        return result
+
+    def execute_plan(self, plan: ExecutionPlan) -> ExecutionResults:  # noqa: D102
+        results = ExecutionResults()
+        task_id_to_task = ParallelPlanExecutor._all_tasks(plan)
+
+        # For each task, the IDs of the parent tasks that have not finished yet.
+        task_id_to_unfinished_parent_ids: Dict[NodeId, Set[NodeId]] = {
+            task_id: {parent_task.task_id for parent_task in task.parent_nodes}
+            for task_id, task in task_id_to_task.items()
+        }
+        task_id_to_child_ids: Dict[NodeId, List[NodeId]] = {task_id: [] for task_id in task_id_to_task}
+        for task_id, task in task_id_to_task.items():
+            for parent_task in task.parent_nodes:
+                task_id_to_child_ids[parent_task.task_id].append(task_id)
+
+        # Tasks are only submitted when there's an idle worker so that queued tasks can be skipped if a task fails.
+        ready_task_ids: Deque[NodeId] = deque(
+            task_id for task_id, parent_ids in task_id_to_unfinished_parent_ids.items() if len(parent_ids) == 0
+        )
+        failed = False
+        exception: Optional[BaseException] = None
+        with ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix="mf_task") as thread_pool:
+            future_to_task_id: Dict[Future[TaskExecutionResult], NodeId] = {}
+            while True:
+                while not failed and len(ready_task_ids) > 0 and len(future_to_task_id) < self._max_workers:
+                    task_id = ready_task_ids.popleft()
+                    future = thread_pool.submit(ParallelPlanExecutor._execute_task, task_id_to_task[task_id])
+                    future_to_task_id[future] = task_id
+
+                if len(future_to_task_id) == 0:
+                    break
+
+                done_futures, _ = wait(future_to_task_id, return_when=FIRST_COMPLETED)
+                for future in done_futures:
+                    task_id = future_to_task_id.pop(future)
+                    future_exception = future.exception()
+                    if future_exception is not None:
+                        logger.debug(LazyFormat(lambda: f"Task ID: {task_id} exited unexpectedly"))
+                        exception = exception or future_exception
+                        failed = True
+                        continue
+
+                    result = future.result()
+                    results.add_result(task_id, result)
+                    if result.errors:
+                        failed = True
+                        continue
+
+                    for child_id in task_id_to_child_ids[task_id]:
+                        unfinished_parent_ids = task_id_to_unfinished_parent_ids[child_id]
+                        unfinished_parent_ids.discard(task_id)
+                        if len(unfinished_parent_ids) == 0:
+                            ready_task_ids.append(child_id)
+
+        if exception is not None:
+            raise exception
+
+        return results
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
+import copy
 import datetime as dt
 import logging
 from collections import OrderedDict
-from typing import List, Optional, Sequence, Set, Tuple, Union
+from typing import Dict, List, Optional, Sequence, Set, Tuple, Union
 
 from dbt_semantic_interfaces.enum_extension import assert_values_exhausted
 from dbt_semantic_interfaces.naming.keywords import METRIC_TIME_ELEMENT_NAME
@@ -15,7 +16,7 @@ from dbt_semantic_interfaces.type_enums.period_agg import PeriodAggregation
 from dbt_semantic_interfaces.validations.unique_valid_name import MetricFlowReservedKeywords
 from metricflow_semantics.aggregation_properties import AggregationState
 from metricflow_semantics.dag.id_prefix import StaticIdPrefix
-from metricflow_semantics.dag.mf_dag import DagId
+from metricflow_semantics.dag.mf_dag import DagId, NodeId
 from metricflow_semantics.dag.sequential_id import SequentialIdGenerator
 from metricflow_semantics.filters.time_constraint import TimeRangeConstraint
 from metricflow_semantics.instances import (
@@ -104,6 +105,7 @@ from metricflow.plan_conversion.sql_join_builder import (
     ColumnEqualityDescription,
     SqlQueryPlanJoinBuilder,
 )
+from metricflow.plan_conversion.sql_literal_parameterizer import SqlLiteralParameterizer
 from metricflow.protocols.sql_client import SqlEngine
 from metricflow.sql.optimizer.optimization_levels import (
     SqlQueryOptimizationLevel,
@@ -146,12 +148,29 @@ logger = logging.getLogger(__name__)
 
 
 def _make_time_range_comparison_expr(
-    table_alias: str, column_alias: str, time_range_constraint: TimeRangeConstraint
+    table_alias: str,
+    column_alias: str,
+    time_range_constraint: TimeRangeConstraint,
+    literal_parameterizer: Optional[SqlLiteralParameterizer] = None,
 ) -> SqlExpressionNode:
     """Build an expression like "ds BETWEEN CAST('2020-01-01' AS TIMESTAMP) AND CAST('2020-01-02' AS TIMESTAMP).
 
     If the constraint uses day or larger grain, only render to the date level. Otherwise, render to the timestamp level.
+    If `literal_parameterizer` is set, the start and end times are bind parameters instead.
     """
+    column_arg = SqlColumnReferenceExpression.create(
+        SqlColumnReference(table_alias=table_alias, column_name=column_alias)
+    )
+    if literal_parameterizer is not None:
+        return SqlBetweenExpression.create(
+            column_arg=column_arg,
+            start_expr=literal_parameterizer.create_bind_parameter_expr(
+                key=f"{table_alias}__start_time", value=time_range_constraint.start_time
+            ),
+            end_expr=literal_parameterizer.create_bind_parameter_expr(
+                key=f"{table_alias}__end_time", value=time_range_constraint.end_time
+            ),
+        )
 
     def strip_time_from_dt(ts: dt.datetime) -> dt.datetime:
         date_obj = ts.date()
@@ -166,9 +185,7 @@ def _make_time_range_comparison_expr(
     time_format_to_render = ISO8601_PYTHON_FORMAT if constraint_uses_day_or_larger_grain else ISO8601_PYTHON_TS_FORMAT
 
     return SqlBetweenExpression.create(
-        column_arg=SqlColumnReferenceExpression.create(
-            SqlColumnReference(table_alias=table_alias, column_name=column_alias)
-        ),
+        column_arg=column_arg,
         start_expr=SqlStringLiteralExpression.create(
             literal_value=time_range_constraint.start_time.strftime(time_format_to_render),
         ),
@@ -185,6 +202,8 @@ class DataflowToSqlQueryPlanConverter(DataflowPlanNodeVisitor[SqlDataSet]):
         self,
         column_association_resolver: ColumnAssociationResolver,
         semantic_manifest_lookup: SemanticManifestLookup,
+        literal_parameterizer: Optional[SqlLiteralParameterizer] = None,
+        reuse_sql_for_shared_nodes: bool = False,
     ) -> None:
         """Constructor.
 
@@ -192,8 +211,17 @@ class DataflowToSqlQueryPlanConverter(DataflowPlanNodeVisitor[SqlDataSet]):
             column_association_resolver: controls how columns for instances are generated and used between nested
             queries.
             semantic_manifest_lookup: Self-explanatory.
+            literal_parameterizer: If set, literals in where filters and time range constraints are rendered as bind
+            parameters.
+            reuse_sql_for_shared_nodes: If set, a node that is the parent of multiple nodes in the dataflow plan is only
+            converted once, so the SQL query plan has the same sub-query in each place that it's used. This allows the
+            sub-query to be rendered once as a common table expression.
         """
         self._column_association_resolver = column_association_resolver
+        self._reuse_sql_for_shared_nodes = reuse_sql_for_shared_nodes
+        # Set in the copy of this that's used for a conversion when reusing the SQL for shared nodes.
+        self._node_id_to_data_set: Optional[Dict[NodeId, SqlDataSet]] = None
+        self._literal_parameterizer = literal_parameterizer
         self._semantic_manifest_lookup = semantic_manifest_lookup
         self._metric_lookup = semantic_manifest_lookup.metric_lookup
         self._semantic_model_lookup = semantic_manifest_lookup.semantic_model_lookup
@@ -216,7 +244,13 @@ class DataflowToSqlQueryPlanConverter(DataflowPlanNodeVisitor[SqlDataSet]):
         sql_query_plan_id: Optional[DagId] = None,
     ) -> ConvertToSqlPlanResult:
         """Create an SQL query plan that represents the computation up to the given dataflow plan node."""
-        data_set = dataflow_plan_node.accept(self)
+        if self._reuse_sql_for_shared_nodes:
+            # The converted nodes are tracked in a copy so that this converter can be used concurrently.
+            converter = copy.copy(self)
+            converter._node_id_to_data_set = {}
+            data_set = converter._convert_node(dataflow_plan_node)
+        else:
+            data_set = dataflow_plan_node.accept(self)
         sql_node: SqlQueryPlanNode = data_set.sql_node
         # TODO: Make this a more generally accessible attribute instead of checking against the
         # BigQuery-ness of the engine
@@ -239,6 +273,17 @@ class DataflowToSqlQueryPlanConverter(DataflowPlanNodeVisitor[SqlDataSet]):
             sql_plan=SqlQueryPlan(render_node=sql_node, plan_id=sql_query_plan_id),
         )
 
+    def _convert_node(self, node: DataflowPlanNode) -> SqlDataSet:
+        """Return the data set for the given node, reusing the one from a previous conversion if enabled."""
+        if self._node_id_to_data_set is None:
+            return node.accept(self)
+
+        data_set = self._node_id_to_data_set.get(node.node_id)
+        if data_set is None:
+            data_set = node.accept(self)
+            self._node_id_to_data_set[node.node_id] = data_set
+        return data_set
+
     def _next_unique_table_alias(self) -> str:
         """Return the next unique table alias to use in generating queries."""
         return SequentialIdGenerator.create_next_id(StaticIdPrefix.SUB_QUERY).str_value
@@ -299,6 +344,7 @@ class DataflowToSqlQueryPlanConverter(DataflowPlanNodeVisitor[SqlDataSet]):
                         table_alias=time_spine_table_alias,
                         column_alias=time_spine_source.base_column,
                         time_range_constraint=time_range_constraint,
+                        literal_parameterizer=self._literal_parameterizer,
                     )
                     if time_range_constraint
                     else None
@@ -317,7 +363,7 @@ class DataflowToSqlQueryPlanConverter(DataflowPlanNodeVisitor[SqlDataSet]):
     def visit_join_over_time_range_node(self, node: JoinOverTimeRangeNode) -> SqlDataSet:
         """Generate time range join SQL."""
         table_alias_to_instance_set: OrderedDict[str, InstanceSet] = OrderedDict()
-        input_data_set = node.parent_node.accept(self)
+        input_data_set = self._convert_node(node.parent_node)
         input_data_set_alias = self._next_unique_table_alias()
 
         # Find requested agg_time_dimensions in parent instance set.
@@ -396,7 +442,7 @@ class DataflowToSqlQueryPlanConverter(DataflowPlanNodeVisitor[SqlDataSet]):
 
         # Convert the dataflow from the left node to a DataSet and add context for it to table_alias_to_instance_set
         # A DataSet is a bundle of the SQL query (in object form) and the MDO instances that the SQL query contains.
-        from_data_set = node.left_node.accept(self)
+        from_data_set = self._convert_node(node.left_node)
         from_data_set_alias = self._next_unique_table_alias()
         table_alias_to_instance_set[from_data_set_alias] = from_data_set.instance_set
 
@@ -410,7 +456,7 @@ class DataflowToSqlQueryPlanConverter(DataflowPlanNodeVisitor[SqlDataSet]):
             join_on_entity = join_description.join_on_entity
 
             right_node_to_join: DataflowPlanNode = join_description.join_node
-            right_data_set: SqlDataSet = right_node_to_join.accept(self)
+            right_data_set: SqlDataSet = self._convert_node(right_node_to_join)
             right_data_set_alias = self._next_unique_table_alias()
 
             sql_join_desc = SqlQueryPlanJoinBuilder.make_base_output_join_description(
@@ -493,7 +539,7 @@ class DataflowToSqlQueryPlanConverter(DataflowPlanNodeVisitor[SqlDataSet]):
 
         """
         # Get the data from the parent, and change measure instances to the aggregated state.
-        from_data_set: SqlDataSet = node.parent_node.accept(self)
+        from_data_set: SqlDataSet = self._convert_node(node.parent_node)
         aggregated_instance_set = from_data_set.instance_set.transform(
             ChangeMeasureAggregationState(
                 {
@@ -554,7 +600,7 @@ class DataflowToSqlQueryPlanConverter(DataflowPlanNodeVisitor[SqlDataSet]):
 
     def visit_compute_metrics_node(self, node: ComputeMetricsNode) -> SqlDataSet:
         """Generates the query that realizes the behavior of ComputeMetricsNode."""
-        from_data_set: SqlDataSet = node.parent_node.accept(self)
+        from_data_set: SqlDataSet = self._convert_node(node.parent_node)
         from_data_set_alias = self._next_unique_table_alias()
 
         # TODO: Check that all measures for the metrics are in the input instance set
@@ -746,7 +792,7 @@ class DataflowToSqlQueryPlanConverter(DataflowPlanNodeVisitor[SqlDataSet]):
         return metric_expr
 
     def visit_order_by_limit_node(self, node: OrderByLimitNode) -> SqlDataSet:  # noqa: D102
-        from_data_set: SqlDataSet = node.parent_node.accept(self)
+        from_data_set: SqlDataSet = self._convert_node(node.parent_node)
         output_instance_set = from_data_set.instance_set
         from_data_set_alias = self._next_unique_table_alias()
 
@@ -786,10 +832,10 @@ class DataflowToSqlQueryPlanConverter(DataflowPlanNodeVisitor[SqlDataSet]):
 
     def visit_write_to_result_data_table_node(self, node: WriteToResultDataTableNode) -> SqlDataSet:  # noqa: D102
         # Returning the parent-node SQL as an approximation since you can't write to a data_table via SQL.
-        return node.parent_node.accept(self)
+        return self._convert_node(node.parent_node)
 
     def visit_write_to_result_table_node(self, node: WriteToResultTableNode) -> SqlDataSet:  # noqa: D102
-        input_data_set: SqlDataSet = node.parent_node.accept(self)
+        input_data_set: SqlDataSet = self._convert_node(node.parent_node)
         input_instance_set: InstanceSet = input_data_set.instance_set
         return SqlDataSet(
             instance_set=input_instance_set,
@@ -801,7 +847,7 @@ class DataflowToSqlQueryPlanConverter(DataflowPlanNodeVisitor[SqlDataSet]):
 
     def visit_filter_elements_node(self, node: FilterElementsNode) -> SqlDataSet:
         """Generates the query that realizes the behavior of FilterElementsNode."""
-        from_data_set: SqlDataSet = node.parent_node.accept(self)
+        from_data_set: SqlDataSet = self._convert_node(node.parent_node)
         output_instance_set = from_data_set.instance_set.transform(FilterElements(node.include_specs))
         from_data_set_alias = self._next_unique_table_alias()
 
@@ -828,7 +874,7 @@ class DataflowToSqlQueryPlanConverter(DataflowPlanNodeVisitor[SqlDataSet]):
 
     def visit_where_constraint_node(self, node: WhereConstraintNode) -> SqlDataSet:
         """Adds where clause to SQL statement from parent node."""
-        parent_data_set: SqlDataSet = node.parent_node.accept(self)
+        parent_data_set: SqlDataSet = self._convert_node(node.parent_node)
         # Since we're copying the instance set from the parent to conveniently generate the output instance set for this
         # node, we'll need to change the column names.
         output_instance_set = parent_data_set.instance_set.transform(
@@ -840,6 +886,14 @@ class DataflowToSqlQueryPlanConverter(DataflowPlanNodeVisitor[SqlDataSet]):
             column_association_resolver=self._column_association_resolver
         ).transform(spec_set=InstanceSpecSet.create_from_specs(node.where.linkable_specs))
 
+        where_sql = node.where.where_sql
+        where_bind_parameters = node.where.bind_parameters
+        if self._literal_parameterizer is not None:
+            where_sql, literal_bind_parameters = self._literal_parameterizer.parameterize_where_sql(
+                where_sql=where_sql, key_prefix=from_data_set_alias
+            )
+            where_bind_parameters = where_bind_parameters.combine(literal_bind_parameters)
+
         return SqlDataSet(
             instance_set=output_instance_set,
             sql_select_node=SqlSelectStatementNode.create(
@@ -851,11 +905,11 @@ class DataflowToSqlQueryPlanConverter(DataflowPlanNodeVisitor[SqlDataSet]):
                 from_source=parent_data_set.checked_sql_select_node,
                 from_source_alias=from_data_set_alias,
                 where=SqlStringExpression.create(
-                    sql_expr=node.where.where_sql,
+                    sql_expr=where_sql,
                     used_columns=tuple(
                         column_association.column_name for column_association in column_associations_in_where_sql
                     ),
-                    bind_parameters=node.where.bind_parameters,
+                    bind_parameters=where_bind_parameters,
                 ),
             ),
         )
@@ -899,7 +953,7 @@ class DataflowToSqlQueryPlanConverter(DataflowPlanNodeVisitor[SqlDataSet]):
         table_alias_to_instance_set: OrderedDict[str, InstanceSet] = OrderedDict()
 
         for parent_node in node.parent_nodes:
-            parent_sql_data_set = parent_node.accept(self)
+            parent_sql_data_set = self._convert_node(parent_node)
             table_alias = self._next_unique_table_alias()
             parent_data_sets.append(AnnotatedSqlDataSet(data_set=parent_sql_data_set, alias=table_alias))
             table_alias_to_instance_set[table_alias] = parent_sql_data_set.instance_set
@@ -990,7 +1044,7 @@ class DataflowToSqlQueryPlanConverter(DataflowPlanNodeVisitor[SqlDataSet]):
         Since time range constraints are always bound by a range of standard date/time values, this conversion
         cannot use custom granularities.
         """
-        from_data_set: SqlDataSet = node.parent_node.accept(self)
+        from_data_set: SqlDataSet = self._convert_node(node.parent_node)
         from_data_set_alias = self._next_unique_table_alias()
 
         time_dimension_instances_for_metric_time = sorted(
@@ -1013,6 +1067,7 @@ class DataflowToSqlQueryPlanConverter(DataflowPlanNodeVisitor[SqlDataSet]):
             table_alias=from_data_set_alias,
             column_alias=time_dimension_instance_for_metric_time.associated_column.column_name,
             time_range_constraint=node.time_range_constraint,
+            literal_parameterizer=self._literal_parameterizer,
         )
 
         output_instance_set = from_data_set.instance_set
@@ -1041,7 +1096,7 @@ class DataflowToSqlQueryPlanConverter(DataflowPlanNodeVisitor[SqlDataSet]):
         matching the one defined in the node will be passed. In addition, an additional time dimension instance for
         "metric time" will be included. See DataSet.metric_time_dimension_reference().
         """
-        input_data_set: SqlDataSet = node.parent_node.accept(self)
+        input_data_set: SqlDataSet = self._convert_node(node.parent_node)
 
         # Find which measures have an aggregation time dimension that is the same as the one specified in the node.
         # Only these measures will be in the output data set.
@@ -1129,7 +1184,7 @@ class DataflowToSqlQueryPlanConverter(DataflowPlanNodeVisitor[SqlDataSet]):
         specified dimension that is non-additive. Then that dataset would be joined with the input data
         on that dimension along with grouping by entities that are also passed in.
         """
-        from_data_set: SqlDataSet = node.parent_node.accept(self)
+        from_data_set: SqlDataSet = self._convert_node(node.parent_node)
 
         from_data_set_alias = self._next_unique_table_alias()
 
@@ -1239,7 +1294,7 @@ class DataflowToSqlQueryPlanConverter(DataflowPlanNodeVisitor[SqlDataSet]):
 
     # TODO: write tests for custom granularities that hit this node
     def visit_join_to_time_spine_node(self, node: JoinToTimeSpineNode) -> SqlDataSet:  # noqa: D102
-        parent_data_set = node.parent_node.accept(self)
+        parent_data_set = self._convert_node(node.parent_node)
         parent_alias = self._next_unique_table_alias()
 
         if node.use_custom_agg_time_dimension:
@@ -1432,7 +1487,7 @@ class DataflowToSqlQueryPlanConverter(DataflowPlanNodeVisitor[SqlDataSet]):
         )
 
     def visit_join_to_custom_granularity_node(self, node: JoinToCustomGranularityNode) -> SqlDataSet:  # noqa: D102
-        parent_data_set = node.parent_node.accept(self)
+        parent_data_set = self._convert_node(node.parent_node)
 
         # New dataset will be joined to parent dataset without a subquery, so use the same FROM alias as the parent node.
         parent_alias = parent_data_set.checked_sql_select_node.from_source_alias
@@ -1508,7 +1563,7 @@ class DataflowToSqlQueryPlanConverter(DataflowPlanNodeVisitor[SqlDataSet]):
         )
 
     def visit_min_max_node(self, node: MinMaxNode) -> SqlDataSet:  # noqa: D102
-        parent_data_set = node.parent_node.accept(self)
+        parent_data_set = self._convert_node(node.parent_node)
         parent_table_alias = self._next_unique_table_alias()
         assert (
             len(parent_data_set.checked_sql_select_node.select_columns) == 1
@@ -1551,7 +1606,7 @@ class DataflowToSqlQueryPlanConverter(DataflowPlanNodeVisitor[SqlDataSet]):
         Builds a new dataset that is the same as the output dataset, but with an additional column
         that contains a randomly generated UUID.
         """
-        input_data_set: SqlDataSet = node.parent_node.accept(self)
+        input_data_set: SqlDataSet = self._convert_node(node.parent_node)
         input_data_set_alias = self._next_unique_table_alias()
 
         gen_uuid_spec = MetadataSpec(MetricFlowReservedKeywords.MF_INTERNAL_UUID.value)
@@ -1593,10 +1648,10 @@ class DataflowToSqlQueryPlanConverter(DataflowPlanNodeVisitor[SqlDataSet]):
         successful conversion. Duplication may exist in the result due to a single base event
         being able to link to multiple conversion events.
         """
-        base_data_set: SqlDataSet = node.base_node.accept(self)
+        base_data_set: SqlDataSet = self._convert_node(node.base_node)
         base_data_set_alias = self._next_unique_table_alias()
 
-        conversion_data_set: SqlDataSet = node.conversion_node.accept(self)
+        conversion_data_set: SqlDataSet = self._convert_node(node.conversion_node)
         conversion_data_set_alias = self._next_unique_table_alias()
 
         base_time_dimension_column_name = self._column_association_resolver.resolve_spec(
@@ -1745,7 +1800,7 @@ class DataflowToSqlQueryPlanConverter(DataflowPlanNodeVisitor[SqlDataSet]):
         )
 
     def visit_window_reaggregation_node(self, node: WindowReaggregationNode) -> SqlDataSet:  # noqa: D102
-        from_data_set = node.parent_node.accept(self)
+        from_data_set = self._convert_node(node.parent_node)
         parent_instance_set = from_data_set.instance_set  # remove order by col
         parent_data_set_alias = self._next_unique_table_alias()
 
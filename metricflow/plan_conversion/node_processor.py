@@ -2,11 +2,13 @@ from __future__ import annotations
 
 import dataclasses
 import logging
+from collections import defaultdict
 from enum import Enum
-from typing import Dict, FrozenSet, List, Optional, Sequence, Set
+from typing import Dict, FrozenSet, List, Mapping, Optional, Sequence, Set, Tuple
 
 from dbt_semantic_interfaces.enum_extension import assert_values_exhausted
 from dbt_semantic_interfaces.references import EntityReference, SemanticModelReference, TimeDimensionReference
+from metricflow_semantics.dag.mf_dag import NodeId
 from metricflow_semantics.filters.time_constraint import TimeRangeConstraint
 from metricflow_semantics.mf_logging.lazy_formattable import LazyFormat
 from metricflow_semantics.mf_logging.pretty_print import mf_pformat
@@ -66,6 +68,29 @@ class MultiHopJoinCandidate:
     lineage: MultiHopJoinCandidateLineage
 
 
+@dataclasses.dataclass(frozen=True)
+class PrecomputedMultiHopJoinCandidates:
+    """Multi-hop join candidates that were built ahead of time for a set of nodes, so that they can be shared by queries.
+
+    Building the candidates for each query creates new join nodes and resolves their output data sets, which is slow
+    when there are many semantic models. The candidates only depend on the manifest, the nodes, and the join type,
+    so they can be built once using `PreJoinNodeProcessor.precompute_multi_hop_join_candidates`.
+
+    Attributes:
+        join_type: The join type used in the candidate nodes.
+        node_ids: The IDs of the nodes that the candidates were built from.
+        join_entity_to_candidates: Maps the entity used to join the second node to the candidates that join on it.
+    """
+
+    join_type: SqlJoinType
+    node_ids: FrozenSet[NodeId]
+    join_entity_to_candidates: Mapping[EntityReference, Tuple[MultiHopJoinCandidate, ...]]
+
+    def covers(self, nodes: Sequence[DataflowPlanNode], join_type: SqlJoinType) -> bool:
+        """Returns true if the candidates can be used for multi-hop joins between the given nodes."""
+        return join_type is self.join_type and all(node.node_id in self.node_ids for node in nodes)
+
+
 class PredicateInputType(Enum):
     """Enumeration of predicate input types we may encounter in where filters.
 
@@ -327,12 +352,22 @@ class PreJoinNodeProcessor:
 
     """
 
-    def __init__(  # noqa: D107
+    def __init__(
         self,
         semantic_model_lookup: SemanticModelLookup,
         node_data_set_resolver: DataflowPlanNodeOutputDataSetResolver,
+        precomputed_multi_hop_join_candidates: Sequence[PrecomputedMultiHopJoinCandidates] = (),
     ):
+        """Initializer.
+
+        Args:
+            semantic_model_lookup: Lookup for the semantic models in the manifest.
+            node_data_set_resolver: Resolves the output data sets of nodes.
+            precomputed_multi_hop_join_candidates: If the nodes given to `add_multi_hop_joins` are covered by one of
+            these, the candidates in it are used instead of building new ones.
+        """
         self._node_data_set_resolver = node_data_set_resolver
+        self._precomputed_multi_hop_join_candidates = tuple(precomputed_multi_hop_join_candidates)
         self._partition_resolver = PartitionJoinResolver(semantic_model_lookup)
         self._semantic_model_lookup = semantic_model_lookup
         self._join_evaluator = JoinDataflowOutputValidator(semantic_model_lookup)
@@ -463,6 +498,155 @@ class PreJoinNodeProcessor:
 
         return False
 
+    def _create_multi_hop_join_candidate(
+        self,
+        first_node: DataflowPlanNode,
+        second_node: DataflowPlanNode,
+        join_entity_reference: EntityReference,
+        join_type: SqlJoinType,
+    ) -> Optional[MultiHopJoinCandidate]:
+        """Create a candidate that joins the second node to the first node on the entity, if the join is valid."""
+        # Avoid loops between the same semantic models.
+        if second_node.node_id == first_node.node_id:
+            return None
+
+        data_set_of_first_node = self._node_data_set_resolver.get_output_data_set(first_node)
+        data_set_of_second_node = self._node_data_set_resolver.get_output_data_set(second_node)
+        if not self._join_evaluator.is_valid_instance_set_join(
+            left_instance_set=data_set_of_first_node.instance_set,
+            right_instance_set=data_set_of_second_node.instance_set,
+            on_entity_reference=join_entity_reference,
+            right_node_is_aggregated_to_entity=second_node.aggregated_to_elements == {join_entity_reference},
+        ):
+            return None
+
+        # filter measures out of joinable_node
+        specs = data_set_of_second_node.instance_set.spec_set
+        filtered_joinable_node = FilterElementsNode.create(
+            parent_node=second_node,
+            include_specs=group_specs_by_type(
+                specs.dimension_specs + specs.entity_specs + specs.time_dimension_specs + specs.group_by_metric_specs
+            ),
+        )
+
+        join_on_partition_dimensions = self._partition_resolver.resolve_partition_dimension_joins(
+            left_node_spec_set=data_set_of_first_node.instance_set.spec_set,
+            node_to_join_spec_set=data_set_of_second_node.instance_set.spec_set,
+        )
+        join_on_partition_time_dimensions = self._partition_resolver.resolve_partition_time_dimension_joins(
+            left_node_spec_set=data_set_of_first_node.instance_set.spec_set,
+            node_to_join_spec_set=data_set_of_second_node.instance_set.spec_set,
+        )
+
+        return MultiHopJoinCandidate(
+            node_with_multi_hop_elements=JoinOnEntitiesNode.create(
+                left_node=first_node,
+                join_targets=[
+                    JoinDescription(
+                        join_node=filtered_joinable_node,
+                        join_on_entity=LinklessEntitySpec.from_reference(join_entity_reference),
+                        join_on_partition_dimensions=join_on_partition_dimensions,
+                        join_on_partition_time_dimensions=join_on_partition_time_dimensions,
+                        join_type=join_type,
+                    )
+                ],
+            ),
+            lineage=MultiHopJoinCandidateLineage(
+                first_node_to_join=first_node,
+                second_node_to_join=second_node,
+                join_second_node_by_entity=LinklessEntitySpec.from_reference(join_entity_reference),
+            ),
+        )
+
+    def _node_contains_element_name(self, node: DataflowPlanNode, element_name: str) -> bool:
+        element_names_in_data_set = ToElementNameSet().transform(
+            self._node_data_set_resolver.get_output_data_set(node).instance_set.spec_set
+        )
+        return element_name in element_names_in_data_set
+
+    def precompute_multi_hop_join_candidates(
+        self, nodes: Sequence[DataflowPlanNode], join_type: SqlJoinType
+    ) -> PrecomputedMultiHopJoinCandidates:
+        """Build the candidates for all two-hop joins between the given nodes, and resolve their output data sets.
+
+        For each entity, a candidate is built for each valid join of a node that contains the entity to another node
+        that contains the entity.
+        """
+        entity_to_nodes: Dict[EntityReference, List[DataflowPlanNode]] = defaultdict(list)
+        for node in nodes:
+            entity_references = {
+                entity_instance.spec.reference
+                for entity_instance in self._node_data_set_resolver.get_output_data_set(
+                    node
+                ).instance_set.entity_instances
+            }
+            for entity_reference in sorted(entity_references, key=lambda reference: reference.element_name):
+                if self._node_contains_entity(node=node, entity_reference=entity_reference):
+                    entity_to_nodes[entity_reference].append(node)
+
+        join_entity_to_candidates: Dict[EntityReference, Tuple[MultiHopJoinCandidate, ...]] = {}
+        for entity_reference, nodes_with_entity in entity_to_nodes.items():
+            candidates: List[MultiHopJoinCandidate] = []
+            for first_node in nodes_with_entity:
+                for second_node in nodes_with_entity:
+                    candidate = self._create_multi_hop_join_candidate(
+                        first_node=first_node,
+                        second_node=second_node,
+                        join_entity_reference=entity_reference,
+                        join_type=join_type,
+                    )
+                    if candidate is not None:
+                        candidates.append(candidate)
+            join_entity_to_candidates[entity_reference] = tuple(candidates)
+
+        candidate_nodes = tuple(
+            candidate.node_with_multi_hop_elements
+            for candidates in join_entity_to_candidates.values()
+            for candidate in candidates
+        )
+        self._node_data_set_resolver.cache_output_data_sets(candidate_nodes)
+        logger.debug(
+            LazyFormat(
+                lambda: f"Precomputed {len(candidate_nodes)} multi-hop join candidates for {len(nodes)} nodes",
+                join_type=join_type,
+            )
+        )
+        return PrecomputedMultiHopJoinCandidates(
+            join_type=join_type,
+            node_ids=frozenset(node.node_id for node in nodes),
+            join_entity_to_candidates=join_entity_to_candidates,
+        )
+
+    def _get_precomputed_candidates_nodes_for_multi_hop(
+        self,
+        desired_linkable_spec: LinkableInstanceSpec,
+        nodes: Sequence[DataflowPlanNode],
+        precomputed_candidates: PrecomputedMultiHopJoinCandidates,
+    ) -> Sequence[MultiHopJoinCandidate]:
+        """Select the precomputed candidates for the spec, in the same order as `_get_candidates_nodes_for_multi_hop`."""
+        node_id_to_position = {node.node_id: position for position, node in enumerate(nodes)}
+        multi_hop_join_candidates = [
+            candidate
+            for candidate in precomputed_candidates.join_entity_to_candidates.get(
+                desired_linkable_spec.entity_links[1], ()
+            )
+            if candidate.lineage.first_node_to_join.node_id in node_id_to_position
+            and candidate.lineage.second_node_to_join.node_id in node_id_to_position
+            and self._node_contains_entity(
+                node=candidate.lineage.first_node_to_join, entity_reference=desired_linkable_spec.entity_links[0]
+            )
+            and self._node_contains_element_name(
+                node=candidate.lineage.second_node_to_join, element_name=desired_linkable_spec.element_name
+            )
+        ]
+        return sorted(
+            multi_hop_join_candidates,
+            key=lambda candidate: (
+                node_id_to_position[candidate.lineage.first_node_to_join.node_id],
+                node_id_to_position[candidate.lineage.second_node_to_join.node_id],
+            ),
+        )
+
     def _get_candidates_nodes_for_multi_hop(
         self, desired_linkable_spec: LinkableInstanceSpec, nodes: Sequence[DataflowPlanNode], join_type: SqlJoinType
     ) -> Sequence[MultiHopJoinCandidate]:
@@ -475,14 +659,19 @@ class PreJoinNodeProcessor:
         if len(desired_linkable_spec.entity_links) != 2:
             return ()
 
+        for precomputed_candidates in self._precomputed_multi_hop_join_candidates:
+            if precomputed_candidates.covers(nodes=nodes, join_type=join_type):
+                logger.debug(LazyFormat(lambda: f"Using precomputed candidates for {desired_linkable_spec}"))
+                return self._get_precomputed_candidates_nodes_for_multi_hop(
+                    desired_linkable_spec=desired_linkable_spec,
+                    nodes=nodes,
+                    precomputed_candidates=precomputed_candidates,
+                )
+
         multi_hop_join_candidates: List[MultiHopJoinCandidate] = []
         logger.debug(LazyFormat(lambda: f"Creating nodes for {desired_linkable_spec}"))
 
         for first_node_that_could_be_joined in nodes:
-            data_set_of_first_node_that_could_be_joined = self._node_data_set_resolver.get_output_data_set(
-                first_node_that_could_be_joined
-            )
-
             # When joining on the entity, the first node needs the first and second entity links.
             if not (
                 self._node_contains_entity(
@@ -505,83 +694,22 @@ class PreJoinNodeProcessor:
                 ):
                     continue
 
-                # Avoid loops between the same semantic models.
-                if second_node_that_could_be_joined.node_id == first_node_that_could_be_joined.node_id:
-                    continue
-
-                data_set_of_second_node_that_can_be_joined = self._node_data_set_resolver.get_output_data_set(
-                    second_node_that_could_be_joined
-                )
-
                 # If the element name of the linkable spec doesn't exist in the joined data set, then it can't be
                 # useful for obtaining that linkable spec.
-                element_names_in_data_set = ToElementNameSet().transform(
-                    data_set_of_second_node_that_can_be_joined.instance_set.spec_set
-                )
-
-                if desired_linkable_spec.element_name not in element_names_in_data_set:
-                    continue
-
-                # The first and second nodes are joined by this entity
-                entity_reference_to_join_first_and_second_nodes = desired_linkable_spec.entity_links[1]
-
-                if not self._join_evaluator.is_valid_instance_set_join(
-                    left_instance_set=data_set_of_first_node_that_could_be_joined.instance_set,
-                    right_instance_set=data_set_of_second_node_that_can_be_joined.instance_set,
-                    on_entity_reference=entity_reference_to_join_first_and_second_nodes,
-                    right_node_is_aggregated_to_entity=second_node_that_could_be_joined.aggregated_to_elements
-                    == {entity_reference_to_join_first_and_second_nodes},
+                if not self._node_contains_element_name(
+                    node=second_node_that_could_be_joined, element_name=desired_linkable_spec.element_name
                 ):
                     continue
 
-                # filter measures out of joinable_node
-                specs = data_set_of_second_node_that_can_be_joined.instance_set.spec_set
-                filtered_joinable_node = FilterElementsNode.create(
-                    parent_node=second_node_that_could_be_joined,
-                    include_specs=group_specs_by_type(
-                        specs.dimension_specs
-                        + specs.entity_specs
-                        + specs.time_dimension_specs
-                        + specs.group_by_metric_specs
-                    ),
-                )
-
-                join_on_partition_dimensions = self._partition_resolver.resolve_partition_dimension_joins(
-                    left_node_spec_set=data_set_of_first_node_that_could_be_joined.instance_set.spec_set,
-                    node_to_join_spec_set=data_set_of_second_node_that_can_be_joined.instance_set.spec_set,
-                )
-                join_on_partition_time_dimensions = self._partition_resolver.resolve_partition_time_dimension_joins(
-                    left_node_spec_set=data_set_of_first_node_that_could_be_joined.instance_set.spec_set,
-                    node_to_join_spec_set=data_set_of_second_node_that_can_be_joined.instance_set.spec_set,
-                )
-
-                multi_hop_join_candidates.append(
-                    MultiHopJoinCandidate(
-                        node_with_multi_hop_elements=JoinOnEntitiesNode.create(
-                            left_node=first_node_that_could_be_joined,
-                            join_targets=[
-                                JoinDescription(
-                                    join_node=filtered_joinable_node,
-                                    join_on_entity=LinklessEntitySpec.from_reference(
-                                        desired_linkable_spec.entity_links[1]
-                                    ),
-                                    join_on_partition_dimensions=join_on_partition_dimensions,
-                                    join_on_partition_time_dimensions=join_on_partition_time_dimensions,
-                                    join_type=join_type,
-                                )
-                            ],
-                        ),
-                        lineage=MultiHopJoinCandidateLineage(
-                            first_node_to_join=first_node_that_could_be_joined,
-                            second_node_to_join=second_node_that_could_be_joined,
-                            # entity_spec_in_first_node should already not have entity links since we checked
-                            # for that, but using this method for type checking.
-                            join_second_node_by_entity=LinklessEntitySpec.from_reference(
-                                desired_linkable_spec.entity_links[1]
-                            ),
-                        ),
-                    )
+                # The first and second nodes are joined by this entity
+                multi_hop_join_candidate = self._create_multi_hop_join_candidate(
+                    first_node=first_node_that_could_be_joined,
+                    second_node=second_node_that_could_be_joined,
+                    join_entity_reference=desired_linkable_spec.entity_links[1],
+                    join_type=join_type,
                 )
+                if multi_hop_join_candidate is not None:
+                    multi_hop_join_candidates.append(multi_hop_join_candidate)
 
         for multi_hop_join_candidate in multi_hop_join_candidates:
             output_data_set = self._node_data_set_resolver.get_output_data_set(
@@ -0,0 +1,118 @@
+"""Helpers for rendering literals in filters as bind parameters."""
+from __future__ import annotations
+
+import re
+from typing import Callable, Dict, List, Optional, Tuple
+
+from metricflow_semantics.sql.sql_bind_parameters import SqlBindParameter, SqlBindParameters, SqlBindParameterValue
+from metricflow_semantics.sql.sql_column_type import SqlColumnType
+
+from metricflow.sql.sql_exprs import SqlBindParameterExpression
+
+# Matches one token of a SQL expression. The order matters - e.g. comments and quoted strings need to be matched before
+# the characters inside of them are matched as operators.
+_SQL_TOKEN_PATTERN = re.compile(
+    r"""
+    (?P<comment>--[^\n]*|/\*.*?\*/)
+    |(?P<string_literal>'(?:[^']|'')*')
+    |(?P<quoted_identifier>"(?:[^"]|"")*"|`[^`]*`)
+    |(?P<word>[A-Za-z_][A-Za-z0-9_$]*)
+    |(?P<number_literal>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)
+    |(?P<comparison_operator><=|>=|<>|!=|==|=|<|>)
+    |(?P<whitespace>\s+)
+    |(?P<other>.)
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+_COMPARISON_KEYWORDS = frozenset(("LIKE", "ILIKE"))
+
+
+class SqlLiteralParameterizer:
+    """Replaces literals in filters with bind parameters.
+
+    When the literals in filters are inlined into the SQL, queries that only differ in the filter values produce
+    different SQL, so caches in the warehouse that are keyed by the SQL text (e.g. compiled plans or results) are not
+    used. With bind parameters, those queries produce the same SQL.
+
+    The keys of the parameters are derived from the table aliases in the query, so they are the same between queries
+    that generate the same plan.
+    """
+
+    def __init__(self, bind_parameter_key_renderer: Callable[[str], str]) -> None:
+        """Initializer.
+
+        Args:
+            bind_parameter_key_renderer: Wraps the key of a bind parameter with the syntax accepted by the engine, e.g.
+            `SqlClient.render_bind_parameter_key`.
+        """
+        self._bind_parameter_key_renderer = bind_parameter_key_renderer
+
+    def create_bind_parameter_expr(self, key: str, value: SqlColumnType) -> SqlBindParameterExpression:
+        """Create an expression that references a bind parameter with the given value."""
+        return SqlBindParameterExpression.create(
+            rendered_key=self._bind_parameter_key_renderer(key),
+            bind_parameter=SqlBindParameter(key=key, value=SqlBindParameterValue.create_from_sql_column_type(value)),
+        )
+
+    def parameterize_where_sql(self, where_sql: str, key_prefix: str) -> Tuple[str, SqlBindParameters]:
+        """Replace the literals in the rendered SQL of a where filter with bind parameters.
+
+        To avoid changing the meaning of the SQL, only string and number literals that are compared to a value
+        (e.g. `country = 'US'`, `bookings > 10`, `name LIKE 'A%'`) or that are in an `IN (...)` list are replaced.
+        Other literals, like function arguments in `DATE_TRUNC('day', ds)` or typed literals like `DATE '2020-01-01'`,
+        are left as they are.
+
+        Returns:
+            A tuple of the SQL with placeholders in place of the literals, and the values for the placeholders.
+        """
+        sql_parts: List[str] = []
+        param_dict: Dict[str, SqlColumnType] = {}
+        previous_token = ""
+        previous_token_type: Optional[str] = None
+        parenthesis_depth = 0
+        # The parenthesis depths of the `IN (...)` lists that contain the current token.
+        in_list_depths: List[int] = []
+        for match in _SQL_TOKEN_PATTERN.finditer(where_sql):
+            token_type = match.lastgroup
+            token = match.group()
+            if token_type == "comment" or token_type == "whitespace":
+                sql_parts.append(token)
+                continue
+
+            if token_type == "string_literal" or token_type == "number_literal":
+                is_compared_value = previous_token_type == "comparison_operator" or (
+                    previous_token_type == "word" and previous_token.upper() in _COMPARISON_KEYWORDS
+                )
+                is_in_list_item = (
+                    len(in_list_depths) > 0 and in_list_depths[-1] == parenthesis_depth and previous_token in ("(", ",")
+                )
+                if is_compared_value or is_in_list_item:
+                    key = f"{key_prefix}__{len(param_dict)}"
+                    param_dict[key] = SqlLiteralParameterizer._parse_literal(
+                        token, is_string=token_type == "string_literal"
+                    )
+                    sql_parts.append(self._bind_parameter_key_renderer(key))
+                    previous_token, previous_token_type = token, token_type
+                    continue
+            elif token == "(":
+                parenthesis_depth += 1
+                if previous_token_type == "word" and previous_token.upper() == "IN":
+                    in_list_depths.append(parenthesis_depth)
+            elif token == ")":
+                if len(in_list_depths) > 0 and in_list_depths[-1] == parenthesis_depth:
+                    in_list_depths.pop()
+                parenthesis_depth -= 1
+
+            sql_parts.append(token)
+            previous_token, previous_token_type = token, token_type
+
+        return "".join(sql_parts), SqlBindParameters.create_from_dict(param_dict)
+
+    @staticmethod
+    def _parse_literal(token: str, is_string: bool) -> SqlColumnType:
+        if is_string:
+            return token[1:-1].replace("''", "'")
+        if "." in token or "e" in token or "E" in token:
+            return float(token)
+        return int(token)
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from abc import abstractmethod
 from enum import Enum
-from typing import Protocol, Set
+from typing import Generator, Protocol, Set
 
 from dbt_semantic_interfaces.enum_extension import assert_values_exhausted
 from dbt_semantic_interfaces.type_enums.time_granularity import TimeGranularity
@@ -11,6 +11,9 @@ from metricflow_semantics.sql.sql_bind_parameters import SqlBindParameters
 from metricflow.data_table.mf_table import MetricFlowDataTable
 from metricflow.sql.render.sql_plan_renderer import SqlQueryPlanRenderer
 
+# The default number of rows in each batch returned by `SqlClient.query_batches`.
+DEFAULT_QUERY_BATCH_SIZE = 10000
+
 
 class SqlEngine(Enum):
     """Enumeration of supported SQL engines.
@@ -84,6 +87,25 @@ class SqlClient(Protocol):
         """Base query method, upon execution will run a query that returns a pandas DataTable."""
         raise NotImplementedError
 
+    @abstractmethod
+    def query_batches(
+        self,
+        stmt: str,
+        sql_bind_parameters: SqlBindParameters = SqlBindParameters(),
+        batch_size: int = DEFAULT_QUERY_BATCH_SIZE,
+    ) -> Generator[MetricFlowDataTable, None, None]:
+        """Similar to `query`, but returns the rows in batches as they are fetched.
+
+        Each batch has up to `batch_size` rows, and at least one batch is returned so that the column names are
+        available for empty results. The column types are determined separately for each batch. The generator should be
+        consumed in the thread that called this method.
+
+        Resources for the query (e.g. a connection from a pool) are held until the generator is exhausted or closed, so
+        call `close()` on it (e.g. using `contextlib.closing`) if it's not consumed fully. Whether the memory used is
+        bounded by the batch size depends on the driver, as some drivers fetch the full result when the query is run.
+        """
+        raise NotImplementedError
+
     @abstractmethod
     def execute(
         self,
@@ -111,3 +133,60 @@ class SqlClient(Protocol):
     def render_bind_parameter_key(self, bind_parameter_key: str) -> str:
         """Wrap the bind parameter key with syntax accepted by engine."""
         raise NotImplementedError
+
+
+class AsyncSqlClient(Protocol):
+    """Interface for SqlClient instances that use asyncio to access the data warehouse.
+
+    This mirrors `SqlClient`, but the methods that access the data warehouse are coroutines so that a service running
+    an event loop doesn't need to use a thread for the duration of each query.
+    """
+
+    @property
+    @abstractmethod
+    def sql_engine_type(self) -> SqlEngine:
+        """Enumerated value representing the underlying SqlEngine for this SqlClient instance."""
+        raise NotImplementedError
+
+    @property
+    @abstractmethod
+    def sql_query_plan_renderer(self) -> SqlQueryPlanRenderer:
+        """Dialect-specific SQL query plan renderer used for converting MetricFlow's query plan to executable SQL."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def query(
+        self,
+        stmt: str,
+        sql_bind_parameters: SqlBindParameters = SqlBindParameters(),
+    ) -> MetricFlowDataTable:
+        """Base query method, upon execution will run a query that returns a MetricFlowDataTable."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def execute(
+        self,
+        stmt: str,
+        sql_bind_parameters: SqlBindParameters = SqlBindParameters(),
+    ) -> None:
+        """Base execute method."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def dry_run(
+        self,
+        stmt: str,
+        sql_bind_parameters: SqlBindParameters = SqlBindParameters(),
+    ) -> None:
+        """Base dry_run method."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def close(self) -> None:
+        """Close the connections / engines used by this client."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def render_bind_parameter_key(self, bind_parameter_key: str) -> str:
+        """Wrap the bind parameter key with syntax accepted by engine."""
+        raise NotImplementedError
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from abc import abstractmethod
+from dataclasses import dataclass, field
+from typing import Mapping, Optional, Protocol
+
+from dbt_semantic_interfaces.references import SemanticModelReference
+
+
+@dataclass(frozen=True)
+class SemanticModelStatistics:
+    """Statistics about the table of a semantic model, used for estimating the cost of reading from it.
+
+    Attributes:
+        row_count: The number of rows in the table.
+        entity_distinct_value_counts: Maps the name of an entity in the semantic model to the number of distinct
+        values of the entity in the table.
+    """
+
+    row_count: int
+    entity_distinct_value_counts: Mapping[str, int] = field(default_factory=dict)
+
+
+class TableStatisticsProvider(Protocol):
+    """Provides statistics about the tables of semantic models for cost-based planning."""
+
+    @abstractmethod
+    def get_statistics(self, semantic_model_reference: SemanticModelReference) -> Optional[SemanticModelStatistics]:
+        """Return the statistics for the semantic model, or None if they are not available."""
+        raise NotImplementedError
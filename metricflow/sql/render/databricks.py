@@ -77,3 +77,8 @@ class DatabricksSqlQueryPlanRenderer(DefaultSqlQueryPlanRenderer):
     @override
     def expr_renderer(self) -> SqlExpressionRenderer:
         return self.EXPR_RENDERER
+
+    @property
+    @override
+    def parenthesize_create_table_as_query_with_ctes(self) -> bool:
+        return False
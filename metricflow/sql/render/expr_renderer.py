@@ -18,6 +18,7 @@ from metricflow.sql.render.rendering_constants import SqlRenderingConstants
 from metricflow.sql.sql_exprs import (
     SqlAggregateFunctionExpression,
     SqlBetweenExpression,
+    SqlBindParameterExpression,
     SqlCastToTimestampExpression,
     SqlColumnAliasReferenceExpression,
     SqlColumnReferenceExpression,
@@ -193,6 +194,9 @@ class DefaultSqlExpressionRenderer(SqlExpressionRenderer):
             bind_parameters=SqlBindParameters(),
         )
 
+    def visit_bind_parameter_expr(self, node: SqlBindParameterExpression) -> SqlExpressionRenderResult:  # noqa: D102
+        return SqlExpressionRenderResult(sql=node.rendered_key, bind_parameters=node.bind_parameters)
+
     def visit_logical_expr(self, node: SqlLogicalExpression) -> SqlExpressionRenderResult:  # noqa: D102
         RenderedExpr = namedtuple("RenderedExpr", ["expr", "requires_parenthesis"])
         args_rendered = [RenderedExpr(self.render_sql_expr(x), x.requires_parenthesis) for x in node.args]
@@ -1,14 +1,16 @@
 from __future__ import annotations
 
+import copy
 import logging
 import textwrap
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from string import Template
-from typing import List, Optional, Sequence, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 
 from metricflow_semantics.mf_logging.formatting import indent
 from metricflow_semantics.sql.sql_bind_parameters import SqlBindParameters
+from typing_extensions import override
 
 from metricflow.sql.render.expr_renderer import (
     DefaultSqlExpressionRenderer,
@@ -39,6 +41,25 @@ class SqlPlanRenderResult:  # noqa: D101
     bind_parameters: SqlBindParameters
 
 
+@dataclass(frozen=True)
+class SqlCteRenderingOptions:
+    """Options for rendering sub-queries as common table expressions (CTEs) in a WITH clause.
+
+    Attributes:
+        render_shared_sub_queries: Render a sub-query as a CTE if it's used in more than one place in the query. Since
+        the sub-query is only rendered once, this reduces the size of the SQL and allows the engine to reuse the result.
+        min_sql_length: If specified, also render a sub-query as a CTE if its SQL has at least this many characters.
+        This reduces the nesting depth of the SQL for large queries.
+    """
+
+    render_shared_sub_queries: bool = True
+    min_sql_length: Optional[int] = None
+
+    def __post_init__(self) -> None:  # noqa: D105
+        if self.min_sql_length is not None and self.min_sql_length < 1:
+            raise ValueError(f"min_sql_length should be >= 1. Got: {self.min_sql_length}")
+
+
 class SqlQueryPlanRenderer(SqlQueryPlanNodeVisitor[SqlPlanRenderResult], ABC):
     """Renders SQL plans to a string."""
 
@@ -54,6 +75,11 @@ class SqlQueryPlanRenderer(SqlQueryPlanNodeVisitor[SqlPlanRenderResult], ABC):
         """Return the renderer that this uses to render expressions."""
         pass
 
+    @abstractmethod
+    def with_cte_rendering_options(self, cte_rendering_options: SqlCteRenderingOptions) -> SqlQueryPlanRenderer:
+        """Return a renderer that renders sub-queries as common table expressions as configured in the options."""
+        pass
+
 
 @dataclass
 class StringJoinDescription:
@@ -65,11 +91,145 @@ class StringJoinDescription:
     on_condition_str: str
 
 
+@dataclass
+class _CteRenderingState:
+    """The state kept while rendering a query with common table expressions.
+
+    Sub-queries are keyed by the node, so sub-queries that are structurally the same are rendered as the same CTE.
+
+    Attributes:
+        reference_counts: The number of times each sub-query is used as a source in the query.
+        sub_query_to_cte_name: The name of the CTE for each sub-query that has been rendered as a CTE.
+        cte_render_results: The name and the rendered SQL of each CTE, in the order they should be defined.
+    """
+
+    reference_counts: Dict[SqlSelectStatementNode, int]
+    sub_query_to_cte_name: Dict[SqlSelectStatementNode, str] = field(default_factory=dict)
+    cte_render_results: List[Tuple[str, SqlPlanRenderResult]] = field(default_factory=list)
+
+
 class DefaultSqlQueryPlanRenderer(SqlQueryPlanRenderer):
-    """Renders an SQL plan following ANSI SQL."""
+    """Renders an SQL plan following ANSI SQL.
+
+    By default, sub-queries are rendered inline. If CTE rendering options are set (see `with_cte_rendering_options`),
+    sub-queries are rendered as common table expressions in a WITH clause as configured.
+    """
 
     # The renderer that is used to render the SQL expressions.
     EXPR_RENDERER = DefaultSqlExpressionRenderer()
+    # The prefix for the names of common table expressions.
+    CTE_NAME_PREFIX = "cte"
+
+    _cte_rendering_options: Optional[SqlCteRenderingOptions] = None
+    _cte_rendering_state: Optional[_CteRenderingState] = None
+
+    @override
+    def with_cte_rendering_options(self, cte_rendering_options: SqlCteRenderingOptions) -> SqlQueryPlanRenderer:
+        renderer = copy.copy(self)
+        renderer._cte_rendering_options = cte_rendering_options
+        return renderer
+
+    @property
+    def cte_rendering_options(self) -> Optional[SqlCteRenderingOptions]:
+        """The options for rendering common table expressions, or None if sub-queries are rendered inline."""
+        return self._cte_rendering_options
+
+    @property
+    def parenthesize_create_table_as_query_with_ctes(self) -> bool:
+        """Whether the query in a CREATE TABLE AS statement should be in parentheses when it has a WITH clause.
+
+        Some engines don't accept a WITH clause in a parenthesized query, so those render the statement as
+        `CREATE TABLE ... AS WITH ...` instead.
+        """
+        return True
+
+    @override
+    def render_sql_query_plan(self, sql_query_plan: SqlQueryPlan) -> SqlPlanRenderResult:
+        if self._cte_rendering_options is None:
+            return super().render_sql_query_plan(sql_query_plan)
+
+        # The state for CTEs is kept in a copy so that this renderer can be used concurrently.
+        renderer = copy.copy(self)
+        render_node = sql_query_plan.render_node
+        if render_node.as_select_node is not None:
+            return renderer._render_query_with_ctes(render_node.as_select_node)
+        return renderer._render_node(render_node)
+
+    @staticmethod
+    def _sub_queries(node: SqlSelectStatementNode) -> Sequence[SqlSelectStatementNode]:
+        """Return the sub-queries in the FROM and JOIN clauses of the given SELECT statement."""
+        sub_queries = []
+        for source in (node.from_source,) + tuple(join_desc.right_source for join_desc in node.join_descs):
+            if source.as_select_node is not None:
+                sub_queries.append(source.as_select_node)
+        return sub_queries
+
+    @staticmethod
+    def _count_sub_query_references(
+        node: SqlSelectStatementNode, reference_counts: Dict[SqlSelectStatementNode, int]
+    ) -> None:
+        """Count the number of times each sub-query is used as a source in the query for the given node."""
+        for sub_query in DefaultSqlQueryPlanRenderer._sub_queries(node):
+            reference_count = reference_counts.get(sub_query, 0)
+            reference_counts[sub_query] = reference_count + 1
+            # The sub-queries in a shared sub-query are only rendered once, so they should only be counted once.
+            if reference_count == 0:
+                DefaultSqlQueryPlanRenderer._count_sub_query_references(sub_query, reference_counts)
+
+    def _render_query_with_ctes(self, node: SqlSelectStatementNode) -> SqlPlanRenderResult:
+        """Render the query for the given node with a WITH clause for the sub-queries that should be CTEs."""
+        reference_counts: Dict[SqlSelectStatementNode, int] = {}
+        DefaultSqlQueryPlanRenderer._count_sub_query_references(node, reference_counts)
+        self._cte_rendering_state = _CteRenderingState(reference_counts=reference_counts)
+        try:
+            query_render_result = self._render_node(node)
+            cte_render_results = self._cte_rendering_state.cte_render_results
+        finally:
+            self._cte_rendering_state = None
+
+        if len(cte_render_results) == 0:
+            return query_render_result
+
+        with_section_lines: List[str] = []
+        bind_parameters = SqlBindParameters()
+        for i, (cte_name, cte_render_result) in enumerate(cte_render_results):
+            with_section_lines.append(f"{'WITH' if i == 0 else ','} {cte_name} AS (")
+            with_section_lines.append(indent(cte_render_result.sql, indent_prefix=SqlRenderingConstants.INDENT))
+            with_section_lines.append(")")
+            bind_parameters = bind_parameters.combine(cte_render_result.bind_parameters)
+
+        return SqlPlanRenderResult(
+            sql="\n".join(with_section_lines) + "\n\n" + query_render_result.sql,
+            bind_parameters=bind_parameters.combine(query_render_result.bind_parameters),
+        )
+
+    def _render_source(self, source: SqlQueryPlanNode) -> Tuple[SqlPlanRenderResult, bool]:
+        """Render a source in the FROM or JOIN clause.
+
+        Returns a tuple of the render result, and whether the source can be referenced by name (e.g. a table or a CTE)
+        instead of needing to be in parentheses.
+        """
+        cte_rendering_state = self._cte_rendering_state
+        cte_rendering_options = self._cte_rendering_options
+        sub_query = source.as_select_node
+        if cte_rendering_state is None or cte_rendering_options is None or sub_query is None:
+            return self._render_node(source), source.is_table
+
+        cte_name = cte_rendering_state.sub_query_to_cte_name.get(sub_query)
+        if cte_name is None:
+            render_result = self._render_node(sub_query)
+            is_shared = cte_rendering_state.reference_counts.get(sub_query, 0) > 1
+            if not (cte_rendering_options.render_shared_sub_queries and is_shared) and (
+                cte_rendering_options.min_sql_length is None
+                or len(render_result.sql) < cte_rendering_options.min_sql_length
+            ):
+                return render_result, False
+
+            cte_name = f"{self.CTE_NAME_PREFIX}_{len(cte_rendering_state.cte_render_results)}"
+            cte_rendering_state.cte_render_results.append((cte_name, render_result))
+            cte_rendering_state.sub_query_to_cte_name[sub_query] = cte_name
+
+        return SqlPlanRenderResult(sql=cte_name, bind_parameters=SqlBindParameters()), True
 
     def _render_select_columns_section(
         self,
@@ -135,10 +295,10 @@ class DefaultSqlQueryPlanRenderer(SqlQueryPlanRenderer):
 
         Returns a tuple of the "FROM" section as a string and the associated execution parameters.
         """
-        from_render_result = self._render_node(from_source)
+        from_render_result, render_as_reference = self._render_source(from_source)
 
         from_section_lines = []
-        if from_source.is_table:
+        if render_as_reference:
             from_section_lines.append(f"FROM {from_render_result.sql} {from_source_alias}")
         else:
             from_section_lines.append("FROM (")
@@ -164,7 +324,7 @@ class DefaultSqlQueryPlanRenderer(SqlQueryPlanRenderer):
         join_section_lines = []
         for join_description in join_descriptions:
             # Render the source for the join
-            right_source_rendered = self._render_node(join_description.right_source)
+            right_source_rendered, render_as_reference = self._render_source(join_description.right_source)
             params = params.combine(right_source_rendered.bind_parameters)
 
             # Render the on condition for the join
@@ -173,7 +333,7 @@ class DefaultSqlQueryPlanRenderer(SqlQueryPlanRenderer):
                 on_condition_rendered = self.EXPR_RENDERER.render_sql_expr(join_description.on_condition)
                 params = params.combine(on_condition_rendered.bind_parameters)
 
-            if join_description.right_source.is_table:
+            if render_as_reference:
                 join_section_lines.append(join_description.join_type.value)
                 join_section_lines.append(
                     textwrap.indent(
@@ -314,8 +474,19 @@ class DefaultSqlQueryPlanRenderer(SqlQueryPlanRenderer):
         )
 
     def visit_create_table_as_node(self, node: SqlCreateTableAsNode) -> SqlPlanRenderResult:  # noqa: D102
-        inner_sql_render_result = node.parent_node.accept(self)
+        parent_select_node = node.parent_node.as_select_node
+        if self._cte_rendering_options is not None and parent_select_node is not None:
+            inner_sql_render_result = self._render_query_with_ctes(parent_select_node)
+        else:
+            inner_sql_render_result = node.parent_node.accept(self)
         inner_sql = inner_sql_render_result.sql
+
+        if inner_sql.startswith("WITH") and not self.parenthesize_create_table_as_query_with_ctes:
+            return SqlPlanRenderResult(
+                sql=f"CREATE {node.sql_table.table_type.value.upper()} {node.sql_table.sql} AS\n{inner_sql}",
+                bind_parameters=inner_sql_render_result.bind_parameters,
+            )
+
         # Using a substitution since inner_sql can have multiple lines, and then dedent() wouldn't dent due to the
         # short line.
         sql = Template(
@@ -127,3 +127,8 @@ class TrinoSqlQueryPlanRenderer(DefaultSqlQueryPlanRenderer):
     @override
     def expr_renderer(self) -> SqlExpressionRenderer:
         return self.EXPR_RENDERER
+
+    @property
+    @override
+    def parenthesize_create_table_as_query_with_ctes(self) -> bool:
+        return False
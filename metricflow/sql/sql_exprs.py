@@ -17,7 +17,7 @@ from dbt_semantic_interfaces.type_enums.period_agg import PeriodAggregation
 from dbt_semantic_interfaces.type_enums.time_granularity import TimeGranularity
 from metricflow_semantics.dag.id_prefix import IdPrefix, StaticIdPrefix
 from metricflow_semantics.dag.mf_dag import DagNode, DisplayedProperty
-from metricflow_semantics.sql.sql_bind_parameters import SqlBindParameters
+from metricflow_semantics.sql.sql_bind_parameters import SqlBindParameter, SqlBindParameters
 from metricflow_semantics.visitor import Visitable, VisitorOutputT
 from typing_extensions import override
 
@@ -193,6 +193,10 @@ class SqlExpressionNodeVisitor(Generic[VisitorOutputT], ABC):
     def visit_string_literal_expr(self, node: SqlStringLiteralExpression) -> VisitorOutputT:  # noqa: D102
         pass
 
+    @abstractmethod
+    def visit_bind_parameter_expr(self, node: SqlBindParameterExpression) -> VisitorOutputT:  # noqa: D102
+        pass
+
     @abstractmethod
     def visit_is_null_expr(self, node: SqlIsNullExpression) -> VisitorOutputT:  # noqa: D102
         pass
@@ -367,6 +371,68 @@ class SqlStringLiteralExpression(SqlExpressionNode):
         return self.literal_value == other.literal_value
 
 
+@dataclass(frozen=True)
+class SqlBindParameterExpression(SqlExpressionNode):
+    """A reference to a bind parameter, e.g. `$start_time` in DuckDB.
+
+    Attributes:
+        rendered_key: The key of the parameter wrapped in the syntax accepted by the engine.
+        bind_parameter: The key and the value of the parameter.
+    """
+
+    rendered_key: str
+    bind_parameter: SqlBindParameter
+
+    @staticmethod
+    def create(rendered_key: str, bind_parameter: SqlBindParameter) -> SqlBindParameterExpression:  # noqa: D102
+        return SqlBindParameterExpression(parent_nodes=(), rendered_key=rendered_key, bind_parameter=bind_parameter)
+
+    @classmethod
+    def id_prefix(cls) -> IdPrefix:  # noqa: D102
+        return StaticIdPrefix.SQL_EXPR_BIND_PARAMETER_PREFIX
+
+    def accept(self, visitor: SqlExpressionNodeVisitor[VisitorOutputT]) -> VisitorOutputT:  # noqa: D102
+        return visitor.visit_bind_parameter_expr(self)
+
+    @property
+    def description(self) -> str:  # noqa: D102
+        return f"Bind Parameter: {self.bind_parameter.key}"
+
+    @property
+    def displayed_properties(self) -> Sequence[DisplayedProperty]:  # noqa: D102
+        return tuple(super().displayed_properties) + (
+            DisplayedProperty("key", self.bind_parameter.key),
+            DisplayedProperty("value", self.bind_parameter.value.union_value),
+        )
+
+    @property
+    def requires_parenthesis(self) -> bool:  # noqa: D102
+        return False
+
+    @property
+    def bind_parameters(self) -> SqlBindParameters:  # noqa: D102
+        return SqlBindParameters(param_items=(self.bind_parameter,))
+
+    def __repr__(self) -> str:  # noqa: D105
+        return f"{self.__class__.__name__}(node_id={self.node_id}, key={self.bind_parameter.key})"
+
+    def rewrite(  # noqa: D102
+        self,
+        column_replacements: Optional[SqlColumnReplacements] = None,
+        should_render_table_alias: Optional[bool] = None,
+    ) -> SqlExpressionNode:
+        return self
+
+    @property
+    def lineage(self) -> SqlExpressionTreeLineage:  # noqa: D102
+        return SqlExpressionTreeLineage(other_exprs=(self,))
+
+    def matches(self, other: SqlExpressionNode) -> bool:  # noqa: D102
+        if not isinstance(other, SqlBindParameterExpression):
+            return False
+        return self.rendered_key == other.rendered_key and self.bind_parameter == other.bind_parameter
+
+
 @dataclass(frozen=True)
 class SqlColumnReference:
     """Used with string expressions to specify what columns are referred to in the string expression."""
@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import TYPE_CHECKING, Dict, Generator, Optional
+
+from metricflow_semantics.mf_logging.lazy_formattable import LazyFormat
+from metricflow_semantics.sql.sql_bind_parameters import SqlBindParameters
+from metricflow_semantics.sql.sql_column_type import SqlColumnType
+
+from metricflow.data_table.mf_table import MetricFlowDataTable
+from metricflow.data_table.optional_modules import import_optional_module
+from metricflow.protocols.sql_client import DEFAULT_QUERY_BATCH_SIZE, SqlEngine
+from metricflow.sql.render.duckdb_renderer import DuckDbSqlQueryPlanRenderer
+from metricflow.sql.render.sql_plan_renderer import SqlQueryPlanRenderer
+
+if TYPE_CHECKING:
+    import duckdb
+    import pyarrow
+
+logger = logging.getLogger(__name__)
+
+
+class DuckDbSqlClient:
+    """SqlClient implementation that runs queries in-process with the `duckdb` package. Requires the `duckdb` extra.
+
+    Compared to `AdapterBackedSqlClient` with the DuckDB adapter, this does not need a dbt project, and the results
+    are fetched as Arrow record batches that are converted to `MetricFlowDataTable` without creating Python objects for
+    each cell.
+
+    Each request uses a separate cursor (a connection to the same database), so the client can be used from multiple
+    threads at the same time.
+    """
+
+    def __init__(self, connection: duckdb.DuckDBPyConnection) -> None:
+        """Initializer.
+
+        Args:
+            connection: The connection to the database. The client closes the connection in `close()`.
+        """
+        self._connection = connection
+        self._connection_lock = threading.Lock()
+        self._sql_query_plan_renderer = DuckDbSqlQueryPlanRenderer()
+
+    @staticmethod
+    def create(database: str = ":memory:", read_only: bool = False) -> DuckDbSqlClient:
+        """Create a client for the DuckDB database file at the given path, or for an in-memory database."""
+        duckdb_module = import_optional_module("duckdb", "duckdb")
+        # Arrow is needed to fetch the results.
+        import_optional_module("pyarrow", "duckdb")
+        return DuckDbSqlClient(duckdb_module.connect(database=database, read_only=read_only))
+
+    @property
+    def sql_engine_type(self) -> SqlEngine:  # noqa: D102
+        return SqlEngine.DUCKDB
+
+    @property
+    def sql_query_plan_renderer(self) -> SqlQueryPlanRenderer:  # noqa: D102
+        return self._sql_query_plan_renderer
+
+    def _cursor(self) -> duckdb.DuckDBPyConnection:
+        """Return a new cursor for a request. The caller should close it when the request is done."""
+        with self._connection_lock:
+            return self._connection.cursor()
+
+    @staticmethod
+    def _record_batch_reader(cursor: duckdb.DuckDBPyConnection, batch_size: int) -> pyarrow.RecordBatchReader:
+        """Return a reader for the result of the statement that was run with the cursor."""
+        # Newer versions of DuckDB deprecate `fetch_record_batch()` in favor of `to_arrow_reader()`.
+        if hasattr(cursor, "to_arrow_reader"):
+            return cursor.to_arrow_reader(batch_size)
+        return cursor.fetch_record_batch(batch_size)
+
+    @staticmethod
+    def _parameters(sql_bind_parameters: SqlBindParameters) -> Optional[Dict[str, SqlColumnType]]:
+        param_dict = sql_bind_parameters.param_dict
+        return dict(param_dict) if len(param_dict) > 0 else None
+
+    def query(
+        self,
+        stmt: str,
+        sql_bind_parameters: SqlBindParameters = SqlBindParameters(),
+    ) -> MetricFlowDataTable:
+        """Query statement; result expected to be data which will be returned as a DataTable.
+
+        Args:
+            stmt: The SQL query statement to run. This should produce output via a SELECT
+            sql_bind_parameters: The parameter replacement mapping for filling in concrete values for SQL query
+            parameters.
+        """
+        start = time.time()
+        logger.info(LazyFormat("Running query() statement", statement=stmt, param_dict=sql_bind_parameters.param_dict))
+        cursor = self._cursor()
+        try:
+            cursor.execute(stmt, DuckDbSqlClient._parameters(sql_bind_parameters))
+            data_table = MetricFlowDataTable.create_from_arrow(
+                DuckDbSqlClient._record_batch_reader(cursor, DEFAULT_QUERY_BATCH_SIZE).read_all()
+            )
+        finally:
+            cursor.close()
+        stop = time.time()
+        logger.info(
+            LazyFormat(
+                "Finished running query()", runtime=f"{stop - start:.2f}s", returned_row_count=data_table.row_count
+            )
+        )
+        return data_table
+
+    def query_batches(
+        self,
+        stmt: str,
+        sql_bind_parameters: SqlBindParameters = SqlBindParameters(),
+        batch_size: int = DEFAULT_QUERY_BATCH_SIZE,
+    ) -> Generator[MetricFlowDataTable, None, None]:
+        """Query statement; the result is returned in batches of rows as they are fetched as Arrow record batches.
+
+        Args:
+            stmt: The SQL query statement to run. This should produce output via a SELECT
+            sql_bind_parameters: The parameter replacement mapping for filling in concrete values for SQL query
+            parameters.
+            batch_size: The maximum number of rows in each batch.
+        """
+        if batch_size < 1:
+            raise ValueError(f"batch_size should be >= 1. Got: {batch_size}")
+        start = time.time()
+        logger.info(
+            LazyFormat(
+                "Running query_batches() statement",
+                statement=stmt,
+                param_dict=sql_bind_parameters.param_dict,
+                batch_size=batch_size,
+            )
+        )
+        row_count = 0
+        batch_count = 0
+        cursor = self._cursor()
+        try:
+            cursor.execute(stmt, DuckDbSqlClient._parameters(sql_bind_parameters))
+            record_batch_reader = DuckDbSqlClient._record_batch_reader(cursor, batch_size)
+            for record_batch in record_batch_reader:
+                # DuckDB may return batches with fewer rows than requested, so the batches are not combined.
+                if record_batch.num_rows == 0:
+                    continue
+                row_count += record_batch.num_rows
+                batch_count += 1
+                yield MetricFlowDataTable.create_from_arrow(record_batch)
+            # Return an empty batch for an empty result so that the column names are available.
+            if batch_count == 0:
+                yield MetricFlowDataTable.create_from_arrow(record_batch_reader.schema.empty_table())
+        finally:
+            cursor.close()
+
+        stop = time.time()
+        logger.info(
+            LazyFormat("Finished running query_batches()", runtime=f"{stop - start:.2f}s", returned_row_count=row_count)
+        )
+
+    def execute(
+        self,
+        stmt: str,
+        sql_bind_parameters: SqlBindParameters = SqlBindParameters(),
+    ) -> None:
+        """Execute a SQL statement. No result will be returned.
+
+        Args:
+            stmt: The SQL query statement to run. This should not produce output.
+            sql_bind_parameters: The parameter replacement mapping for filling in
+                concrete values for SQL query parameters.
+        """
+        start = time.time()
+        logger.info(
+            LazyFormat("Running execute() statement", statement=stmt, param_dict=sql_bind_parameters.param_dict)
+        )
+        cursor = self._cursor()
+        try:
+            cursor.execute(stmt, DuckDbSqlClient._parameters(sql_bind_parameters))
+        finally:
+            cursor.close()
+        stop = time.time()
+        logger.info(LazyFormat("Finished execute()", runtime=f"{stop - start:.2f}s"))
+
+    def dry_run(
+        self,
+        stmt: str,
+        sql_bind_parameters: SqlBindParameters = SqlBindParameters(),
+    ) -> None:
+        """Dry run statement; checks that the 'stmt' is queryable. Returns None on success.
+
+        Raises an exception if the 'stmt' isn't queryable.
+
+        Args:
+            stmt: The SQL query statement to dry run.
+            sql_bind_parameters: The parameter replacement mapping for filling in
+                concrete values for SQL query parameters.
+        """
+        start = time.time()
+        logger.info(LazyFormat("Running dry run", statement=stmt, param_dict=sql_bind_parameters.param_dict))
+        cursor = self._cursor()
+        try:
+            cursor.execute(f"EXPLAIN {stmt}", DuckDbSqlClient._parameters(sql_bind_parameters))
+        finally:
+            cursor.close()
+        stop = time.time()
+        logger.info(LazyFormat("Finished running the dry run", runtime=f"{stop - start:.2f}s"))
+
+    def close(self) -> None:  # noqa: D102
+        with self._connection_lock:
+            self._connection.close()
+
+    def render_bind_parameter_key(self, bind_parameter_key: str) -> str:
+        """Wrap execution parameter key with syntax accepted by engine."""
+        return f"${bind_parameter_key}"
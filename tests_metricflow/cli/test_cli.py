@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import logging
 import shutil
+import sys
 import textwrap
 from contextlib import contextmanager
 from pathlib import Path
@@ -48,6 +49,46 @@ def test_query(cli_runner: MetricFlowCliRunner) -> None:  # noqa: D103
     assert resp.exit_code == 0
 
 
+def test_query_output_format(cli_runner: MetricFlowCliRunner, tmp_path: Path) -> None:  # noqa: D103
+    pq = pytest.importorskip("pyarrow.parquet")
+    output_file = tmp_path / "output.parquet"
+    resp = cli_runner.run(
+        query,
+        args=[
+            "--metrics",
+            "bookings",
+            "--group-by",
+            "metric_time",
+            "--output-format",
+            "parquet",
+            "--output-file",
+            str(output_file),
+        ],
+    )
+    assert resp.exit_code == 0
+    arrow_table = pq.read_table(output_file)
+    assert [column_name.lower() for column_name in arrow_table.column_names] == ["metric_time__day", "bookings"]
+    assert arrow_table.num_rows > 0
+
+    resp = cli_runner.run(query, args=["--metrics", "bookings", "--output-format", "arrow"])
+    assert resp.exit_code != 0
+
+
+def test_query_output_format_without_pyarrow(  # noqa: D103
+    cli_runner: MetricFlowCliRunner, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # Importing a module that maps to None in `sys.modules` raises an `ImportError`.
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+    output_file = tmp_path / "output.parquet"
+    resp = cli_runner.run(
+        query,
+        args=["--metrics", "bookings", "--output-format", "parquet", "--output-file", str(output_file)],
+    )
+    assert resp.exit_code != 0
+    assert "pip install dbt-metricflow[arrow]" in resp.output
+    assert not output_file.exists()
+
+
 def test_list_dimensions(cli_runner: MetricFlowCliRunner) -> None:  # noqa: D103
     resp = cli_runner.run(dimensions, args=["--metrics", "bookings"])
 
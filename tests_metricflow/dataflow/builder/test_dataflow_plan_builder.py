@@ -3,12 +3,13 @@ from __future__ import annotations
 import datetime
 import logging
 import string
+from typing import List, Mapping, Optional, Set
 
 import pytest
 from _pytest.fixtures import FixtureRequest
 from dbt_semantic_interfaces.implementations.filters.where_filter import PydanticWhereFilter
 from dbt_semantic_interfaces.naming.keywords import METRIC_TIME_ELEMENT_NAME
-from dbt_semantic_interfaces.references import EntityReference, MeasureReference
+from dbt_semantic_interfaces.references import EntityReference, MeasureReference, SemanticModelReference
 from dbt_semantic_interfaces.type_enums.time_granularity import TimeGranularity
 from metricflow_semantics.errors.error_classes import UnableToSatisfyQueryError
 from metricflow_semantics.filters.time_constraint import TimeRangeConstraint
@@ -32,7 +33,12 @@ from metricflow_semantics.test_helpers.snapshot_helpers import assert_plan_snaps
 from metricflow_semantics.time.granularity import ExpandedTimeGranularity
 
 from metricflow.dataflow.builder.dataflow_plan_builder import DataflowPlanBuilder
+from metricflow.dataflow.builder.node_data_set import DataflowPlanNodeOutputDataSetResolver
+from metricflow.dataflow.dataflow_plan import DataflowPlanNode
+from metricflow.dataflow.nodes.join_to_base import JoinOnEntitiesNode
+from metricflow.protocols.table_statistics import SemanticModelStatistics
 from tests_metricflow.dataflow_plan_to_svg import display_graph_if_requested
+from tests_metricflow.fixtures.manifest_fixtures import MetricFlowEngineTestFixture, SemanticManifestSetup
 
 logger = logging.getLogger(__name__)
 
@@ -345,6 +351,89 @@ def test_multihop_join_plan(
     )
 
 
+class _SmallTableStatisticsProvider:
+    """Provides statistics where only the table for the given semantic model is small."""
+
+    def __init__(self, small_semantic_model_name: str) -> None:  # noqa: D107
+        self._small_semantic_model_name = small_semantic_model_name
+
+    def get_statistics(  # noqa: D102
+        self, semantic_model_reference: SemanticModelReference
+    ) -> Optional[SemanticModelStatistics]:
+        if semantic_model_reference.semantic_model_name == self._small_semantic_model_name:
+            return SemanticModelStatistics(row_count=10_000)
+        return SemanticModelStatistics(row_count=2_000_000_000)
+
+
+def test_distinct_values_plan_with_table_statistics(
+    mf_engine_test_fixture_mapping: Mapping[SemanticManifestSetup, MetricFlowEngineTestFixture],
+    query_parser: MetricFlowQueryParser,
+) -> None:
+    """Checks that the smallest table is read when several tables have the requested entity."""
+    fixture = mf_engine_test_fixture_mapping[SemanticManifestSetup.SIMPLE_MANIFEST]
+    query_spec = query_parser.parse_and_validate_query(group_by_names=("listing",)).query_spec
+
+    for small_semantic_model_name in ("bookings_source", "views_source"):
+        dataflow_plan_builder = DataflowPlanBuilder(
+            source_node_set=fixture.source_node_set,
+            semantic_manifest_lookup=fixture.semantic_manifest_lookup,
+            node_output_resolver=DataflowPlanNodeOutputDataSetResolver(
+                column_association_resolver=fixture.column_association_resolver,
+                semantic_manifest_lookup=fixture.semantic_manifest_lookup,
+            ),
+            column_association_resolver=fixture.column_association_resolver,
+            source_node_builder=fixture.source_node_builder,
+            table_statistics_provider=_SmallTableStatisticsProvider(small_semantic_model_name),
+        )
+        dataflow_plan = dataflow_plan_builder.build_plan_for_distinct_values(query_spec)
+        assert dataflow_plan.source_semantic_models == {SemanticModelReference(small_semantic_model_name)}
+
+
+def test_multihop_join_plan_with_precomputed_candidates(
+    mf_engine_test_fixture_mapping: Mapping[SemanticManifestSetup, MetricFlowEngineTestFixture],
+) -> None:
+    """Checks that plans for different queries share the precomputed multi-hop join nodes."""
+    fixture = mf_engine_test_fixture_mapping[SemanticManifestSetup.PARTITIONED_MULTI_HOP_JOIN_MANIFEST]
+    dataflow_plan_builder = DataflowPlanBuilder(
+        source_node_set=fixture.source_node_set,
+        semantic_manifest_lookup=fixture.semantic_manifest_lookup,
+        node_output_resolver=DataflowPlanNodeOutputDataSetResolver(
+            column_association_resolver=fixture.column_association_resolver,
+            semantic_manifest_lookup=fixture.semantic_manifest_lookup,
+        ),
+        column_association_resolver=fixture.column_association_resolver,
+        source_node_builder=fixture.source_node_builder,
+        precompute_multi_hop_join_candidates=True,
+    )
+
+    def _multi_hop_join_node_ids(metric_name: str) -> Set[str]:
+        dataflow_plan = dataflow_plan_builder.build_plan(
+            MetricFlowQuerySpec(
+                metric_specs=(MetricSpec(element_name=metric_name),),
+                dimension_specs=(
+                    DimensionSpec(
+                        element_name="customer_name",
+                        entity_links=(
+                            EntityReference(element_name="account_id"),
+                            EntityReference(element_name="customer_id"),
+                        ),
+                    ),
+                ),
+            )
+        )
+        join_node_ids: Set[str] = set()
+        nodes_to_visit: List[DataflowPlanNode] = [dataflow_plan.sink_node]
+        while len(nodes_to_visit) > 0:
+            node = nodes_to_visit.pop()
+            if isinstance(node, JoinOnEntitiesNode):
+                join_node_ids.add(node.node_id.id_str)
+            nodes_to_visit.extend(node.parent_nodes)
+        return join_node_ids
+
+    # Nodes created for a query get new IDs, so only the precomputed multi-hop join node should be in both plans.
+    assert len(_multi_hop_join_node_ids("txn_count").intersection(_multi_hop_join_node_ids("txn_count"))) == 1
+
+
 @pytest.mark.sql_engine_snapshot
 def test_where_constrained_plan(
     request: FixtureRequest,
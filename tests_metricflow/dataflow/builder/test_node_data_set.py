@@ -124,3 +124,51 @@ def test_joined_node_data_set(
         set_id="result0",
         spec_set=join_node_output_data_set.instance_set.spec_set,
     )
+
+
+def test_output_data_set_cache_tiers(
+    mf_engine_test_fixture_mapping: Mapping[SemanticManifestSetup, MetricFlowEngineTestFixture],
+    simple_semantic_manifest_lookup: SemanticManifestLookup,
+) -> None:
+    """Tests that source nodes stay cached while the cache for other nodes is bounded."""
+    resolver = DataflowPlanNodeOutputDataSetResolver(
+        column_association_resolver=DunderColumnAssociationResolver(simple_semantic_manifest_lookup),
+        semantic_manifest_lookup=simple_semantic_manifest_lookup,
+        query_node_cache_max_entries=1,
+    )
+    read_node_mapping = mf_engine_test_fixture_mapping[SemanticManifestSetup.SIMPLE_MANIFEST].read_node_mapping
+    revenue_node = read_node_mapping["revenue"]
+    users_node = read_node_mapping["users_latest"]
+    resolver.cache_output_data_sets((revenue_node, users_node))
+
+    join_nodes = [
+        JoinOnEntitiesNode.create(
+            left_node=revenue_node,
+            join_targets=[
+                JoinDescription(
+                    join_node=users_node,
+                    join_on_entity=LinklessEntitySpec.from_element_name("user"),
+                    join_on_partition_dimensions=(),
+                    join_on_partition_time_dimensions=(),
+                    join_type=join_type,
+                )
+            ],
+        )
+        for join_type in (SqlJoinType.LEFT_OUTER, SqlJoinType.INNER)
+    ]
+    for join_node in join_nodes:
+        resolver.get_output_data_set(join_node)
+        resolver.get_output_data_set(join_node)
+    resolver.get_output_data_set(revenue_node)
+
+    cache_stats = resolver.cache_stats
+    assert cache_stats.persistent_entry_count == 2
+    assert cache_stats.persistent_hit_count == 1
+    assert cache_stats.query_node_stats.entry_count == 1
+    assert cache_stats.query_node_stats.hit_count == 2
+    assert cache_stats.query_node_stats.miss_count == 2
+    assert cache_stats.query_node_stats.eviction_count == 1
+    assert cache_stats.hit_rate == 3 / 5
+
+    # A copy only includes the persistent tier.
+    assert resolver.copy().node_to_output_data_set.keys() == {revenue_node, users_node}
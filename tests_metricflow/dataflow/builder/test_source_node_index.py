@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from typing import Mapping, Sequence
+
+from dbt_semantic_interfaces.references import EntityReference
+from metricflow_semantics.specs.dimension_spec import DimensionSpec
+from metricflow_semantics.specs.entity_spec import EntitySpec
+from metricflow_semantics.specs.measure_spec import MeasureSpec
+
+from metricflow.dataflow.builder.node_data_set import DataflowPlanNodeOutputDataSetResolver
+from metricflow.dataflow.builder.source_node_index import SourceNodeSpecIndex
+from metricflow.dataflow.dataflow_plan import DataflowPlanNode
+from tests_metricflow.fixtures.manifest_fixtures import MetricFlowEngineTestFixture, SemanticManifestSetup
+
+
+def _node_output_resolver(fixture: MetricFlowEngineTestFixture) -> DataflowPlanNodeOutputDataSetResolver:
+    return DataflowPlanNodeOutputDataSetResolver(
+        column_association_resolver=fixture.column_association_resolver,
+        semantic_manifest_lookup=fixture.semantic_manifest_lookup,
+    )
+
+
+def _node_ids(nodes: Sequence[DataflowPlanNode]) -> Sequence[str]:
+    return [node.node_id.id_str for node in nodes]
+
+
+def test_nodes_with_all_measure_specs(  # noqa: D103
+    mf_engine_test_fixture_mapping: Mapping[SemanticManifestSetup, MetricFlowEngineTestFixture]
+) -> None:
+    fixture = mf_engine_test_fixture_mapping[SemanticManifestSetup.SIMPLE_MANIFEST]
+    source_nodes = fixture.source_node_set.source_nodes_for_metric_queries
+    resolver = _node_output_resolver(fixture)
+    index = SourceNodeSpecIndex.create(source_nodes=source_nodes, node_data_set_resolver=resolver)
+
+    for measure_specs in (
+        (MeasureSpec("bookings"),),
+        (MeasureSpec("bookings"), MeasureSpec("booking_value")),
+        (MeasureSpec("bookings"), MeasureSpec("listings")),
+        (),
+    ):
+        # The nodes should be the same as the ones found by checking each node.
+        expected_nodes = [
+            node
+            for node in source_nodes
+            if set(measure_specs).issubset(resolver.get_output_data_set(node).instance_set.spec_set.measure_specs)
+        ]
+        assert _node_ids(index.nodes_with_all_measure_specs(measure_specs)) == _node_ids(expected_nodes)
+
+    assert len(index.nodes_with_all_measure_specs((MeasureSpec("bookings"),))) > 0
+    assert len(index.nodes_with_all_measure_specs((MeasureSpec("bookings"), MeasureSpec("listings")))) == 0
+
+
+def test_nodes_with_any_linkable_spec(  # noqa: D103
+    mf_engine_test_fixture_mapping: Mapping[SemanticManifestSetup, MetricFlowEngineTestFixture]
+) -> None:
+    fixture = mf_engine_test_fixture_mapping[SemanticManifestSetup.SIMPLE_MANIFEST]
+    source_nodes = fixture.source_node_set.source_nodes_for_group_by_item_queries
+    resolver = _node_output_resolver(fixture)
+    index = SourceNodeSpecIndex.create(source_nodes=source_nodes, node_data_set_resolver=resolver)
+
+    linkable_specs = (
+        DimensionSpec(element_name="country_latest", entity_links=(EntityReference("listing"),)),
+        EntitySpec(element_name="user", entity_links=()),
+    )
+    expected_nodes = [
+        node
+        for node in source_nodes
+        if set(linkable_specs).intersection(resolver.get_output_data_set(node).instance_set.spec_set.linkable_specs)
+    ]
+    assert len(expected_nodes) > 1
+    assert _node_ids(index.nodes_with_any_linkable_spec(linkable_specs)) == _node_ids(expected_nodes)
+    assert len(index.nodes_with_any_linkable_spec(())) == 0
@@ -4,8 +4,10 @@ from typing import Mapping
 
 import pytest
 from _pytest.fixtures import FixtureRequest
+from dbt_semantic_interfaces.references import EntityReference
 from metricflow_semantics.dag.id_prefix import StaticIdPrefix
 from metricflow_semantics.dag.mf_dag import DagId
+from metricflow_semantics.specs.dimension_spec import DimensionSpec
 from metricflow_semantics.specs.measure_spec import MeasureSpec
 from metricflow_semantics.specs.spec_set import InstanceSpecSet
 from metricflow_semantics.test_helpers.config_helpers import MetricFlowTestConfiguration
@@ -97,3 +99,43 @@ def test_filter_combination(
         mf_test_configuration=mf_test_configuration,
         dag_graph=dataflow_plan,
     )
+
+
+def test_combination_signature(
+    mf_engine_test_fixture_mapping: Mapping[SemanticManifestSetup, MetricFlowEngineTestFixture],
+) -> None:
+    """Tests that branches that can be combined have the same signature, and ones that can't have different ones."""
+    read_node_mapping = mf_engine_test_fixture_mapping[SemanticManifestSetup.SIMPLE_MANIFEST].read_node_mapping
+    filter0 = FilterElementsNode.create(
+        parent_node=read_node_mapping["bookings_source"],
+        include_specs=InstanceSpecSet(measure_specs=(MeasureSpec(element_name="bookings"),)),
+    )
+    filter1 = FilterElementsNode.create(
+        parent_node=read_node_mapping["bookings_source"],
+        include_specs=InstanceSpecSet(measure_specs=(MeasureSpec(element_name="booking_value"),)),
+    )
+    signature = ComputeMetricsBranchCombiner.combination_signature(filter0)
+    assert signature is not None
+    assert ComputeMetricsBranchCombiner.combination_signature(filter1) == signature
+
+    # The combined branch should have the same signature so that it can be combined with other branches.
+    combined_branch = filter1.accept(ComputeMetricsBranchCombiner(filter0)).combined_branch
+    assert combined_branch is not None
+    assert ComputeMetricsBranchCombiner.combination_signature(combined_branch) == signature
+
+    # Branches with different linkable specs or different sources can't be combined.
+    filter_with_dimension = FilterElementsNode.create(
+        parent_node=read_node_mapping["bookings_source"],
+        include_specs=InstanceSpecSet(
+            measure_specs=(MeasureSpec(element_name="bookings"),),
+            dimension_specs=(DimensionSpec(element_name="is_instant", entity_links=(EntityReference("booking"),)),),
+        ),
+    )
+    assert not filter_with_dimension.accept(ComputeMetricsBranchCombiner(filter0)).combined
+    assert ComputeMetricsBranchCombiner.combination_signature(filter_with_dimension) != signature
+    assert ComputeMetricsBranchCombiner.combination_signature(read_node_mapping["listings_latest"]) != (
+        ComputeMetricsBranchCombiner.combination_signature(read_node_mapping["bookings_source"])
+    )
+
+    # Branches with nodes that aren't handled by the combiner can't be combined with any branch.
+    assert ComputeMetricsBranchCombiner.combination_signature(WriteToResultDataTableNode.create(filter0)) is None
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from typing import List
+
+from dbt_semantic_interfaces.references import EntityReference
+from metricflow_semantics.specs.dimension_spec import DimensionSpec
+from metricflow_semantics.specs.metric_spec import MetricSpec
+from metricflow_semantics.specs.query_spec import MetricFlowQuerySpec
+from metricflow_semantics.test_helpers.metric_time_dimension import MTD_SPEC_DAY
+
+from metricflow.dataflow.builder.dataflow_plan_builder import DataflowPlanBuilder
+from metricflow.dataflow.dataflow_plan import DataflowPlan
+from metricflow.dataflow.nodes.aggregate_measures import AggregateMeasuresNode
+from metricflow.dataflow.nodes.join_to_base import JoinOnEntitiesNode
+from metricflow.dataflow.optimizer.dataflow_optimizer_factory import DataflowPlanOptimization
+
+
+def _join_nodes(dataflow_plan: DataflowPlan) -> List[JoinOnEntitiesNode]:
+    join_nodes = []
+    nodes_to_visit = [dataflow_plan.sink_node]
+    while nodes_to_visit:
+        node = nodes_to_visit.pop()
+        if isinstance(node, JoinOnEntitiesNode):
+            join_nodes.append(node)
+        nodes_to_visit.extend(node.parent_nodes)
+    return join_nodes
+
+
+def _build_plan(dataflow_plan_builder: DataflowPlanBuilder, metric_name: str) -> DataflowPlan:
+    return dataflow_plan_builder.build_plan(
+        MetricFlowQuerySpec(
+            metric_specs=(MetricSpec(element_name=metric_name),),
+            time_dimension_specs=(MTD_SPEC_DAY,),
+            dimension_specs=(
+                DimensionSpec(element_name="country_latest", entity_links=(EntityReference(element_name="listing"),)),
+            ),
+        ),
+        optimizations=frozenset((DataflowPlanOptimization.AGGREGATE_BEFORE_JOIN,)),
+    )
+
+
+def test_aggregate_before_join(dataflow_plan_builder: DataflowPlanBuilder) -> None:
+    """Tests that measures with an expansive aggregation are aggregated before the join to the dimension source."""
+    join_nodes = _join_nodes(_build_plan(dataflow_plan_builder, "booking_value"))
+    assert len(join_nodes) == 1
+    left_node = join_nodes[0].left_node
+    assert isinstance(left_node, AggregateMeasuresNode)
+    assert tuple(spec.measure_spec.element_name for spec in left_node.metric_input_measure_specs) == ("booking_value",)
+
+
+def test_non_expansive_measure_not_aggregated_before_join(dataflow_plan_builder: DataflowPlanBuilder) -> None:
+    """Tests that COUNT DISTINCT measures are not aggregated before the join, as they can't be re-aggregated."""
+    join_nodes = _join_nodes(_build_plan(dataflow_plan_builder, "bookers"))
+    assert len(join_nodes) == 1
+    assert not isinstance(join_nodes[0].left_node, AggregateMeasuresNode)
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from typing import Dict, List
+
+from metricflow_semantics.dag.mf_dag import NodeId
+from metricflow_semantics.specs.metric_spec import MetricSpec
+from metricflow_semantics.specs.query_spec import MetricFlowQuerySpec
+from metricflow_semantics.test_helpers.metric_time_dimension import MTD_SPEC_DAY
+
+from metricflow.dataflow.builder.dataflow_plan_builder import DataflowPlanBuilder
+from metricflow.dataflow.dataflow_plan import DataflowPlan, DataflowPlanNode
+from metricflow.dataflow.nodes.read_sql_source import ReadSqlSourceNode
+from metricflow.dataflow.optimizer.common_subplan_optimizer import CommonSubplanOptimizer
+from metricflow.dataflow.optimizer.source_scan.source_scan_optimizer import SourceScanOptimizer
+
+
+def _distinct_nodes(dataflow_plan: DataflowPlan) -> List[DataflowPlanNode]:
+    node_id_to_node: Dict[NodeId, DataflowPlanNode] = {}
+    nodes_to_visit = [dataflow_plan.sink_node]
+    while nodes_to_visit:
+        node = nodes_to_visit.pop()
+        if node.node_id not in node_id_to_node:
+            node_id_to_node[node.node_id] = node
+            nodes_to_visit.extend(node.parent_nodes)
+    return list(node_id_to_node.values())
+
+
+def test_nested_derived_metric(dataflow_plan_builder: DataflowPlanBuilder) -> None:
+    """Tests that the branches for the same input metrics in a nested derived metric share nodes."""
+    dataflow_plan = SourceScanOptimizer().optimize(
+        dataflow_plan_builder.build_plan(
+            MetricFlowQuerySpec(
+                metric_specs=(MetricSpec(element_name="instant_plus_non_referred_bookings_pct"),),
+                time_dimension_specs=(MTD_SPEC_DAY,),
+            )
+        )
+    )
+    optimized_dataflow_plan = CommonSubplanOptimizer().optimize(dataflow_plan)
+
+    distinct_nodes = _distinct_nodes(dataflow_plan)
+    optimized_distinct_nodes = _distinct_nodes(optimized_dataflow_plan)
+    assert len(optimized_distinct_nodes) < len(distinct_nodes)
+    assert len([node for node in optimized_distinct_nodes if isinstance(node, ReadSqlSourceNode)]) < len(
+        [node for node in distinct_nodes if isinstance(node, ReadSqlSourceNode)]
+    )
+
+    # No nodes with the same parents should be functionally identical.
+    for i, node in enumerate(optimized_distinct_nodes):
+        for other_node in optimized_distinct_nodes[i + 1 :]:
+            assert not (
+                type(node) is type(other_node)
+                and node.parent_nodes == other_node.parent_nodes
+                and node.functionally_identical(other_node)
+            )
+
+    # Running the optimizer again should not change the plan.
+    assert CommonSubplanOptimizer().optimize(optimized_dataflow_plan).sink_node is optimized_dataflow_plan.sink_node
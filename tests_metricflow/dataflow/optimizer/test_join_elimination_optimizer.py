@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+from typing import Mapping
+
+import pytest
+from dbt_semantic_interfaces.references import EntityReference
+from metricflow_semantics.dag.id_prefix import StaticIdPrefix
+from metricflow_semantics.dag.mf_dag import DagId
+from metricflow_semantics.model.semantic_manifest_lookup import SemanticManifestLookup
+from metricflow_semantics.specs.dimension_spec import DimensionSpec
+from metricflow_semantics.specs.dunder_column_association_resolver import DunderColumnAssociationResolver
+from metricflow_semantics.specs.entity_spec import EntitySpec, LinklessEntitySpec
+from metricflow_semantics.specs.measure_spec import MeasureSpec
+from metricflow_semantics.specs.spec_set import InstanceSpecSet
+from metricflow_semantics.sql.sql_join_type import SqlJoinType
+
+from metricflow.dataflow.builder.node_data_set import DataflowPlanNodeOutputDataSetResolver
+from metricflow.dataflow.dataflow_plan import DataflowPlan, DataflowPlanNode
+from metricflow.dataflow.nodes.filter_elements import FilterElementsNode
+from metricflow.dataflow.nodes.join_to_base import JoinDescription, JoinOnEntitiesNode
+from metricflow.dataflow.nodes.write_to_data_table import WriteToResultDataTableNode
+from metricflow.dataflow.optimizer.join_elimination_optimizer import JoinEliminationOptimizer
+from tests_metricflow.fixtures.manifest_fixtures import MetricFlowEngineTestFixture, SemanticManifestSetup
+
+_LISTING_SPEC = EntitySpec(element_name="listing", entity_links=())
+_LEFT_SPECS = InstanceSpecSet(measure_specs=(MeasureSpec(element_name="bookings"),), entity_specs=(_LISTING_SPEC,))
+
+
+@pytest.fixture
+def join_elimination_optimizer(  # noqa: D103
+    simple_semantic_manifest_lookup: SemanticManifestLookup,
+) -> JoinEliminationOptimizer:
+    return JoinEliminationOptimizer(
+        node_data_set_resolver=DataflowPlanNodeOutputDataSetResolver(
+            column_association_resolver=DunderColumnAssociationResolver(simple_semantic_manifest_lookup),
+            semantic_manifest_lookup=simple_semantic_manifest_lookup,
+        ),
+        semantic_model_lookup=simple_semantic_manifest_lookup.semantic_model_lookup,
+    )
+
+
+def _join_to_source(
+    mf_engine_test_fixture_mapping: Mapping[SemanticManifestSetup, MetricFlowEngineTestFixture],
+    source_name: str,
+    join_type: SqlJoinType = SqlJoinType.LEFT_OUTER,
+) -> JoinOnEntitiesNode:
+    """Returns a node that joins bookings to the given source on the listing entity."""
+    read_node_mapping = mf_engine_test_fixture_mapping[SemanticManifestSetup.SIMPLE_MANIFEST].read_node_mapping
+    return JoinOnEntitiesNode.create(
+        left_node=FilterElementsNode.create(
+            parent_node=read_node_mapping["bookings_source"], include_specs=_LEFT_SPECS
+        ),
+        join_targets=[
+            JoinDescription(
+                join_node=FilterElementsNode.create(
+                    parent_node=read_node_mapping[source_name],
+                    include_specs=InstanceSpecSet(
+                        entity_specs=(_LISTING_SPEC,),
+                        dimension_specs=(DimensionSpec(element_name="country_latest", entity_links=()),),
+                    ),
+                ),
+                join_on_entity=LinklessEntitySpec.from_element_name("listing"),
+                join_type=join_type,
+                join_on_partition_dimensions=(),
+                join_on_partition_time_dimensions=(),
+            )
+        ],
+    )
+
+
+def _optimize(optimizer: JoinEliminationOptimizer, node: DataflowPlanNode) -> DataflowPlanNode:
+    dataflow_plan = DataflowPlan(
+        sink_nodes=[WriteToResultDataTableNode.create(node)],
+        plan_id=DagId.from_id_prefix(StaticIdPrefix.OPTIMIZED_DATAFLOW_PLAN_PREFIX),
+    )
+    sink_node = optimizer.optimize(dataflow_plan).sink_node
+    assert isinstance(sink_node, WriteToResultDataTableNode)
+    return sink_node.parent_node
+
+
+def test_unused_join_removed(
+    join_elimination_optimizer: JoinEliminationOptimizer,
+    mf_engine_test_fixture_mapping: Mapping[SemanticManifestSetup, MetricFlowEngineTestFixture],
+) -> None:
+    """Tests that a join to a source with a primary entity is removed if none of its columns are used."""
+    join_node = _join_to_source(mf_engine_test_fixture_mapping, "listings_latest")
+    optimized_node = _optimize(
+        join_elimination_optimizer, FilterElementsNode.create(parent_node=join_node, include_specs=_LEFT_SPECS)
+    )
+
+    assert isinstance(optimized_node, FilterElementsNode)
+    assert optimized_node.include_specs == _LEFT_SPECS
+    assert optimized_node.parent_node == join_node.left_node
+
+
+def test_used_join_kept(
+    join_elimination_optimizer: JoinEliminationOptimizer,
+    mf_engine_test_fixture_mapping: Mapping[SemanticManifestSetup, MetricFlowEngineTestFixture],
+) -> None:
+    """Tests that a join is kept if one of the columns from the joined node is used."""
+    join_node = _join_to_source(mf_engine_test_fixture_mapping, "listings_latest")
+    filter_node = FilterElementsNode.create(
+        parent_node=join_node,
+        include_specs=_LEFT_SPECS.merge(
+            InstanceSpecSet(
+                dimension_specs=(
+                    DimensionSpec(element_name="country_latest", entity_links=(EntityReference("listing"),)),
+                )
+            )
+        ),
+    )
+    assert _optimize(join_elimination_optimizer, filter_node) is filter_node
+
+
+@pytest.mark.parametrize(
+    ("source_name", "join_type"),
+    (
+        # `listing` is a foreign entity in the bookings source, so the join can add rows.
+        ("bookings_source", SqlJoinType.LEFT_OUTER),
+        # An inner join can remove rows.
+        ("listings_latest", SqlJoinType.INNER),
+    ),
+)
+def test_join_changing_rows_kept(
+    join_elimination_optimizer: JoinEliminationOptimizer,
+    mf_engine_test_fixture_mapping: Mapping[SemanticManifestSetup, MetricFlowEngineTestFixture],
+    source_name: str,
+    join_type: SqlJoinType,
+) -> None:
+    """Tests that joins are kept if they can change the rows from the left side, even if their columns are unused."""
+    join_node = _join_to_source(mf_engine_test_fixture_mapping, source_name, join_type)
+    filter_node = FilterElementsNode.create(parent_node=join_node, include_specs=_LEFT_SPECS)
+    assert _optimize(join_elimination_optimizer, filter_node) is filter_node
@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from metricflow.engine.file_helpers import write_file_atomically
+
+
+def test_write_file_atomically(tmp_path: Path) -> None:  # noqa: D103
+    file_path = tmp_path / "directory" / "file.txt"
+    write_file_atomically(file_path, b"first")
+    write_file_atomically(file_path, b"second")
+    assert file_path.read_bytes() == b"second"
+    assert [path.name for path in file_path.parent.iterdir()] == ["file.txt"]
+
+
+def test_temporary_file_removed_on_error(tmp_path: Path) -> None:  # noqa: D103
+    file_path = tmp_path / "file.txt"
+    write_file_atomically(file_path, b"first")
+    with pytest.raises(TypeError):
+        write_file_atomically(file_path, "not bytes")  # type: ignore[arg-type]
+    assert file_path.read_bytes() == b"first"
+    assert [path.name for path in tmp_path.iterdir()] == ["file.txt"]
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import pathlib
+
+from dbt_semantic_interfaces.references import SemanticModelReference
+from metricflow_semantics.model.semantic_manifest_lookup import SemanticManifestLookup
+
+from metricflow.engine.table_statistics import SqlTableStatisticsProvider
+from metricflow.protocols.sql_client import SqlClient
+
+
+def test_collect_and_load_statistics(  # noqa: D103
+    tmp_path: pathlib.Path,
+    simple_semantic_manifest_lookup: SemanticManifestLookup,
+    sql_client: SqlClient,
+    create_source_tables: bool,
+) -> None:
+    semantic_model_reference = SemanticModelReference("listings_latest")
+    semantic_model = simple_semantic_manifest_lookup.semantic_model_lookup.get_by_reference(semantic_model_reference)
+    assert semantic_model is not None
+    relation_name = semantic_model.node_relation.relation_name
+
+    cache_file_path = tmp_path / "table_statistics.json"
+    statistics_provider = SqlTableStatisticsProvider(
+        sql_client=sql_client,
+        semantic_manifest_lookup=simple_semantic_manifest_lookup,
+        cache_file_path=cache_file_path,
+    )
+    assert statistics_provider.get_statistics(semantic_model_reference) is None
+    statistics_provider.collect([semantic_model_reference])
+
+    statistics = statistics_provider.get_statistics(semantic_model_reference)
+    assert statistics is not None
+    assert statistics.row_count == sql_client.query(f"SELECT COUNT(*) FROM {relation_name}").get_cell_value(0, 0)
+    assert statistics.entity_distinct_value_counts["listing"] == sql_client.query(
+        f"SELECT COUNT(DISTINCT listing_id) FROM {relation_name}"
+    ).get_cell_value(0, 0)
+    assert statistics_provider.get_statistics(SemanticModelReference("bookings_source")) is None
+
+    # The statistics should be loaded from the file without querying the table.
+    loaded_statistics_provider = SqlTableStatisticsProvider(
+        sql_client=sql_client,
+        semantic_manifest_lookup=simple_semantic_manifest_lookup,
+        cache_file_path=cache_file_path,
+    )
+    assert loaded_statistics_provider.get_statistics(semantic_model_reference) == statistics
+
+
+def test_ignore_corrupt_statistics_file(  # noqa: D103
+    tmp_path: pathlib.Path, simple_semantic_manifest_lookup: SemanticManifestLookup, sql_client: SqlClient
+) -> None:
+    cache_file_path = tmp_path / "table_statistics.json"
+    cache_file_path.write_text("not statistics")
+    statistics_provider = SqlTableStatisticsProvider(
+        sql_client=sql_client,
+        semantic_manifest_lookup=simple_semantic_manifest_lookup,
+        cache_file_path=cache_file_path,
+    )
+    assert statistics_provider.get_statistics(SemanticModelReference("listings_latest")) is None
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import os
+import pathlib
+import subprocess
+import sys
+
+import pytest
+from dbt_semantic_interfaces.test_utils import as_datetime
+from metricflow_semantics.model.semantic_manifest_lookup import SemanticManifestLookup
+from metricflow_semantics.test_helpers.manifest_helpers import load_semantic_manifest
+from metricflow_semantics.test_helpers.semantic_manifest_yamls.simple_manifest import SIMPLE_MANIFEST_ANCHOR
+from metricflow_semantics.test_helpers.time_helpers import ConfigurableTimeSource
+
+from metricflow.engine.cache import semantic_manifest_fingerprint
+from metricflow.engine.metricflow_engine import MetricFlowEngine, MetricFlowQueryRequest
+from metricflow.engine.warm_start import EngineSetupSnapshot
+from metricflow.protocols.sql_client import SqlClient
+from metricflow.sql_clients.duckdb_client import DuckDbSqlClient
+
+
+def test_save_and_load_setup_snapshot(  # noqa: D103
+    tmp_path: pathlib.Path,
+    simple_semantic_manifest_lookup: SemanticManifestLookup,
+    sql_client: SqlClient,
+) -> None:
+    semantic_manifest = simple_semantic_manifest_lookup.semantic_manifest
+    assert EngineSetupSnapshot.load(tmp_path, semantic_manifest) is None
+
+    mf_engine = MetricFlowEngine(
+        semantic_manifest_lookup=simple_semantic_manifest_lookup,
+        sql_client=sql_client,
+        time_source=ConfigurableTimeSource(as_datetime("2020-01-01")),
+    )
+    mf_engine.create_setup_snapshot().save(tmp_path)
+
+    snapshot = EngineSetupSnapshot.load(tmp_path, semantic_manifest)
+    assert snapshot is not None
+    warm_started_mf_engine = MetricFlowEngine(
+        semantic_manifest_lookup=snapshot.semantic_manifest_lookup,
+        sql_client=sql_client,
+        time_source=ConfigurableTimeSource(as_datetime("2020-01-01")),
+        setup_snapshot=snapshot,
+    )
+
+    mf_request = MetricFlowQueryRequest.create_with_random_request_id(
+        metric_names=["bookings", "listings"], group_by_names=["metric_time", "listing__country_latest"]
+    )
+    assert (
+        warm_started_mf_engine.explain(mf_request).rendered_sql.sql_query
+        == mf_engine.explain(mf_request).rendered_sql.sql_query
+    )
+
+
+def test_ignore_corrupt_setup_snapshot(  # noqa: D103
+    tmp_path: pathlib.Path, simple_semantic_manifest_lookup: SemanticManifestLookup
+) -> None:
+    semantic_manifest = simple_semantic_manifest_lookup.semantic_manifest
+    EngineSetupSnapshot.snapshot_file_path(tmp_path, semantic_manifest_fingerprint(semantic_manifest)).write_bytes(
+        b"not a snapshot"
+    )
+    assert EngineSetupSnapshot.load(tmp_path, semantic_manifest) is None
+
+
+def _save_or_load_setup_snapshot_in_process(directory: str, save: bool) -> None:
+    """Saves a snapshot for the simple manifest, or exits with an error if one can't be loaded.
+
+    Run in a separate process by `test_load_setup_snapshot_in_another_process`.
+    """
+    semantic_manifest = load_semantic_manifest(
+        SIMPLE_MANIFEST_ANCHOR.directory, template_mapping={"source_schema": "source_schema"}
+    )
+    if save:
+        MetricFlowEngine(
+            semantic_manifest_lookup=SemanticManifestLookup(semantic_manifest), sql_client=DuckDbSqlClient.create()
+        ).create_setup_snapshot().save(pathlib.Path(directory))
+    elif EngineSetupSnapshot.load(pathlib.Path(directory), semantic_manifest) is None:
+        sys.exit("The snapshot was not loaded.")
+
+
+def test_load_setup_snapshot_in_another_process(tmp_path: pathlib.Path) -> None:
+    """Tests that a snapshot saved by one process is loaded by another that uses a different hash seed.
+
+    Some lists in the manifest are created from sets, so their order depends on the hash seed.
+    """
+    pytest.importorskip("duckdb")
+    pytest.importorskip("pyarrow")
+    for python_hash_seed, save in (("1", True), ("2", False)):
+        subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                f"from {__name__} import _save_or_load_setup_snapshot_in_process; "
+                f"_save_or_load_setup_snapshot_in_process({str(tmp_path)!r}, save={save})",
+            ],
+            env={**os.environ, "PYTHONHASHSEED": python_hash_seed, "PYTHONPATH": os.pathsep.join(sys.path)},
+            check=True,
+        )
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import ClassVar
+
+import pytest
+from metricflow_semantics.dag.mf_dag import DagId
+
+from metricflow.execution.execution_plan import ExecutionPlan, TaskExecutionResult
+from metricflow.execution.executor import ParallelPlanExecutor
+from tests_metricflow.execution.noop_task import NoOpExecutionPlanTask
+
+
+@dataclass(frozen=True)
+class _ExceptionRaisingTask(NoOpExecutionPlanTask):
+    """A task that raises an exception instead of returning a result."""
+
+    def execute(self) -> TaskExecutionResult:  # noqa: D102
+        raise RuntimeError("Expected exception")
+
+
+@dataclass(frozen=True)
+class _BarrierTask(NoOpExecutionPlanTask):
+    """A task that waits until the other task using the barrier is running, so it only completes if run concurrently."""
+
+    BARRIER: ClassVar[threading.Barrier] = threading.Barrier(2)
+
+    def execute(self) -> TaskExecutionResult:  # noqa: D102
+        start_time = time.time()
+        self.BARRIER.wait(timeout=30)
+        end_time = time.time()
+        return TaskExecutionResult(start_time=start_time, end_time=end_time)
+
+
+def test_task_with_parents() -> None:
+    """Tests a plan with a task that has 2 direct parents, which should run at the same time."""
+    parent_task1 = _BarrierTask(parent_nodes=(), sql_query=None)
+    parent_task2 = _BarrierTask(parent_nodes=(), sql_query=None)
+    leaf_task = NoOpExecutionPlanTask.create(parent_tasks=[parent_task1, parent_task2])
+    execution_plan = ExecutionPlan(leaf_tasks=[leaf_task], dag_id=DagId.from_str("plan0"))
+    results = ParallelPlanExecutor(max_workers=2).execute_plan(execution_plan)
+
+    parent_result1 = results.get_result(parent_task1.task_id)
+    parent_result2 = results.get_result(parent_task2.task_id)
+    leaf_result = results.get_result(leaf_task.task_id)
+
+    # The parents only complete if they overlapped. Check that they completed before the leaf started.
+    assert parent_result1.end_time <= leaf_result.start_time
+    assert parent_result2.end_time <= leaf_result.start_time
+
+    assert not results.contains_task_errors
+
+
+def test_shared_parent_task() -> None:
+    """Check that a task that's a parent of multiple tasks is run once."""
+    shared_task = NoOpExecutionPlanTask.create()
+    middle_task1 = NoOpExecutionPlanTask.create(parent_tasks=[shared_task])
+    middle_task2 = NoOpExecutionPlanTask.create(parent_tasks=[shared_task])
+    leaf_task = NoOpExecutionPlanTask.create(parent_tasks=[middle_task1, middle_task2])
+    execution_plan = ExecutionPlan(leaf_tasks=[leaf_task], dag_id=DagId.from_str("plan0"))
+    results = ParallelPlanExecutor().execute_plan(execution_plan)
+
+    assert len(results.all_results()) == 4
+    assert not results.contains_task_errors
+
+
+def test_parent_task_error() -> None:
+    """Check that the tasks that have not started are cancelled if a task fails."""
+    parent_task1 = NoOpExecutionPlanTask.create(should_error=True)
+    parent_task2 = NoOpExecutionPlanTask.create()
+    leaf_task = NoOpExecutionPlanTask.create(parent_tasks=[parent_task1, parent_task2])
+    execution_plan = ExecutionPlan(leaf_tasks=[leaf_task], dag_id=DagId.from_str("plan0"))
+
+    # With one worker, the second parent is queued while the first one runs.
+    results = ParallelPlanExecutor(max_workers=1).execute_plan(execution_plan)
+    assert len(results.all_results()) == 1
+    assert results.get_result(parent_task1.task_id).errors[0] == NoOpExecutionPlanTask.EXAMPLE_ERROR
+
+
+def test_task_exception() -> None:
+    """Check that an exception raised by a task is raised to the caller."""
+    parent_task = _ExceptionRaisingTask(parent_nodes=(), sql_query=None)
+    leaf_task = NoOpExecutionPlanTask.create(parent_tasks=[parent_task])
+    execution_plan = ExecutionPlan(leaf_tasks=[leaf_task], dag_id=DagId.from_str("plan0"))
+
+    with pytest.raises(RuntimeError, match="Expected exception"):
+        ParallelPlanExecutor().execute_plan(execution_plan)
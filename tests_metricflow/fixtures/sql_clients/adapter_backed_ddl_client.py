@@ -39,7 +39,7 @@ class AdapterBackedDDLSqlClient(AdapterBackedSqlClient):
         )
         start_time = time.time()
 
-        with self._adapter.connection_named("MetricFlow_create_from_dataframe"):
+        with self._connection_named("MetricFlow_create_from_dataframe"):
             # Create table
             columns_to_insert = []
             for column_description in df.column_descriptions:
@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from dbt_semantic_interfaces.test_utils import as_datetime
+from metricflow_semantics.model.semantic_manifest_lookup import SemanticManifestLookup
+from metricflow_semantics.random_id import random_id
+from metricflow_semantics.sql.sql_bind_parameters import SqlBindParameters
+from metricflow_semantics.sql.sql_table import SqlTable
+from metricflow_semantics.test_helpers.config_helpers import MetricFlowTestConfiguration
+from metricflow_semantics.test_helpers.time_helpers import ConfigurableTimeSource
+
+from metricflow.data_table.mf_table import MetricFlowDataTable
+from metricflow.engine.async_metricflow_engine import AsyncMetricFlowEngine, PlanningOnlySqlClient
+from metricflow.engine.metricflow_engine import MetricFlowEngine, MetricFlowExplainResult, MetricFlowQueryRequest
+from metricflow.execution.execution_plan import (
+    ExecutionPlan,
+    SelectSqlQueryToDataTableTask,
+    SelectSqlQueryToTableTask,
+    SqlQuery,
+)
+from metricflow.protocols.sql_client import SqlClient, SqlEngine
+from metricflow.sql.render.sql_plan_renderer import SqlQueryPlanRenderer
+from tests_metricflow.integration.conftest import IntegrationTestHelpers
+
+
+class _ThreadedAsyncSqlClient:
+    """An `AsyncSqlClient` that runs the methods of a `SqlClient` in a thread."""
+
+    def __init__(self, sql_client: SqlClient) -> None:  # noqa: D107
+        self._sql_client = sql_client
+        self.query_count = 0
+
+    @property
+    def sql_engine_type(self) -> SqlEngine:  # noqa: D102
+        return self._sql_client.sql_engine_type
+
+    @property
+    def sql_query_plan_renderer(self) -> SqlQueryPlanRenderer:  # noqa: D102
+        return self._sql_client.sql_query_plan_renderer
+
+    async def query(  # noqa: D102
+        self, stmt: str, sql_bind_parameters: SqlBindParameters = SqlBindParameters()
+    ) -> MetricFlowDataTable:
+        self.query_count += 1
+        return await asyncio.get_running_loop().run_in_executor(
+            None, lambda: self._sql_client.query(stmt, sql_bind_parameters)
+        )
+
+    async def execute(  # noqa: D102
+        self, stmt: str, sql_bind_parameters: SqlBindParameters = SqlBindParameters()
+    ) -> None:
+        await asyncio.get_running_loop().run_in_executor(
+            None, lambda: self._sql_client.execute(stmt, sql_bind_parameters)
+        )
+
+    async def dry_run(  # noqa: D102
+        self, stmt: str, sql_bind_parameters: SqlBindParameters = SqlBindParameters()
+    ) -> None:
+        await asyncio.get_running_loop().run_in_executor(
+            None, lambda: self._sql_client.dry_run(stmt, sql_bind_parameters)
+        )
+
+    async def close(self) -> None:  # noqa: D102
+        pass
+
+    def render_bind_parameter_key(self, bind_parameter_key: str) -> str:  # noqa: D102
+        return self._sql_client.render_bind_parameter_key(bind_parameter_key)
+
+
+def _create_async_mf_engine(
+    semantic_manifest_lookup: SemanticManifestLookup,
+    async_sql_client: _ThreadedAsyncSqlClient,
+    planning_executor: ThreadPoolExecutor,
+    result_cache_max_entries: int = 0,
+) -> AsyncMetricFlowEngine:
+    mf_engine = MetricFlowEngine(
+        semantic_manifest_lookup=semantic_manifest_lookup,
+        sql_client=PlanningOnlySqlClient(async_sql_client),
+        time_source=ConfigurableTimeSource(as_datetime("2020-01-01")),
+        result_cache_max_entries=result_cache_max_entries,
+    )
+    return AsyncMetricFlowEngine(mf_engine=mf_engine, sql_client=async_sql_client, planning_executor=planning_executor)
+
+
+def test_async_query(  # noqa: D103
+    it_helpers: IntegrationTestHelpers,
+    simple_semantic_manifest_lookup: SemanticManifestLookup,
+    sql_client: SqlClient,
+) -> None:
+    mf_request = MetricFlowQueryRequest.create_with_random_request_id(
+        metric_names=["bookings"], group_by_names=["metric_time"]
+    )
+    expected_result = it_helpers.mf_engine.query(mf_request)
+
+    with ThreadPoolExecutor(max_workers=2) as planning_executor:
+        async_mf_engine = _create_async_mf_engine(
+            simple_semantic_manifest_lookup, _ThreadedAsyncSqlClient(sql_client), planning_executor
+        )
+        results = asyncio.run(async_mf_engine.query_many([mf_request, mf_request], max_concurrency=2))
+
+    assert expected_result.result_df is not None
+    for result in results:
+        assert result.sql == expected_result.sql
+        assert result.result_df is not None
+        assert sorted(result.result_df.rows, key=str) == sorted(expected_result.result_df.rows, key=str)
+
+
+def test_async_query_uses_result_cache(  # noqa: D103
+    simple_semantic_manifest_lookup: SemanticManifestLookup,
+    sql_client: SqlClient,
+) -> None:
+    mf_request = MetricFlowQueryRequest.create_with_random_request_id(
+        metric_names=["bookings"], group_by_names=["metric_time"]
+    )
+    async_sql_client = _ThreadedAsyncSqlClient(sql_client)
+
+    with ThreadPoolExecutor(max_workers=1) as planning_executor:
+        async_mf_engine = _create_async_mf_engine(
+            simple_semantic_manifest_lookup, async_sql_client, planning_executor, result_cache_max_entries=10
+        )
+        first_result = asyncio.run(async_mf_engine.query(mf_request))
+        second_result = asyncio.run(async_mf_engine.query(mf_request))
+
+    assert async_sql_client.query_count == 1
+    assert second_result.result_df is first_result.result_df
+
+
+def test_async_query_with_multiple_tasks(  # noqa: D103
+    mf_test_configuration: MetricFlowTestConfiguration,
+    simple_semantic_manifest_lookup: SemanticManifestLookup,
+    sql_client: SqlClient,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    mf_engine = MetricFlowEngine(
+        semantic_manifest_lookup=simple_semantic_manifest_lookup,
+        sql_client=sql_client,
+        time_source=ConfigurableTimeSource(as_datetime("2020-01-01")),
+    )
+    output_table = SqlTable(schema_name=mf_test_configuration.mf_system_schema, table_name=f"test_table_{random_id()}")
+    create_table_task = SelectSqlQueryToTableTask.create(
+        sql_client=sql_client,
+        sql_query=SqlQuery(
+            sql_query=f"CREATE TABLE {output_table.sql} AS SELECT 1 AS foo", bind_parameters=SqlBindParameters()
+        ),
+        output_table=output_table,
+    )
+    sink_task = SelectSqlQueryToDataTableTask.create(
+        sql_client=sql_client,
+        sql_query=SqlQuery(sql_query=f"SELECT foo FROM {output_table.sql}", bind_parameters=SqlBindParameters()),
+        parent_nodes=(create_table_task,),
+    )
+
+    # Replace the plan for the request with one where the result depends on a table created by another task.
+    def _explain_with_multiple_tasks(mf_request: MetricFlowQueryRequest) -> MetricFlowExplainResult:
+        explain_result = MetricFlowEngine.explain(mf_engine, mf_request)
+        return dataclasses.replace(
+            explain_result,
+            convert_to_execution_plan_result=dataclasses.replace(
+                explain_result.convert_to_execution_plan_result,
+                execution_plan=ExecutionPlan(leaf_tasks=(sink_task,)),
+            ),
+        )
+
+    monkeypatch.setattr(mf_engine, "explain", _explain_with_multiple_tasks)
+    mf_request = MetricFlowQueryRequest.create_with_random_request_id(
+        metric_names=["bookings"], group_by_names=["metric_time"]
+    )
+
+    try:
+        with ThreadPoolExecutor(max_workers=1) as planning_executor:
+            async_mf_engine = AsyncMetricFlowEngine(
+                mf_engine=mf_engine, sql_client=_ThreadedAsyncSqlClient(sql_client), planning_executor=planning_executor
+            )
+            explain_result = asyncio.run(async_mf_engine.explain(mf_request))
+            result = asyncio.run(async_mf_engine.query(mf_request))
+    finally:
+        sql_client.execute(f"DROP TABLE IF EXISTS {output_table.sql}")
+
+    assert explain_result.rendered_sql == sink_task.sql_query
+    assert result.result_df is not None
+    assert result.result_df.rows == ((1,),)
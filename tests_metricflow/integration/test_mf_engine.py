@@ -1,10 +1,24 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
 from _pytest.fixtures import FixtureRequest
+from dbt_semantic_interfaces.references import SemanticModelReference
+from dbt_semantic_interfaces.test_utils import as_datetime
+from metricflow_semantics.errors.error_classes import SqlBindParametersNotSupportedError
+from metricflow_semantics.model.semantic_manifest_lookup import SemanticManifestLookup
+from metricflow_semantics.query.query_exceptions import InvalidQueryException
 from metricflow_semantics.test_helpers.config_helpers import MetricFlowTestConfiguration
+from metricflow_semantics.test_helpers.time_helpers import ConfigurableTimeSource
 
+from metricflow.dataflow.optimizer.dataflow_optimizer_factory import DataflowPlanOptimization
+from metricflow.engine.metricflow_engine import MetricFlowEngine, MetricFlowQueryRequest
+from metricflow.protocols.sql_client import SqlClient
+from metricflow.sql.render.sql_plan_renderer import SqlCteRenderingOptions
 from tests_metricflow.integration.conftest import IntegrationTestHelpers
 from tests_metricflow.snapshot_utils import assert_object_snapshot_equal
+from tests_metricflow.sql.compare_data_table import assert_data_tables_equal
 
 
 def test_list_dimensions(  # noqa: D103
@@ -16,3 +30,297 @@ def test_list_dimensions(  # noqa: D103
         obj_id="result0",
         obj=sorted([dim.qualified_name for dim in it_helpers.mf_engine.list_dimensions()]),
     )
+
+
+def test_plan_cache(  # noqa: D103
+    simple_semantic_manifest_lookup: SemanticManifestLookup,
+    sql_client: SqlClient,
+) -> None:
+    mf_engine = MetricFlowEngine(
+        semantic_manifest_lookup=simple_semantic_manifest_lookup,
+        sql_client=sql_client,
+        time_source=ConfigurableTimeSource(as_datetime("2020-01-01")),
+        plan_cache_max_entries=1,
+    )
+    plan_cache = mf_engine.plan_cache
+    assert plan_cache is not None
+
+    explain_result = mf_engine.explain(
+        MetricFlowQueryRequest.create_with_random_request_id(metric_names=["bookings"], group_by_names=["metric_time"])
+    )
+    # A request with a different request ID should use the cached plan.
+    assert (
+        mf_engine.explain(
+            MetricFlowQueryRequest.create_with_random_request_id(
+                metric_names=["bookings"], group_by_names=["metric_time"]
+            )
+        )
+        is explain_result
+    )
+    # The order of the metrics determines the order of the output columns, so it should be a different entry.
+    reordered_explain_result = mf_engine.explain(
+        MetricFlowQueryRequest.create_with_random_request_id(
+            metric_names=["booking_value", "bookings"], group_by_names=["metric_time"]
+        )
+    )
+    assert reordered_explain_result is not explain_result
+
+    stats = plan_cache.stats
+    assert stats.hit_count == 1
+    assert stats.miss_count == 2
+    assert stats.eviction_count == 1
+    assert stats.entry_count == 1
+
+
+def test_source_node_recipe_cache(
+    simple_semantic_manifest_lookup: SemanticManifestLookup, sql_client: SqlClient
+) -> None:
+    """Check that cached source node recipes are used across queries and produce the same SQL as without the cache."""
+    mf_engine = MetricFlowEngine(
+        semantic_manifest_lookup=simple_semantic_manifest_lookup,
+        sql_client=sql_client,
+        time_source=ConfigurableTimeSource(as_datetime("2020-01-01")),
+        source_node_recipe_cache_max_entries=10,
+    )
+    non_caching_mf_engine = MetricFlowEngine(
+        semantic_manifest_lookup=simple_semantic_manifest_lookup,
+        sql_client=sql_client,
+        time_source=ConfigurableTimeSource(as_datetime("2020-01-01")),
+    )
+    recipe_cache = mf_engine.source_node_recipe_cache
+    assert recipe_cache is not None
+
+    def _create_request(limit: int) -> MetricFlowQueryRequest:
+        return MetricFlowQueryRequest.create_with_random_request_id(
+            metric_names=["bookings", "views"],
+            group_by_names=["metric_time__day", "listing__country_latest"],
+            where_constraint="{{ Dimension('listing__country_latest') }} = 'us'",
+            limit=limit,
+        )
+
+    for limit in (10, 20):
+        assert (
+            mf_engine.explain(_create_request(limit)).rendered_sql.sql_query
+            == non_caching_mf_engine.explain(_create_request(limit)).rendered_sql.sql_query
+        )
+
+    stats = recipe_cache.stats
+    assert stats.entry_count > 0
+    assert stats.hit_count == stats.entry_count
+
+
+def test_precompute_multi_hop_join_candidates(
+    partitioned_multi_hop_join_semantic_manifest_lookup: SemanticManifestLookup, sql_client: SqlClient
+) -> None:
+    """Check that using precomputed multi-hop join nodes produces the same SQL as without them."""
+    mf_engine = MetricFlowEngine(
+        semantic_manifest_lookup=partitioned_multi_hop_join_semantic_manifest_lookup,
+        sql_client=sql_client,
+        time_source=ConfigurableTimeSource(as_datetime("2020-01-01")),
+        precompute_multi_hop_join_candidates=True,
+    )
+    non_precomputing_mf_engine = MetricFlowEngine(
+        semantic_manifest_lookup=partitioned_multi_hop_join_semantic_manifest_lookup,
+        sql_client=sql_client,
+        time_source=ConfigurableTimeSource(as_datetime("2020-01-01")),
+    )
+
+    mf_request = MetricFlowQueryRequest.create_with_random_request_id(
+        metric_names=["txn_count"], group_by_names=["account_id__customer_id__customer_name"]
+    )
+    assert (
+        mf_engine.explain(mf_request).rendered_sql.sql_query
+        == non_precomputing_mf_engine.explain(mf_request).rendered_sql.sql_query
+    )
+
+
+def test_result_cache(  # noqa: D103
+    it_helpers: IntegrationTestHelpers,
+    simple_semantic_manifest_lookup: SemanticManifestLookup,
+    sql_client: SqlClient,
+) -> None:
+    mf_engine = MetricFlowEngine(
+        semantic_manifest_lookup=simple_semantic_manifest_lookup,
+        sql_client=sql_client,
+        time_source=ConfigurableTimeSource(as_datetime("2020-01-01")),
+        result_cache_max_entries=10,
+    )
+    result_cache = mf_engine.result_cache
+    assert result_cache is not None
+
+    bookings_result = mf_engine.query(
+        MetricFlowQueryRequest.create_with_random_request_id(metric_names=["bookings"], group_by_names=["metric_time"])
+    )
+    cached_bookings_result = mf_engine.query(
+        MetricFlowQueryRequest.create_with_random_request_id(metric_names=["bookings"], group_by_names=["metric_time"])
+    )
+    assert cached_bookings_result.result_df is bookings_result.result_df
+    assert cached_bookings_result.sql == bookings_result.sql
+
+    mf_engine.query(
+        MetricFlowQueryRequest.create_with_random_request_id(metric_names=["listings"], group_by_names=["metric_time"])
+    )
+    stats = result_cache.stats
+    assert stats.hit_count == 1
+    assert stats.miss_count == 2
+    assert stats.entry_count == 2
+
+    # Only the result of the query that reads from the bookings semantic model should be removed.
+    assert result_cache.invalidate(SemanticModelReference("bookings_source")) == 1
+    assert result_cache.stats.entry_count == 1
+    assert (
+        mf_engine.query(
+            MetricFlowQueryRequest.create_with_random_request_id(
+                metric_names=["bookings"], group_by_names=["metric_time"]
+            )
+        ).result_df
+        is not bookings_result.result_df
+    )
+
+    assert result_cache.invalidate() == 2
+    assert result_cache.stats.entry_count == 0
+
+
+def test_render_literals_as_bind_parameters(  # noqa: D103
+    it_helpers: IntegrationTestHelpers,
+    simple_semantic_manifest_lookup: SemanticManifestLookup,
+    sql_client: SqlClient,
+) -> None:
+    try:
+        sql_client.render_bind_parameter_key("key")
+    except SqlBindParametersNotSupportedError:
+        pytest.skip(f"Bind parameters are not supported by the client for {sql_client.sql_engine_type}.")
+    mf_engine = MetricFlowEngine(
+        semantic_manifest_lookup=simple_semantic_manifest_lookup,
+        sql_client=sql_client,
+        time_source=ConfigurableTimeSource(as_datetime("2020-01-01")),
+        render_literals_as_bind_parameters=True,
+    )
+
+    def _create_request(country: str) -> MetricFlowQueryRequest:
+        return MetricFlowQueryRequest.create_with_random_request_id(
+            metric_names=["bookings"],
+            group_by_names=["metric_time__day"],
+            where_constraint=f"{{{{ Dimension('listing__country_latest') }}}} = '{country}'",
+            time_constraint_start=as_datetime("2019-12-01"),
+            time_constraint_end=as_datetime("2020-01-02"),
+        )
+
+    us_result = mf_engine.query(_create_request("us"))
+    ca_result = mf_engine.query(_create_request("ca"))
+    # Only the bind parameters should be different.
+    assert us_result.sql == ca_result.sql
+    assert "'us'" not in (us_result.sql or "")
+
+    for mf_request, result in ((_create_request("us"), us_result), (_create_request("ca"), ca_result)):
+        expected_result = it_helpers.mf_engine.query(mf_request)
+        assert result.result_df is not None and expected_result.result_df is not None
+        assert sorted(result.result_df.rows, key=str) == sorted(expected_result.result_df.rows, key=str)
+
+
+def test_cte_rendering(
+    it_helpers: IntegrationTestHelpers,
+    simple_semantic_manifest_lookup: SemanticManifestLookup,
+    sql_client: SqlClient,
+) -> None:
+    """Check that rendering shared sub-queries as CTEs produces the same results as rendering them inline."""
+    mf_engine = MetricFlowEngine(
+        semantic_manifest_lookup=simple_semantic_manifest_lookup,
+        sql_client=sql_client,
+        time_source=ConfigurableTimeSource(as_datetime("2020-01-01")),
+        cte_rendering_options=SqlCteRenderingOptions(),
+    )
+    mf_request = MetricFlowQueryRequest.create_with_random_request_id(
+        metric_names=["booking_fees_since_start_of_month"], group_by_names=["metric_time__day"]
+    )
+    result = mf_engine.query(mf_request)
+    expected_result = it_helpers.mf_engine.query(mf_request)
+
+    assert result.sql is not None and expected_result.sql is not None
+    assert result.sql.startswith("WITH ")
+    assert len(result.sql) < len(expected_result.sql)
+    assert result.result_df is not None and expected_result.result_df is not None
+    assert result.result_df.column_names == expected_result.result_df.column_names
+    assert sorted(result.result_df.rows, key=str) == sorted(expected_result.result_df.rows, key=str)
+
+
+def test_aggregate_before_join(it_helpers: IntegrationTestHelpers) -> None:
+    """Check that aggregating measures before joins produces the same results as aggregating after the joins."""
+    mf_request = MetricFlowQueryRequest.create_with_random_request_id(
+        metric_names=["bookings", "booking_value", "max_booking_value", "min_booking_value"],
+        group_by_names=["metric_time__day", "listing__country_latest"],
+        where_constraint="{{ Dimension('listing__is_lux_latest') }}",
+        dataflow_plan_optimizations=DataflowPlanOptimization.enabled_optimizations().union(
+            (DataflowPlanOptimization.AGGREGATE_BEFORE_JOIN,)
+        ),
+    )
+    result = it_helpers.mf_engine.query(mf_request)
+    expected_result = it_helpers.mf_engine.query(
+        MetricFlowQueryRequest.create_with_random_request_id(
+            metric_names=mf_request.metric_names,
+            group_by_names=mf_request.group_by_names,
+            where_constraint=mf_request.where_constraint,
+        )
+    )
+
+    assert result.sql is not None and expected_result.sql is not None
+    assert result.sql.count("GROUP BY") > expected_result.sql.count("GROUP BY")
+    assert result.result_df is not None and expected_result.result_df is not None
+    assert_data_tables_equal(actual=result.result_df, expected=expected_result.result_df)
+
+
+def test_query_many(it_helpers: IntegrationTestHelpers) -> None:
+    """Check that the results are in the same order as the requests and match the results of individual queries."""
+    mf_requests = [
+        MetricFlowQueryRequest.create_with_random_request_id(metric_names=[metric_name], group_by_names=["metric_time"])
+        for metric_name in ("bookings", "listings", "booking_value", "bookings")
+    ]
+    results = it_helpers.mf_engine.query_many(mf_requests, max_concurrency=2)
+
+    assert len(results) == len(mf_requests)
+    for mf_request, result in zip(mf_requests, results):
+        expected_result = it_helpers.mf_engine.query(mf_request)
+        assert result.sql == expected_result.sql
+        assert result.result_df is not None and expected_result.result_df is not None
+        # The SQL doesn't have an ORDER BY, so the order of the rows may be different.
+        assert result.result_df.column_names == expected_result.result_df.column_names
+        assert sorted(result.result_df.rows, key=str) == sorted(expected_result.result_df.rows, key=str)
+
+
+def test_query_many_with_invalid_request(it_helpers: IntegrationTestHelpers) -> None:  # noqa: D103
+    with pytest.raises(InvalidQueryException):
+        it_helpers.mf_engine.query_many(
+            [
+                MetricFlowQueryRequest.create_with_random_request_id(metric_names=["bookings"]),
+                MetricFlowQueryRequest.create_with_random_request_id(metric_names=["does_not_exist"]),
+            ]
+        )
+
+
+def test_concurrent_planning(it_helpers: IntegrationTestHelpers) -> None:
+    """Check that requests planned concurrently generate the same SQL as when planned one at a time."""
+    mf_requests = [
+        MetricFlowQueryRequest.create_with_random_request_id(
+            metric_names=["bookings", "listings"], group_by_names=["metric_time", "listing__country_latest"]
+        )
+        for _ in range(8)
+    ]
+    expected_sql = it_helpers.mf_engine.explain(mf_requests[0]).rendered_sql.sql_query
+    with ThreadPoolExecutor(max_workers=len(mf_requests)) as thread_pool:
+        explain_results = list(thread_pool.map(it_helpers.mf_engine.explain, mf_requests))
+
+    for explain_result in explain_results:
+        assert explain_result.rendered_sql.sql_query == expected_sql
+
+
+def test_query_iter(it_helpers: IntegrationTestHelpers) -> None:  # noqa: D103
+    mf_request = MetricFlowQueryRequest.create_with_random_request_id(
+        metric_names=["bookings"], group_by_names=["metric_time"]
+    )
+    expected_df = it_helpers.mf_engine.query(mf_request).result_df
+    assert expected_df is not None and expected_df.row_count > 3
+
+    batches = list(it_helpers.mf_engine.query_iter(mf_request, batch_size=3))
+    assert all(batch.row_count <= 3 for batch in batches)
+    assert all(batch.column_names == expected_df.column_names for batch in batches)
+    assert sorted((row for batch in batches for row in batch.rows), key=str) == sorted(expected_df.rows, key=str)
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import datetime
+
+from metricflow_semantics.sql.sql_bind_parameters import SqlBindParameters
+
+from metricflow.plan_conversion.sql_literal_parameterizer import SqlLiteralParameterizer
+from metricflow.sql.render.expr_renderer import DefaultSqlExpressionRenderer
+
+_PARAMETERIZER = SqlLiteralParameterizer(lambda key: f"${key}")
+
+
+def test_compared_literals() -> None:  # noqa: D103
+    sql, bind_parameters = _PARAMETERIZER.parameterize_where_sql(
+        where_sql="country == 'US' AND bookings > 10 AND ratio <= 1.5 AND name LIKE 'it''s%'",
+        key_prefix="subq_0",
+    )
+    assert sql == "country == $subq_0__0 AND bookings > $subq_0__1 AND ratio <= $subq_0__2 AND name LIKE $subq_0__3"
+    assert bind_parameters == SqlBindParameters.create_from_dict(
+        {"subq_0__0": "US", "subq_0__1": 10, "subq_0__2": 1.5, "subq_0__3": "it's%"}
+    )
+
+
+def test_in_list_literals() -> None:  # noqa: D103
+    sql, bind_parameters = _PARAMETERIZER.parameterize_where_sql(
+        where_sql="country IN ('US', 'CA') AND listing NOT IN (SELECT id FROM t WHERE a IN (1))",
+        key_prefix="subq_0",
+    )
+    assert sql == "country IN ($subq_0__0, $subq_0__1) AND listing NOT IN (SELECT id FROM t WHERE a IN ($subq_0__2))"
+    assert bind_parameters == SqlBindParameters.create_from_dict({"subq_0__0": "US", "subq_0__1": "CA", "subq_0__2": 1})
+
+
+def test_other_literals_are_unchanged() -> None:
+    """Check that function arguments, typed literals, identifiers, and comments are left as they are."""
+    where_sql = (
+        "DATE_TRUNC('day', ds) = DATE '2020-01-01' AND \"a = 'b'\" IS NULL AND col_1 IS NOT NULL -- c = 'd'\n"
+        "AND e = -1 /* f = 'g' */"
+    )
+    sql, bind_parameters = _PARAMETERIZER.parameterize_where_sql(where_sql=where_sql, key_prefix="subq_0")
+    assert sql == where_sql
+    assert bind_parameters == SqlBindParameters()
+
+
+def test_bind_parameter_expr() -> None:  # noqa: D103
+    expr = _PARAMETERIZER.create_bind_parameter_expr(key="start_time", value=datetime.datetime(2020, 1, 1))
+    render_result = DefaultSqlExpressionRenderer().render_sql_expr(expr)
+    assert render_result.sql == "$start_time"
+    assert render_result.bind_parameters == SqlBindParameters.create_from_dict(
+        {"start_time": datetime.datetime(2020, 1, 1)}
+    )
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+from metricflow_semantics.dag.mf_dag import DagId
+from metricflow_semantics.sql.sql_join_type import SqlJoinType
+from metricflow_semantics.sql.sql_table import SqlTable, SqlTableType
+
+from metricflow.sql.render.duckdb_renderer import DuckDbSqlQueryPlanRenderer
+from metricflow.sql.render.sql_plan_renderer import SqlCteRenderingOptions, SqlQueryPlanRenderer
+from metricflow.sql.sql_exprs import (
+    SqlColumnReference,
+    SqlColumnReferenceExpression,
+    SqlComparison,
+    SqlComparisonExpression,
+)
+from metricflow.sql.sql_plan import (
+    SqlCreateTableAsNode,
+    SqlJoinDescription,
+    SqlQueryPlan,
+    SqlSelectColumn,
+    SqlSelectStatementNode,
+    SqlTableNode,
+)
+
+
+def _column(table_alias: str, column_name: str) -> SqlSelectColumn:
+    return SqlSelectColumn(
+        expr=SqlColumnReferenceExpression.create(
+            col_ref=SqlColumnReference(table_alias=table_alias, column_name=column_name)
+        ),
+        column_alias=column_name,
+    )
+
+
+def _sub_query(description: str) -> SqlSelectStatementNode:
+    return SqlSelectStatementNode.create(
+        description=description,
+        select_columns=(_column("a", "listing_id"), _column("a", "bookings")),
+        from_source=SqlTableNode.create(sql_table=SqlTable(schema_name="demo", table_name="fct_bookings")),
+        from_source_alias="a",
+    )
+
+
+def _self_join_node() -> SqlSelectStatementNode:
+    """Returns a query that joins two structurally identical sub-queries."""
+    return SqlSelectStatementNode.create(
+        description="self_join",
+        select_columns=(_column("l", "listing_id"), _column("r", "bookings")),
+        from_source=_sub_query("bookings"),
+        from_source_alias="l",
+        join_descs=(
+            SqlJoinDescription(
+                right_source=_sub_query("bookings"),
+                right_source_alias="r",
+                join_type=SqlJoinType.INNER,
+                on_condition=SqlComparisonExpression.create(
+                    left_expr=SqlColumnReferenceExpression.create(SqlColumnReference("l", "listing_id")),
+                    comparison=SqlComparison.EQUALS,
+                    right_expr=SqlColumnReferenceExpression.create(SqlColumnReference("r", "listing_id")),
+                ),
+            ),
+        ),
+    )
+
+
+def _render(renderer: SqlQueryPlanRenderer, node: SqlSelectStatementNode | SqlCreateTableAsNode) -> str:
+    return renderer.render_sql_query_plan(SqlQueryPlan(render_node=node, plan_id=DagId.from_str("plan0"))).sql
+
+
+def test_shared_sub_query_rendered_as_cte() -> None:  # noqa: D103
+    renderer = DuckDbSqlQueryPlanRenderer().with_cte_rendering_options(SqlCteRenderingOptions())
+    sql = _render(renderer, _self_join_node())
+
+    assert sql.startswith("WITH cte_0 AS (")
+    assert sql.count("FROM demo.fct_bookings") == 1
+    assert "FROM cte_0 l" in sql
+    assert "INNER JOIN\n  cte_0 r" in sql
+
+    # The default renderer should not be affected.
+    default_sql = _render(DuckDbSqlQueryPlanRenderer(), _self_join_node())
+    assert "cte_0" not in default_sql
+    assert default_sql.count("FROM demo.fct_bookings") == 2
+
+
+def test_unshared_sub_query_rendered_inline() -> None:  # noqa: D103
+    node = SqlSelectStatementNode.create(
+        description="outer",
+        select_columns=(_column("s", "listing_id"),),
+        from_source=_sub_query("bookings"),
+        from_source_alias="s",
+    )
+    renderer = DuckDbSqlQueryPlanRenderer().with_cte_rendering_options(SqlCteRenderingOptions())
+    assert "cte_0" not in _render(renderer, node)
+
+    # A sub-query can also be rendered as a CTE because of its length.
+    renderer = DuckDbSqlQueryPlanRenderer().with_cte_rendering_options(SqlCteRenderingOptions(min_sql_length=1))
+    assert _render(renderer, node).startswith("WITH cte_0 AS (")
+
+
+def test_create_table_as_with_ctes() -> None:  # noqa: D103
+    renderer = DuckDbSqlQueryPlanRenderer().with_cte_rendering_options(SqlCteRenderingOptions())
+    sql = _render(
+        renderer,
+        SqlCreateTableAsNode.create(
+            sql_table=SqlTable(schema_name="schema_name", table_name="table_name", table_type=SqlTableType.TABLE),
+            parent_node=_self_join_node(),
+        ),
+    )
+    assert sql.startswith("CREATE TABLE schema_name.table_name AS (\n  WITH cte_0 AS (")
+    assert sql.count("FROM demo.fct_bookings") == 1
@@ -1,10 +1,22 @@
 from __future__ import annotations
 
+import datetime
 import logging
+import uuid
 from decimal import Decimal
+from pathlib import Path
+from typing import Sequence, cast
 
 import pytest
 
+from metricflow.data_table.column_data import (
+    ArrayColumnData,
+    DictionaryEncodedColumnData,
+    NullColumnData,
+    ObjectColumnData,
+    TimestampColumnData,
+)
+from metricflow.data_table.column_types import InputCellValue
 from metricflow.data_table.mf_table import MetricFlowDataTable
 from tests_metricflow.sql.compare_data_table import check_data_tables_are_equal
 
@@ -122,3 +134,190 @@ def test_get_cell_value(example_table: MetricFlowDataTable) -> None:  # noqa: D1
 def test_column_values_iterator(example_table: MetricFlowDataTable) -> None:  # noqa: D103
     assert tuple(example_table.column_values_iterator(0)) == (0, 1)
     assert tuple(example_table.column_values_iterator(1)) == ("a", "b")
+
+
+def test_column_storage() -> None:  # noqa: D103
+    rows = (
+        (1, 1.5, True, "a", datetime.datetime(2020, 1, 1, 12, 30, 15, 5), None, 2**70),
+        (None, None, None, None, None, None, 1),
+        (-3, float("inf"), False, "a", datetime.datetime(1900, 12, 31), None, -(2**70)),
+        (4, -2.0, False, "b", datetime.date(2021, 2, 3), None, 0),
+    )
+    table = MetricFlowDataTable.create_from_rows(
+        column_names=["int_col", "float_col", "bool_col", "str_col", "time_col", "null_col", "big_int_col"],
+        rows=rows,
+    )
+
+    assert tuple(column_description.column_type for column_description in table.column_descriptions) == (
+        int,
+        float,
+        bool,
+        str,
+        datetime.datetime,
+        type(None),
+        int,
+    )
+    assert tuple(type(column) for column in table.columns) == (
+        ArrayColumnData,
+        ArrayColumnData,
+        ArrayColumnData,
+        DictionaryEncodedColumnData,
+        TimestampColumnData,
+        NullColumnData,
+        ObjectColumnData,
+    )
+    expected_rows = rows[:3] + ((4, -2.0, False, "b", datetime.datetime(2021, 2, 3), None, 0),)
+    assert table.rows == expected_rows
+    assert tuple(table.rows[i] for i in range(-4, 4)) == expected_rows + expected_rows
+    for row in table.rows:
+        for cell_value, column_description in zip(row, table.column_descriptions):
+            assert cell_value is None or type(cell_value) is column_description.column_type
+    # Repeated strings are stored once.
+    str_column = table.columns[3]
+    assert isinstance(str_column, DictionaryEncodedColumnData)
+    assert str_column.dictionary == ("a", "b", None)
+
+
+def test_time_zone_removed() -> None:  # noqa: D103
+    table = MetricFlowDataTable.create_from_rows(
+        column_names=["col_0"],
+        rows=[(datetime.datetime(2020, 1, 1, 1, tzinfo=datetime.timezone.utc),)],
+    )
+    assert table.rows == ((datetime.datetime(2020, 1, 1, 1),),)
+
+
+def test_create_from_columns_with_unsupported_values() -> None:  # noqa: D103
+    class _IntSubclass(int):
+        pass
+
+    # DB-API drivers can return types that aren't an `InputCellValue`.
+    columns: Sequence[Sequence[InputCellValue]] = (
+        (_IntSubclass(1), None),
+        (cast(InputCellValue, uuid.UUID(int=0)), None),
+        (Decimal("1.5"), Decimal(2)),
+    )
+    with pytest.raises(ValueError):
+        MetricFlowDataTable.create_from_columns(column_names=["col_0", "col_1", "col_2"], columns=columns)
+
+    table = MetricFlowDataTable.create_from_columns(
+        column_names=["col_0", "col_1", "col_2"], columns=columns, stringify_unsupported_values=True
+    )
+    assert tuple(column_description.column_type for column_description in table.column_descriptions) == (
+        int,
+        str,
+        float,
+    )
+    assert table.rows == ((1, "00000000-0000-0000-0000-000000000000", 1.5), (None, None, 2.0))
+
+
+def test_slice_rows(example_table: MetricFlowDataTable) -> None:  # noqa: D103
+    assert example_table.slice_rows(1, 5).rows == ((1, "b"),)
+    assert example_table.slice_rows(2, 4).row_count == 0
+    assert example_table.rows[0:1] == ((0, "a"),)
+
+
+def test_create_from_column_descriptions_and_rows(example_table: MetricFlowDataTable) -> None:  # noqa: D103
+    table = MetricFlowDataTable(column_descriptions=example_table.column_descriptions, rows=((0, "a"), (1, "b")))
+    assert tuple(map(type, table.columns)) == tuple(map(type, example_table.columns))
+    assert table.rows == example_table.rows
+
+    with pytest.raises(AssertionError):
+        MetricFlowDataTable(column_descriptions=example_table.column_descriptions, rows=(("0", "a"),))
+    with pytest.raises(ValueError):
+        MetricFlowDataTable(column_descriptions=example_table.column_descriptions)
+
+
+def test_empty_table() -> None:  # noqa: D103
+    table = MetricFlowDataTable.create_from_rows(column_names=["col_0", "col_1"], rows=())
+    assert table.column_count == 2
+    assert table.row_count == 0
+    assert tuple(table.rows) == ()
+
+
+def test_approximate_size_in_bytes() -> None:  # noqa: D103
+    table = MetricFlowDataTable.create_from_rows(
+        column_names=["int_col", "str_col"],
+        rows=[(i, "a" * 100) for i in range(1000)],
+    )
+    # The ints take 8 bytes each, and the repeated string is stored once.
+    assert 12000 <= table.approximate_size_in_bytes < 13000
+
+
+def test_to_arrow() -> None:  # noqa: D103
+    pa = pytest.importorskip("pyarrow")
+    table = MetricFlowDataTable.create_from_rows(
+        column_names=["int_col", "float_col", "bool_col", "str_col", "time_col", "null_col"],
+        rows=(
+            (1, 1.5, True, "a", datetime.datetime(2020, 1, 1, 12, 30, 15, 5), None),
+            (None, None, None, None, None, None),
+            (3, -2.0, False, "a", datetime.datetime(1900, 12, 31), None),
+        ),
+    )
+    arrow_table = table.to_arrow()
+    arrow_table.validate(full=True)
+
+    assert arrow_table.schema == pa.schema(
+        [
+            ("int_col", pa.int64()),
+            ("float_col", pa.float64()),
+            ("bool_col", pa.bool_()),
+            ("str_col", pa.dictionary(pa.int32(), pa.string())),
+            ("time_col", pa.timestamp("us")),
+            ("null_col", pa.null()),
+        ]
+    )
+    assert tuple(tuple(row.values()) for row in arrow_table.to_pylist()) == tuple(table.rows)
+
+
+def test_create_from_arrow() -> None:  # noqa: D103
+    pa = pytest.importorskip("pyarrow")
+    table = MetricFlowDataTable.create_from_rows(
+        column_names=["int_col", "float_col", "bool_col", "str_col", "time_col", "null_col"],
+        rows=(
+            (1, 1.5, True, "a", datetime.datetime(2020, 1, 1, 12, 30, 15, 5), None),
+            (None, None, None, None, None, None),
+            (3, -2.0, False, "a", datetime.datetime(1900, 12, 31), None),
+        ),
+    )
+    check_data_tables_are_equal(
+        expected_table=table, actual_table=MetricFlowDataTable.create_from_arrow(table.to_arrow())
+    )
+
+    # Other Arrow types are converted to the supported cell types.
+    arrow_table = pa.table(
+        {
+            "int8_col": pa.array([1, None], type=pa.int8()),
+            "date_col": pa.array([datetime.date(2020, 1, 2), None]),
+            "decimal_col": pa.array([Decimal("1.5"), None]),
+            "large_str_col": pa.array(["a", None], type=pa.large_string()),
+            "ns_col": pa.array([datetime.datetime(2020, 1, 1), None], type=pa.timestamp("ns")),
+        }
+    ).slice(0, 2)
+    assert MetricFlowDataTable.create_from_arrow(arrow_table).rows == (
+        (1, datetime.datetime(2020, 1, 2), 1.5, "a", datetime.datetime(2020, 1, 1)),
+        (None, None, None, None, None),
+    )
+
+
+def test_to_parquet(example_table: MetricFlowDataTable, tmp_path: Path) -> None:  # noqa: D103
+    pq = pytest.importorskip("pyarrow.parquet")
+    file_path = tmp_path / "example.parquet"
+    example_table.to_parquet(file_path)
+    assert pq.read_table(file_path).equals(example_table.to_arrow())
+
+
+def test_to_polars(example_table: MetricFlowDataTable) -> None:  # noqa: D103
+    pytest.importorskip("pyarrow")
+    pytest.importorskip("polars")
+    data_frame = example_table.to_polars()
+    assert data_frame.columns == ["col_0", "col_1"]
+    assert data_frame.rows() == list(example_table.rows)
+
+
+def test_to_pandas(example_table: MetricFlowDataTable) -> None:  # noqa: D103
+    pytest.importorskip("pyarrow")
+    pytest.importorskip("pandas")
+    data_frame = example_table.to_pandas()
+    assert list(data_frame.columns) == ["col_0", "col_1"]
+    assert list(data_frame["col_0"]) == [0, 1]
+    assert list(data_frame["col_1"]) == ["a", "b"]
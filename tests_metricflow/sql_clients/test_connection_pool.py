@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import contextlib
+import logging
+import threading
+from typing import List
+
+import pytest
+from dbt.adapters.base import BaseAdapter
+from dbt.adapters.factory import get_adapter_by_type
+
+from dbt_metricflow.cli.dbt_connectors.adapter_backed_client import AdapterBackedSqlClient, SupportedAdapterTypes
+from dbt_metricflow.cli.dbt_connectors.connection_pool import AdapterConnectionPool, ConnectionPoolConfig
+from metricflow.protocols.sql_client import SqlClient
+
+logger = logging.getLogger(__name__)
+
+
+class _FakeClock:
+    def __init__(self) -> None:  # noqa: D107
+        self.current_time = 0.0
+
+    def time(self) -> float:  # noqa: D102
+        return self.current_time
+
+
+@pytest.fixture
+def adapter(sql_client: SqlClient) -> BaseAdapter:  # noqa: D103
+    if not isinstance(sql_client, AdapterBackedSqlClient):
+        pytest.skip("Connection pools are only used with dbt adapters.")
+    adapter_type = next(
+        adapter_type
+        for adapter_type in SupportedAdapterTypes
+        if adapter_type.sql_engine_type is sql_client.sql_engine_type
+    )
+    return get_adapter_by_type(adapter_type.value)
+
+
+def _run_query(adapter: BaseAdapter, pool: AdapterConnectionPool) -> None:
+    with pool.lease("test_connection_pool"):
+        adapter.execute("SELECT 1", auto_begin=True, fetch=True)
+
+
+def test_connections_are_reused(sql_client: SqlClient) -> None:  # noqa: D103
+    if not isinstance(sql_client, AdapterBackedSqlClient) or sql_client.connection_pool is None:
+        pytest.skip("Connection pools are only used with dbt adapters.")
+    sql_client.query("SELECT 1 AS y")
+    stats_before = sql_client.connection_pool.stats
+
+    for _ in range(3):
+        sql_client.query("SELECT 1 AS y")
+
+    stats_after = sql_client.connection_pool.stats
+    assert stats_after.opened_count == stats_before.opened_count
+    assert stats_after.reused_count == stats_before.reused_count + 3
+
+
+def test_closed_query_batches_releases_connection(sql_client: SqlClient) -> None:  # noqa: D103
+    if not isinstance(sql_client, AdapterBackedSqlClient) or sql_client.connection_pool is None:
+        pytest.skip("Connection pools are only used with dbt adapters.")
+    sql_client.query("SELECT 1 AS y")
+    idle_count_before = sql_client.connection_pool.stats.idle_count
+
+    with contextlib.closing(sql_client.query_batches("SELECT 1 AS y UNION ALL SELECT 2 AS y", batch_size=1)) as batches:
+        assert next(batches).row_count == 1
+        assert sql_client.connection_pool.stats.idle_count == idle_count_before - 1
+
+    assert sql_client.connection_pool.stats.idle_count == idle_count_before
+
+
+def test_idle_timeout(adapter: BaseAdapter) -> None:  # noqa: D103
+    clock = _FakeClock()
+    pool = AdapterConnectionPool(
+        adapter=adapter,
+        config=ConnectionPoolConfig(min_size=0, idle_timeout=10.0, health_check_interval=5.0),
+        time_function=clock.time,
+    )
+    _run_query(adapter, pool)
+    _run_query(adapter, pool)
+    assert pool.stats.opened_count == 1
+    assert pool.stats.reused_count == 1
+    assert pool.stats.idle_count == 1
+
+    # The connection was idle for longer than the health check interval, but it's still usable.
+    clock.current_time += 5.0
+    _run_query(adapter, pool)
+    assert pool.stats.reused_count == 2
+    assert pool.stats.discarded_count == 0
+
+    # The connection was idle for longer than the timeout, so a new connection is opened.
+    clock.current_time += 10.0
+    _run_query(adapter, pool)
+    assert pool.stats.opened_count == 2
+    assert pool.stats.discarded_count == 1
+
+    pool.close()
+    assert pool.stats.idle_count == 0
+
+
+def test_nested_lease_uses_same_connection(adapter: BaseAdapter) -> None:  # noqa: D103
+    pool = AdapterConnectionPool(adapter=adapter)
+    with pool.lease("outer"):
+        outer_connection = adapter.connections.get_thread_connection()
+        with pool.lease("inner"):
+            assert adapter.connections.get_thread_connection() is outer_connection
+            adapter.execute("SELECT 1", auto_begin=True, fetch=True)
+        assert adapter.connections.get_thread_connection() is outer_connection
+
+    assert adapter.connections.get_if_exists() is None
+    assert pool.stats.opened_count == 1
+    assert pool.stats.idle_count == 1
+    pool.close()
+
+
+def test_leases_in_different_threads(adapter: BaseAdapter) -> None:  # noqa: D103
+    thread_count = 4
+    pool = AdapterConnectionPool(adapter=adapter, config=ConnectionPoolConfig(max_size=thread_count))
+    barrier = threading.Barrier(thread_count)
+    leased_connection_ids: List[int] = []
+    errors: List[Exception] = []
+
+    def _lease_connection() -> None:
+        try:
+            with pool.lease("test_connection_pool"):
+                adapter.execute("SELECT 1", auto_begin=True, fetch=True)
+                leased_connection_ids.append(id(adapter.connections.get_thread_connection()))
+                # Wait until all threads have a connection so that the leases overlap.
+                barrier.wait(timeout=30)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=_lease_connection) for _ in range(thread_count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert len(set(leased_connection_ids)) == thread_count
+    assert pool.stats.idle_count == thread_count
+    pool.close()
+
+
+def test_invalid_config() -> None:  # noqa: D103
+    with pytest.raises(ValueError):
+        ConnectionPoolConfig(min_size=2, max_size=1)
+    with pytest.raises(ValueError):
+        ConnectionPoolConfig(idle_timeout=0)
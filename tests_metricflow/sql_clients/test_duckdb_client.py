@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import datetime
+import threading
+from typing import Iterator, List
+
+import pytest
+from metricflow_semantics.sql.sql_bind_parameters import SqlBindParameters
+
+from metricflow.sql_clients.duckdb_client import DuckDbSqlClient
+
+pytest.importorskip("duckdb")
+pytest.importorskip("pyarrow")
+
+
+@pytest.fixture
+def duckdb_client() -> Iterator[DuckDbSqlClient]:  # noqa: D103
+    client = DuckDbSqlClient.create()
+    yield client
+    client.close()
+
+
+def test_query_types(duckdb_client: DuckDbSqlClient) -> None:  # noqa: D103
+    data_table = duckdb_client.query(
+        "SELECT * FROM (VALUES "
+        "(1, 1.5, TRUE, 'a', TIMESTAMP '2020-01-01 01:02:03', DATE '2020-01-02', 1.25::DECIMAL(10, 2)), "
+        "(NULL, NULL, NULL, NULL, NULL, NULL, NULL)"
+        ") t(int_col, float_col, bool_col, str_col, timestamp_col, date_col, decimal_col)"
+    )
+    assert tuple(column_description.column_type for column_description in data_table.column_descriptions) == (
+        int,
+        float,
+        bool,
+        str,
+        datetime.datetime,
+        datetime.datetime,
+        float,
+    )
+    assert sorted(data_table.rows, key=str) == [
+        (
+            1,
+            1.5,
+            True,
+            "a",
+            datetime.datetime(2020, 1, 1, 1, 2, 3),
+            datetime.datetime(2020, 1, 2),
+            1.25,
+        ),
+        (None, None, None, None, None, None, None),
+    ]
+
+
+def test_bind_parameters(duckdb_client: DuckDbSqlClient) -> None:  # noqa: D103
+    x_key = duckdb_client.render_bind_parameter_key("x")
+    y_key = duckdb_client.render_bind_parameter_key("y")
+    data_table = duckdb_client.query(
+        f"SELECT {x_key} + 1 AS x, {y_key} AS y",
+        sql_bind_parameters=SqlBindParameters.create_from_dict({"x": 1, "y": "a"}),
+    )
+    assert tuple(data_table.rows) == ((2, "a"),)
+    duckdb_client.dry_run(f"SELECT {x_key} AS x", sql_bind_parameters=SqlBindParameters.create_from_dict({"x": 1}))
+
+
+def test_query_batches(duckdb_client: DuckDbSqlClient) -> None:  # noqa: D103
+    duckdb_client.execute("CREATE TABLE numbers AS SELECT range AS x FROM range(5000)")
+    batches = list(duckdb_client.query_batches("SELECT x FROM numbers ORDER BY x", batch_size=1000))
+    assert all(batch.row_count <= 1000 for batch in batches)
+    assert [row[0] for batch in batches for row in batch.rows] == list(range(5000))
+
+    empty_batches = list(duckdb_client.query_batches("SELECT x FROM numbers WHERE x < 0"))
+    assert len(empty_batches) == 1
+    assert empty_batches[0].row_count == 0
+    assert tuple(empty_batches[0].column_names) == ("x",)
+
+
+def test_concurrent_queries(duckdb_client: DuckDbSqlClient) -> None:  # noqa: D103
+    duckdb_client.execute("CREATE TABLE numbers AS SELECT range AS x FROM range(1000)")
+    thread_count = 4
+    barrier = threading.Barrier(thread_count)
+    results: List[int] = []
+    errors: List[Exception] = []
+
+    def _run_query(thread_index: int) -> None:
+        try:
+            barrier.wait(timeout=30)
+            data_table = duckdb_client.query(f"SELECT SUM(x) + {thread_index} AS total FROM numbers")
+            results.append(data_table.get_cell_value(0, 0))  # type: ignore[arg-type]
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=_run_query, args=(i,)) for i in range(thread_count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert sorted(results) == [499500 + i for i in range(thread_count)]
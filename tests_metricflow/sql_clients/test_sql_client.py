@@ -5,6 +5,7 @@ from typing import Optional, Set, Union
 
 import pytest
 from dbt_semantic_interfaces.test_utils import as_datetime
+from metricflow_semantics.errors.error_classes import SqlBindParametersNotSupportedError
 from metricflow_semantics.random_id import random_id
 from metricflow_semantics.sql.sql_bind_parameters import SqlBindParameters
 from metricflow_semantics.sql.sql_table import SqlTable
@@ -44,6 +45,34 @@ def test_query(sql_client: SqlClient) -> None:  # noqa: D103
     _check_1col(df)
 
 
+def test_query_batches(  # noqa: D103
+    mf_test_configuration: MetricFlowTestConfiguration, ddl_sql_client: SqlClientWithDDLMethods
+) -> None:
+    expected_df = MetricFlowDataTable.create_from_rows(
+        column_names=["int_col", "str_col"],
+        rows=[(i, str(i)) for i in range(5)],
+    )
+    sql_table = SqlTable(schema_name=mf_test_configuration.mf_system_schema, table_name=_random_table())
+    ddl_sql_client.create_table_from_data_table(sql_table=sql_table, df=expected_df)
+
+    batches = list(ddl_sql_client.query_batches(f"SELECT * FROM {sql_table.sql} ORDER BY int_col", batch_size=2))
+    assert [batch.row_count for batch in batches] == [2, 2, 1]
+    assert_data_tables_equal(
+        actual=MetricFlowDataTable(
+            column_descriptions=batches[0].column_descriptions,
+            rows=tuple(row for batch in batches for row in batch.rows),
+        ),
+        expected=expected_df,
+        compare_names_using_lowercase=ddl_sql_client.sql_engine_type is SqlEngine.SNOWFLAKE,
+    )
+
+    # An empty result should have one batch with the column names.
+    batches = list(ddl_sql_client.query_batches(f"SELECT * FROM {sql_table.sql} WHERE int_col < 0"))
+    assert len(batches) == 1
+    assert batches[0].row_count == 0
+    assert tuple(column_name.lower() for column_name in batches[0].column_names) == ("int_col", "str_col")
+
+
 def test_select_one_query(sql_client: SqlClient) -> None:  # noqa: D103
     sql_client.query("SELECT 1")
     with pytest.raises(Exception):
@@ -121,6 +150,22 @@ def test_dry_run_of_bad_query_raises_exception(sql_client: SqlClient) -> None:
         sql_client.dry_run(bad_stmt)
 
 
+def test_query_with_bind_parameters(sql_client: SqlClient) -> None:  # noqa: D103
+    try:
+        x_key = sql_client.render_bind_parameter_key("x")
+        y_key = sql_client.render_bind_parameter_key("y")
+    except SqlBindParametersNotSupportedError:
+        pytest.skip(f"Bind parameters are not supported by the client for {sql_client.sql_engine_type}.")
+    bind_parameters = SqlBindParameters.create_from_dict({"x": 1, "y": "100%"})
+
+    df = sql_client.query(f"SELECT {x_key} AS x, {y_key} AS y, 5 % 3 AS z", sql_bind_parameters=bind_parameters)
+    assert tuple(df.rows) == ((1, "100%", 2),)
+    x_bind_parameters = SqlBindParameters.create_from_dict({"x": 1})
+    batches = list(sql_client.query_batches(f"SELECT {x_key} AS x", sql_bind_parameters=x_bind_parameters))
+    assert tuple(batches[0].rows) == ((1,),)
+    sql_client.dry_run(f"SELECT {x_key} AS x", sql_bind_parameters=x_bind_parameters)
+
+
 def test_update_params_with_same_item() -> None:  # noqa: D103
     bind_params0 = SqlBindParameters.create_from_dict({"key": "value"})
     bind_params1 = SqlBindParameters.create_from_dict({"key": "value"})